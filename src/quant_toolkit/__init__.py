@@ -1,5 +1,36 @@
-from .quantlogger import QuantLogger
-from .market_contracts import ContractGenerator, MarketCalendar
+"""
+quant_toolkit: tools for quantitative finance projects.
+
+Public names are imported on first access, so ``import quant_toolkit`` stays
+cheap and side-effect free for short-lived scripts.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .quantlogger import QuantLogger
+    from .market_contracts import ContractGenerator, MarketCalendar
+
+# Public name -> defining submodule
+_EXPORTS = {
+    "QuantLogger": "quantlogger",
+    "ContractGenerator": "market_contracts",
+    "MarketCalendar": "market_contracts",
+}
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_EXPORTS))
 
 
 __all__ = [
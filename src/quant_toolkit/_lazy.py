@@ -0,0 +1,59 @@
+"""
+Deferred imports for heavy optional backends.
+
+pandas, polars, pyarrow, aiohttp and friends take hundreds of milliseconds
+to import, which dominates the runtime of short cron scripts that only
+touch one of them (or none). LazyModule stands in for a module at import
+time and imports the real one on first attribute access, so
+
+    pd = LazyModule("pandas")
+
+costs nothing until ``pd.DataFrame`` is first used. The proxy is local to
+the importing module; nothing is placed in sys.modules ahead of time, so
+other libraries still see the true import state.
+
+Classes:
+    LazyModule: Module proxy importing its target on first use
+"""
+
+import importlib
+from types import ModuleType
+from typing import Any, List, Optional
+
+
+class LazyModule:
+    """
+    Proxy for a module that is imported on first attribute access.
+
+    Attributes:
+        name: Dotted name of the module to import
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the proxy without importing anything.
+
+        Args:
+            name: Dotted module name, e.g. "pyarrow.compute"
+        """
+        self.name = name
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        """Import the module (once) and return it."""
+        module = self._module
+        if module is None:
+            # import_module holds the import lock, so concurrent first uses
+            # from several threads all get the same module object
+            module = self._module = importlib.import_module(self.name)
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule '{self.name}' ({state})>"
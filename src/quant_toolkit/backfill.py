@@ -0,0 +1,408 @@
+"""
+Parallel backfill of the index, futures and stocks databases.
+
+DBPaths keeps index, futures and stock bars in three SQLite files. Each file
+has its own write lock, yet nightly backfills used to update them one after
+another. BackfillOrchestrator runs one writer thread per database, so the
+three commit streams overlap. A shared pool of fetch threads feeds them:
+each fetch thread downloads a symbol with the caller's fetch function,
+validates it with ValidationRules and queues it for the database it
+belongs to.
+
+The pipeline:
+
+    fetch pool (fetch_workers threads, shared by all databases)
+        fetch(database, symbol, since) -> validate -> drop rows <= since
+            |                 |                 |
+        index queue     futures queue     stocks queue    (bounded)
+            |                 |                 |
+        index writer    futures writer    stocks writer   (one transaction
+                                                           per batch_rows)
+
+Backfills are incremental: every symbol is fetched with the datetime of
+its newest stored bar (None for new symbols), and fetched rows at or before
+it are dropped, so re-running a backfill does not duplicate rows.
+
+Classes:
+    BackfillOrchestrator: Fetch/validate pool feeding one writer per database
+    DatabaseThroughput: Per-database counters of a backfill run
+
+Usage:
+    from quant_toolkit.sqlite_data_manager import DBPaths
+
+    def fetch(database, symbol, since):
+        return broker.history(symbol, start=since)   # pandas or polars
+
+    report = DBPaths().backfill(
+        fetch,
+        symbols={"index": ["NIFTY"], "stocks": stock_list},
+        batch_rows={"stocks": 500_000},
+    )
+    print(report["stocks"].rows_per_second)
+"""
+
+import datetime
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from itertools import chain, zip_longest
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from quant_toolkit._lazy import LazyModule
+from quant_toolkit.sqlite_data_manager import (
+    DATETIME_FORMAT,
+    REQUIRED_COLUMNS,
+    DataHandler,
+    DBPaths,
+    ValidationRules,
+    _is_dataframe,
+    _sql_type,
+    _validate_polars,
+)
+
+pl = LazyModule("polars")
+
+logger = logging.getLogger(__name__)
+
+DATABASES = DBPaths.DATABASES
+
+# Rows committed per transaction when batch_rows does not name a database
+DEFAULT_BATCH_ROWS = 100_000
+
+# Queue item telling a writer that no more frames will come
+_DONE = object()
+
+FetchFunction = Callable[[str, str, Optional[datetime.datetime]], Any]
+
+
+@dataclass
+class DatabaseThroughput:
+    """
+    Counters of one database in a backfill run.
+
+    Attributes:
+        database: Database name ("index", "futures" or "stocks")
+        symbols: Symbols with new rows written
+        rows: Rows written
+        batches: Transactions committed
+        up_to_date: Symbols fetched without any new rows
+        failed: Symbols whose fetch, validation or write failed, or whose
+            newest stored bar could not be read
+        fetch_seconds: Time spent fetching and validating this database's
+            symbols, summed over fetch threads
+        write_seconds: Time spent inside write transactions
+        elapsed_seconds: Wall time from the start of the run until this
+            database's writer finished
+    """
+
+    database: str
+    symbols: int = 0
+    rows: int = 0
+    batches: int = 0
+    up_to_date: int = 0
+    failed: List[str] = field(default_factory=list)
+    fetch_seconds: float = 0.0
+    write_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Write throughput: rows per second spent in transactions."""
+        return self.rows / self.write_seconds if self.write_seconds else 0.0
+
+
+class BackfillOrchestrator:
+    """
+    Backfill several databases concurrently from one fetch/validate pool.
+
+    Writers only ever hold their own database's write lock, so they never
+    wait on each other. Fetch threads block while a writer's queue is full,
+    which throttles fetching to what the disks can absorb.
+
+    Attributes:
+        fetch: Callable(database, symbol, since) returning a pandas or
+            polars DataFrame or a pyarrow Table of bars (or None)
+        handlers: Mapping of database name to DataHandler
+        batch_rows: Rows committed per transaction, per database
+        fetch_workers: Number of fetch/validate threads
+    """
+
+    def __init__(
+        self,
+        fetch: FetchFunction,
+        paths: Optional[DBPaths] = None,
+        handlers: Optional[Mapping[str, DataHandler]] = None,
+        batch_rows: Optional[Mapping[str, int]] = None,
+        fetch_workers: int = 4,
+        queue_size: int = 16,
+        rules: Optional[ValidationRules] = None,
+    ):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            fetch: Callable(database, symbol, since) returning the bars of
+                symbol after since (a datetime, or None for a new symbol)
+            paths: DBPaths whose shared handlers are written to (default:
+                DBPaths() when handlers is not given)
+            handlers: Explicit mapping of database name to DataHandler,
+                used instead of paths
+            batch_rows: Rows per write transaction by database name, e.g.
+                {"stocks": 500_000} (default: DEFAULT_BATCH_ROWS each)
+            fetch_workers: Fetch/validate threads shared by all databases
+                (default: 4)
+            queue_size: Validated frames buffered per database before
+                fetch threads block (default: 16)
+            rules: Validation applied in the fetch stage (default: each
+                handler's validation_rules)
+
+        Raises:
+            ValueError: If fetch_workers, queue_size or a batch size is not
+                positive
+        """
+        if fetch_workers <= 0:
+            raise ValueError("fetch_workers must be positive")
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive")
+        batch_rows = dict(batch_rows or {})
+        if any(size <= 0 for size in batch_rows.values()):
+            raise ValueError(f"Batch sizes must be positive, got {batch_rows}")
+
+        if handlers is None:
+            paths = paths or DBPaths()
+            handlers = {name: paths.handler(name) for name in DATABASES}
+
+        self.fetch = fetch
+        self.paths = paths
+        self.handlers = dict(handlers)
+        self.batch_rows = {
+            name: batch_rows.get(name, DEFAULT_BATCH_ROWS) for name in self.handlers
+        }
+        self.fetch_workers = fetch_workers
+        self.queue_size = queue_size
+        self.rules = rules
+
+        self._queues: Dict[str, queue.Queue] = {}
+        self._stats: Dict[str, DatabaseThroughput] = {}
+        self._lock = threading.Lock()
+
+    def run(
+        self, symbols: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> Dict[str, DatabaseThroughput]:
+        """
+        Backfill symbols and wait until every writer has committed.
+
+        Args:
+            symbols: Symbols to backfill by database name (default: the
+                symbol lists of DBPaths for every handled database)
+
+        Returns:
+            DatabaseThroughput for each database, by name
+
+        Raises:
+            ValueError: If symbols names a database without a handler
+        """
+        if symbols is None:
+            if self.paths is None:
+                raise ValueError("symbols is required when handlers are given")
+            symbols = {name: self.paths._get_symbols(name) for name in self.handlers}
+        unknown = set(symbols) - set(self.handlers)
+        if unknown:
+            raise ValueError(f"No handler for databases: {sorted(unknown)}")
+        symbols = {name: list(dict.fromkeys(items)) for name, items in symbols.items()}
+
+        started = time.perf_counter()
+        self._stats = {name: DatabaseThroughput(name) for name in symbols}
+        self._queues = {name: queue.Queue(maxsize=self.queue_size) for name in symbols}
+
+        cursors = {}
+        for name, items in symbols.items():
+            try:
+                cursors[name] = self._latest(name, items)
+            except Exception as e:
+                # Without the cursors every row would be fetched and written again
+                logger.error(f"Backfill {name} skipped, newest bars unknown: {e}")
+                self._stats[name].failed.extend(items)
+                symbols[name] = []
+
+        # Interleave databases so every writer gets work from the start
+        jobs: queue.Queue = queue.Queue()
+        for database, symbol in chain.from_iterable(
+            zip_longest(
+                *([(name, s) for s in items] for name, items in symbols.items()),
+                fillvalue=(None, None),
+            )
+        ):
+            if database is not None:
+                jobs.put((database, symbol, cursors[database].get(symbol)))
+
+        writers = [
+            threading.Thread(
+                target=self._write_loop,
+                args=(name, started),
+                name=f"quant-toolkit-backfill-{name}",
+                daemon=True,
+            )
+            for name in symbols
+        ]
+        fetchers = [
+            threading.Thread(
+                target=self._fetch_loop,
+                args=(jobs,),
+                name=f"quant-toolkit-backfill-fetch-{i}",
+                daemon=True,
+            )
+            for i in range(min(self.fetch_workers, max(jobs.qsize(), 1)))
+        ]
+        for thread in writers + fetchers:
+            thread.start()
+        for thread in fetchers:
+            thread.join()
+        for name in symbols:
+            self._queues[name].put(_DONE)
+        for thread in writers:
+            thread.join()
+
+        for stats in self._stats.values():
+            logger.info(
+                f"Backfill {stats.database}: {stats.rows} rows for {stats.symbols} "
+                f"symbols in {stats.batches} batches, "
+                f"{stats.rows_per_second:,.0f} rows/s, "
+                f"{stats.up_to_date} up to date, {len(stats.failed)} failed"
+            )
+        return self._stats
+
+    def _latest(
+        self, database: str, symbols: List[str]
+    ) -> Dict[str, datetime.datetime]:
+        """
+        Newest stored datetime of each symbol that has rows.
+
+        Raises:
+            RuntimeError: If the newest bars could not be read
+        """
+        handler = self.handlers[database]
+        if not symbols or not handler.database_exists():
+            return {}
+        snapshot = handler.latest_bars(symbols)
+        if snapshot is None:
+            # latest_bars logged the error and returned None
+            raise RuntimeError(f"latest_bars failed for {handler.db_path}")
+        if snapshot.empty:
+            return {}
+        return {
+            symbol: value.to_pydatetime()
+            for symbol, value in snapshot["datetime"].items()
+        }
+
+    def _fetch_loop(self, jobs: queue.Queue):
+        """Fetch thread: fetch, validate and route symbols until none are left."""
+        while True:
+            try:
+                database, symbol, since = jobs.get_nowait()
+            except queue.Empty:
+                return
+            start = time.perf_counter()
+            try:
+                frame = self._prepare(database, symbol, since)
+            except Exception as e:
+                logger.error(f"Backfill fetch of {database}.{symbol} failed: {e}")
+                frame = None
+                with self._lock:
+                    self._stats[database].failed.append(symbol)
+            else:
+                if frame is None:
+                    with self._lock:
+                        self._stats[database].up_to_date += 1
+            with self._lock:
+                self._stats[database].fetch_seconds += time.perf_counter() - start
+            if frame is not None:
+                self._queues[database].put((symbol, frame))
+
+    def _prepare(
+        self, database: str, symbol: str, since: Optional[datetime.datetime]
+    ) -> Optional["pl.DataFrame"]:
+        """
+        Fetch and validate one symbol.
+
+        Returns:
+            Validated polars frame of rows after since, or None if there
+            are none
+
+        Raises:
+            TypeError: If the fetched data is not a DataFrame or Arrow data
+            ValueError: If the fetched data misses required columns
+        """
+        data = self.fetch(database, symbol, since)
+        if data is None:
+            return None
+        if _is_dataframe(data, "pandas"):
+            data = pl.from_pandas(data)
+        elif not _is_dataframe(data, "polars"):
+            # pyarrow Table or RecordBatch
+            data = pl.from_arrow(data)
+        if data.height == 0:
+            return None
+
+        missing_columns = set(REQUIRED_COLUMNS) - set(data.columns)
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        rules = self.rules or self.handlers[database].validation_rules
+        data = _validate_polars(data, symbol, rules)
+        if since is not None:
+            data = data.filter(pl.col("datetime") > since.strftime(DATETIME_FORMAT))
+        return data if data.height else None
+
+    def _write_loop(self, database: str, started: float):
+        """Writer thread: commit queued frames in batches of batch_rows."""
+        inbox = self._queues[database]
+        batch_rows = self.batch_rows[database]
+        batch: List[tuple] = []
+        rows = 0
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            batch.append(item)
+            rows += item[1].height
+            if rows >= batch_rows:
+                self._commit(database, batch, rows)
+                batch, rows = [], 0
+        if batch:
+            self._commit(database, batch, rows)
+        self._stats[database].elapsed_seconds = time.perf_counter() - started
+
+    def _commit(self, database: str, batch: List[tuple], rows: int):
+        """Write one batch of (symbol, frame) in one transaction."""
+        handler = self.handlers[database]
+        stats = self._stats[database]
+        start = time.perf_counter()
+        try:
+            with handler.transaction() as conn:
+                for symbol, frame in batch:
+                    column_types = {
+                        name: _sql_type(dtype) for name, dtype in frame.schema.items()
+                    }
+                    handler._create_table(conn, symbol, column_types)
+                    handler._insert_rows(conn, symbol, frame.columns, frame.iter_rows())
+        except Exception as e:
+            logger.error(
+                f"Backfill {database} batch of {len(batch)} symbols rolled back: {e}"
+            )
+            with self._lock:
+                stats.failed.extend(symbol for symbol, _ in batch)
+            return
+
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            stats.rows += rows
+            stats.symbols += len(batch)
+            stats.batches += 1
+            stats.write_seconds += elapsed
+        logger.debug(
+            f"Backfill {database} committed {rows} rows for {len(batch)} symbols "
+            f"in {elapsed * 1000:.1f}ms"
+        )
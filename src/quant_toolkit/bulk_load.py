@@ -0,0 +1,393 @@
+"""
+Bulk-load mode for initial backfills.
+
+Live ingest runs with WAL, synchronous=NORMAL, a modest page cache, the
+symbol indexes in place and a transaction per call. That is the right
+trade-off for a database that must survive a crash at any moment, but it
+makes the initial load of years of history several times slower than it
+needs to be. BulkLoader relaxes all of that for the duration of a load:
+
+    - one dedicated connection, holding an exclusive lock and writing
+      through a rollback journal instead of the WAL when the database is
+      not open elsewhere
+    - synchronous=OFF and a large page cache
+    - commits every commit_rows rows instead of per call
+    - index creation deferred to the end, so indexes are built once from
+      sorted data instead of being maintained row by row
+
+When the load ends, safe settings are restored. The deferred indexes are
+built and ANALYZE runs on the loaded tables. The WAL is then checkpointed
+so that the load is durable.
+
+CRASH-UNSAFE WHILE ACTIVE: with synchronous=OFF a power loss or OS crash
+during the load can corrupt the database. Load into a new database, or
+take DataHandler.snapshot() first. A crash of the Python process alone
+loses only the chunk in flight: the exclusive path keeps an on-disk
+rollback journal (journal_mode=TRUNCATE), so the next connection rolls
+the uncommitted chunk back, and every DataHandler connection switches
+the database back to WAL.
+
+Classes:
+    BulkLoader: Context manager for fast, crash-unsafe initial loads
+
+Usage:
+    from quant_toolkit.sqlite_data_manager import DataHandler
+
+    handler = DataHandler(db_path)
+    with handler.bulk_load(commit_rows=2_000_000) as loader:
+        for symbol, bars in history.items():
+            loader.inject(symbol, bars)      # pandas, polars or Arrow
+    print(loader.rows, loader.commits)
+"""
+
+import logging
+import sqlite3
+import time
+from contextlib import ExitStack
+from typing import TYPE_CHECKING, List, Optional
+
+from quant_toolkit._lazy import LazyModule
+from quant_toolkit.sqlite_data_manager import (
+    REQUIRED_COLUMNS,
+    ValidationRules,
+    _arrow_sql_type,
+    _is_dataframe,
+    _pandas_column_values,
+    _pandas_sql_type,
+    _quote,
+    _sql_type,
+    _validate_arrow,
+    _validate_pandas,
+    _validate_polars,
+)
+
+if TYPE_CHECKING:
+    from quant_toolkit.sqlite_data_manager import DataHandler
+
+pa = LazyModule("pyarrow")
+
+logger = logging.getLogger(__name__)
+
+# Rows sampled per index by the closing ANALYZE
+ANALYSIS_LIMIT = 1000
+
+
+class BulkLoader:
+    """
+    Fast, crash-unsafe loader with deferred indexes and chunked commits.
+
+    Attributes:
+        handler: DataHandler loaded into
+        commit_rows: Rows written between commits
+        cache_size_mb: Page cache of the load connection
+        analyze: Whether ANALYZE runs on the loaded tables at the end
+        rows: Rows inserted so far
+        commits: Commits so far
+    """
+
+    def __init__(
+        self,
+        handler: "DataHandler",
+        commit_rows: int = 1_000_000,
+        cache_size_mb: int = 512,
+        analyze: bool = True,
+    ):
+        """
+        Initialize the loader (enter it to start loading).
+
+        Args:
+            handler: DataHandler to load into
+            commit_rows: Rows per commit (default: 1,000,000)
+            cache_size_mb: Page cache of the load connection (default: 512)
+            analyze: Run ANALYZE on the loaded tables at the end
+                (default: True)
+
+        Raises:
+            ValueError: If commit_rows or cache_size_mb is not positive
+        """
+        if commit_rows <= 0:
+            raise ValueError("commit_rows must be positive")
+        if cache_size_mb <= 0:
+            raise ValueError("cache_size_mb must be positive")
+
+        self.handler = handler
+        self.commit_rows = commit_rows
+        self.cache_size_mb = cache_size_mb
+        self.analyze = analyze
+        self.rows = 0
+        self.commits = 0
+
+        self._conn = None
+        self._stack: Optional[ExitStack] = None
+        self._pending = 0
+        self._symbols: List[str] = []
+        self._started = 0.0
+        self._exclusive = False
+
+    @property
+    def active(self) -> bool:
+        """Whether the load is in progress."""
+        return self._conn is not None
+
+    def __enter__(self) -> "BulkLoader":
+        if self.active:
+            raise RuntimeError("Bulk load already in progress")
+        handler = self.handler
+        if handler._deferred_indexes is not None:
+            raise RuntimeError(f"Another bulk load of {handler.db_path} is active")
+
+        self._stack = ExitStack()
+        if handler.lease is not None:
+            # Other processes' writers queue for the whole load
+            self._stack.enter_context(handler.lease.hold())
+        conn = None
+        try:
+            # Idle pooled connections would keep the database in WAL mode
+            handler.pool.close_all()
+            # A connection of its own: closing it drops every relaxed setting
+            conn = handler.pool._create_connection()
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(f"PRAGMA cache_size=-{self.cache_size_mb * 1024}")
+            self._exclusive = self._take_exclusive(conn)
+            if not self._exclusive:
+                conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            if conn is not None:
+                conn.close()
+            self._stack.close()
+            raise
+
+        handler._deferred_indexes = {}
+        self._conn = conn
+        self._started = time.perf_counter()
+        mode = "exclusive lock" if self._exclusive else "shared WAL"
+        logger.warning(
+            f"Bulk load of {handler.db_path} started: synchronous=OFF, {mode}; "
+            "the database is not crash-safe until the load ends"
+        )
+        return self
+
+    def _take_exclusive(self, conn) -> bool:
+        """
+        Lock the database and write pages straight into the database file.
+
+        In WAL mode every page is written twice, to the WAL and again by
+        the checkpoint. A rollback journal only copies pages that existed
+        before the transaction, so appended bars are written once, and it
+        stays on disk so that a crashed load can be rolled back. Both
+        leaving WAL and an exclusive lock need the database to be open
+        nowhere else; if it is (a reader in another process, say), the load
+        runs in WAL mode next to it instead.
+
+        Returns:
+            True if the exclusive lock is held (in a write transaction)
+        """
+        conn.execute("PRAGMA busy_timeout=0")
+        try:
+            conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+            mode = conn.execute("PRAGMA journal_mode=TRUNCATE").fetchone()[0]
+            if mode != "truncate":
+                raise sqlite3.OperationalError(f"journal mode stays {mode}")
+            conn.execute("BEGIN IMMEDIATE")
+            return True
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA locking_mode=NORMAL")
+            logger.warning(
+                f"Bulk load of {self.handler.db_path} runs in WAL mode, "
+                f"the database is open elsewhere ({e})"
+            )
+            return False
+        finally:
+            conn.execute(f"PRAGMA busy_timeout={int(self.handler.pool.timeout * 1000)}")
+
+    def inject(
+        self,
+        symbol: str,
+        data,
+        if_exists: str = "append",
+        rules: Optional[ValidationRules] = None,
+    ) -> int:
+        """
+        Load bars for a symbol, committing once commit_rows are pending.
+
+        Rows are validated and written with the handler's own helpers, not
+        through inject_data/inject_arrow: their QuantLogger wrapper logs and
+        swallows errors, which would leave the load to fail at exit.
+
+        Args:
+            symbol: Security symbol
+            data: pandas or polars DataFrame, or Arrow RecordBatch, Table or
+                iterable of batches
+            if_exists: "append" (default), "replace" or "fail", as for
+                inject_data
+            rules: Validation rules (defaults to the handler's
+                validation_rules)
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            RuntimeError: If the loader has not been entered
+            InvalidDataError: If rows fail rules with on_invalid="raise"
+            ValueError: If data misses required columns
+            TypeError: If data is not a DataFrame or Arrow data
+        """
+        if not self.active:
+            raise RuntimeError("Bulk load is not active, use it as a context manager")
+        if not symbol:
+            raise ValueError("Symbol cannot be empty")
+
+        rules = rules or self.handler.validation_rules
+        if _is_arrow(data):
+            inserted = self._write_arrow(symbol, data, if_exists, rules)
+        else:
+            inserted = self._write_frame(symbol, data, if_exists, rules)
+
+        if inserted and symbol not in self._symbols:
+            self._symbols.append(symbol)
+        self.rows += inserted
+        self._pending += inserted
+        if self._pending >= self.commit_rows:
+            self.commit()
+        return inserted
+
+    def _write_frame(
+        self, symbol: str, data, if_exists: str, rules: ValidationRules
+    ) -> int:
+        """Validate and insert a pandas or polars frame."""
+        is_polars = _is_dataframe(data, "polars")
+        if not (is_polars or _is_dataframe(data, "pandas")):
+            raise TypeError(
+                f"Data must be pandas or polars DataFrame, got {type(data)}"
+            )
+        if data.shape[0] == 0:
+            return 0
+        _check_columns(data.columns)
+
+        if is_polars:
+            data = _validate_polars(data, symbol, rules)
+            column_types = {
+                name: _sql_type(dtype) for name, dtype in data.schema.items()
+            }
+            rows = data.iter_rows()
+        else:
+            data = _validate_pandas(data, symbol, rules)
+            column_types = {
+                name: _pandas_sql_type(dtype) for name, dtype in data.dtypes.items()
+            }
+            rows = zip(*(_pandas_column_values(data[name]) for name in data.columns))
+        self.handler._create_table(self._conn, symbol, column_types, if_exists)
+        return self.handler._insert_rows(self._conn, symbol, list(data.columns), rows)
+
+    def _write_arrow(
+        self, symbol: str, data, if_exists: str, rules: ValidationRules
+    ) -> int:
+        """Validate and insert Arrow data batch by batch."""
+        if isinstance(data, (pa.RecordBatch, pa.Table)):
+            data = [data]
+
+        total = 0
+        table_ready = False
+        for item in data:
+            batches = item.to_batches() if isinstance(item, pa.Table) else [item]
+            for batch in batches:
+                if batch.num_rows == 0:
+                    continue
+                _check_columns(batch.schema.names)
+                batch = _validate_arrow(batch, symbol, rules)
+                if not table_ready:
+                    column_types = {
+                        field.name: _arrow_sql_type(field.type)
+                        for field in batch.schema
+                    }
+                    self.handler._create_table(
+                        self._conn, symbol, column_types, if_exists
+                    )
+                    table_ready = True
+                columns = [column.to_pylist() for column in batch.columns]
+                total += self.handler._insert_rows(
+                    self._conn, symbol, batch.schema.names, zip(*columns)
+                )
+        return total
+
+    def commit(self):
+        """Commit the rows loaded so far (without an fsync)."""
+        if not self.active:
+            raise RuntimeError("Bulk load is not active, use it as a context manager")
+        self._conn.commit()
+        self.commits += 1
+        self._pending = 0
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        handler = self.handler
+        conn = self._conn
+        deferred = handler._deferred_indexes or {}
+        handler._deferred_indexes = None
+        try:
+            if exc_type is None:
+                conn.commit()
+                self.commits += 1
+            else:
+                # Earlier chunks stay committed, as with inject_arrow
+                conn.rollback()
+                logger.error(
+                    f"Bulk load of {handler.db_path} failed, "
+                    f"last chunk rolled back: {exc}"
+                )
+            self._finish(conn, deferred, analyze=self.analyze and exc_type is None)
+        finally:
+            conn.close()
+            self._conn = None
+            self._stack.close()
+            # Tables were created outside the pool's connections
+            handler._symbols_cache = None
+
+        logger.info(
+            f"Bulk load of {handler.db_path} finished: {self.rows} rows, "
+            f"{len(self._symbols)} symbols, {self.commits} commits, "
+            f"{len(deferred)} indexes in {time.perf_counter() - self._started:.1f}s"
+        )
+
+    def _finish(self, conn, deferred: dict, analyze: bool):
+        """Build deferred indexes, analyze, restore safe settings durably."""
+        for symbol, suffix, columns_sql in deferred.values():
+            self.handler._ensure_index(symbol, suffix, columns_sql, conn)
+        if analyze:
+            # Sampled statistics: enough for the planner, no full scans
+            conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+            for symbol in self._symbols:
+                conn.execute(f"ANALYZE {_quote(symbol)}")
+        conn.commit()
+        if self._exclusive:
+            # The switch back to WAL syncs the database file (synchronous=FULL
+            # for this one step), which is what makes the load durable
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # The exclusive lock is released by the next access
+            conn.execute("PRAGMA locking_mode=NORMAL")
+            conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        else:
+            # Syncs the WAL, then copies it into the database file and syncs that
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+
+def _check_columns(columns):
+    """Raise ValueError if required OHLCV columns are missing."""
+    missing_columns = set(REQUIRED_COLUMNS) - set(columns)
+    if missing_columns:
+        raise ValueError(f"Missing required columns: {missing_columns}")
+
+
+def _is_arrow(data) -> bool:
+    """Check for Arrow data, which inject_arrow streams."""
+    if isinstance(data, (list, tuple)):
+        return bool(data) and all(_is_arrow(item) for item in data)
+    return type(data).__module__.startswith("pyarrow") and isinstance(
+        data, (pa.RecordBatch, pa.Table, pa.RecordBatchReader)
+    )
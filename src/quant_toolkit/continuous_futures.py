@@ -0,0 +1,459 @@
+"""
+Continuous futures series with roll adjustment.
+
+Futures data is stored per contract (e.g. "NSE:NIFTY24DECFUT"), and
+DataHandler._convert_symbol_to_ticker only maps NIFTY_FUT/NIFTY_FUT2 to the
+contract trading on a given day. ContinuousFuturesBuilder stitches those
+per-contract histories into one series: the monthly expiry calendar decides
+which contract is live on each day, and the price gap at every roll is
+removed by back-adjusting all earlier bars, so the latest prices stay real
+and returns across rolls are not distorted.
+
+Adjustment is vectorized over the whole series: each roll contributes one
+offset (difference) or factor (ratio), a reversed cumulative sum/product
+turns those into one value per contract segment, and a single np.repeat
+applies them to every bar. The raw stitched series, rolls and adjusted
+series are cached, and extend() appends new bars (including a new roll)
+without re-reading history.
+
+Classes:
+    ContinuousFuturesBuilder: Builds and incrementally extends a continuous series
+
+Usage:
+    from quant_toolkit.sqlite_data_manager import DataHandler, DBPaths
+    from quant_toolkit.continuous_futures import ContinuousFuturesBuilder
+
+    handler = DataHandler(DBPaths().futures_db_path)
+    builder = ContinuousFuturesBuilder(handler, "NIFTY", method="ratio")
+
+    series = builder.build("2022-01-01")   # datetime, OHLCV, contract
+    print(builder.rolls)                   # roll dates and adjustments
+
+    # Later, after new bars were ingested
+    series = builder.extend()
+"""
+
+import datetime
+import logging
+import sqlite3
+from typing import List, Literal, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from quant_toolkit.market_contracts import MarketContracts
+from quant_toolkit.sqlite_data_manager import DATETIME_FORMAT, DataHandler, _quote
+
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+class ContinuousFuturesBuilder:
+    """
+    Stitch monthly futures contracts into a back-adjusted continuous series.
+
+    Contract k covers the days from the previous roll up to (excluding) its
+    own roll date. The roll date is the day after expiry, or
+    ``roll_days_before_expiry`` trading days before it. At each roll the gap
+    is measured between the old contract's last close and the new
+    contract's close at (or before) the same bar.
+
+    Attributes:
+        handler: DataHandler of the futures database
+        symbol: Underlying symbol (e.g. "NIFTY")
+        exchange: "NSE" or "BSE"
+        method: "difference" (add gaps), "ratio" (scale by gaps) or "none"
+        roll_days_before_expiry: Trading days before expiry to roll on
+        rolls: DataFrame of rolls in the cached series (roll datetime,
+            contracts, prices and adjustment)
+    """
+
+    def __init__(
+        self,
+        handler: DataHandler,
+        symbol: str,
+        exchange: str = "NSE",
+        method: Literal["difference", "ratio", "none"] = "difference",
+        roll_days_before_expiry: int = 0,
+        market_contracts: Optional[MarketContracts] = None,
+    ):
+        """
+        Initialize the builder.
+
+        Args:
+            handler: DataHandler of the database holding per-contract tables
+            symbol: Underlying symbol (e.g. "NIFTY", "BANKNIFTY")
+            exchange: "NSE" or "BSE" (default: "NSE")
+            method: Back-adjustment method (default: "difference")
+            roll_days_before_expiry: Roll this many trading days before
+                expiry; 0 rolls on the first day after expiry (default: 0)
+            market_contracts: MarketContracts for the expiry calendar and
+                tickers (default: the handler's)
+        """
+        if method not in ("difference", "ratio", "none"):
+            raise ValueError(f"Invalid adjustment method: {method}")
+        if roll_days_before_expiry < 0:
+            raise ValueError("roll_days_before_expiry cannot be negative")
+
+        self.handler = handler
+        self.symbol = symbol
+        self.exchange = exchange.upper()
+        self.method = method
+        self.roll_days_before_expiry = roll_days_before_expiry
+        self.market_contracts = market_contracts or handler.market_contracts
+
+        # Cached state: raw stitched bars, their segment ids and the result
+        self._raw: Optional[pd.DataFrame] = None
+        self._segments: List[dict] = []
+        self._adjusted: Optional[pd.DataFrame] = None
+        self._end: Optional[datetime.date] = None
+        self.rolls = pd.DataFrame(
+            columns=[
+                "datetime",
+                "from_contract",
+                "to_contract",
+                "old_price",
+                "new_price",
+                "adjustment",
+            ]
+        )
+
+    # ============= Roll schedule =============
+
+    def contract_ticker(self, expiry: datetime.date) -> str:
+        """
+        Get the ticker (table name) of the contract expiring on a date.
+
+        Args:
+            expiry: Contract expiry date
+
+        Returns:
+            Futures ticker, e.g. "NSE:NIFTY24DECFUT"
+        """
+        details = self.market_contracts.create_contract_details(
+            self.exchange, self.symbol, expiry, "FUT", "MONTHLY"
+        )
+        return self.market_contracts.generate_ticker_from_details(details)
+
+    def _roll_date(self, expiry: datetime.date) -> datetime.date:
+        """First day on which the next contract is used."""
+        if self.roll_days_before_expiry == 0:
+            return expiry + datetime.timedelta(days=1)
+        day = expiry
+        remaining = self.roll_days_before_expiry
+        while remaining:
+            day -= datetime.timedelta(days=1)
+            if self.market_contracts.is_trading_day(day):
+                remaining -= 1
+        return day
+
+    def roll_schedule(
+        self, start: datetime.date, end: Optional[datetime.date] = None
+    ) -> pd.DataFrame:
+        """
+        Get the contract used on each part of a date range.
+
+        Args:
+            start: First date of the range
+            end: Last date of the range (default: today)
+
+        Returns:
+            DataFrame with contract, expiry, start (inclusive) and end
+            (exclusive) dates per contract, ascending
+        """
+        end = end or datetime.date.today()
+        # Look one month past end: rolls before expiry can move end into it
+        horizon = (end.replace(day=1) + datetime.timedelta(days=62)).replace(day=1)
+        expiries = self.market_contracts.monthly_expiries(self.exchange, start, horizon)
+
+        rows = []
+        window_start = start
+        for expiry in expiries:
+            roll = self._roll_date(expiry)
+            if roll <= window_start:
+                continue
+            rows.append(
+                {
+                    "contract": self.contract_ticker(expiry),
+                    "expiry": expiry,
+                    "start": window_start,
+                    "end": roll,
+                }
+            )
+            if roll > end:
+                break
+            window_start = roll
+        return pd.DataFrame(rows, columns=["contract", "expiry", "start", "end"])
+
+    # ============= Loading =============
+
+    def _load_segment(
+        self,
+        conn: sqlite3.Connection,
+        contract: str,
+        start: Union[datetime.date, str],
+        end: datetime.date,
+    ) -> Optional[pd.DataFrame]:
+        """Read one contract's bars in [start, end), or None if it has none."""
+        if not self.handler._symbol_exists(contract, conn):
+            logger.warning(f"Contract {contract} not found, skipping it")
+            return None
+        start = start if isinstance(start, str) else start.strftime("%Y-%m-%d")
+        frame = pd.read_sql_query(
+            f"SELECT * FROM {_quote(contract)} "
+            "WHERE datetime >= ? AND datetime < ? ORDER BY datetime",
+            conn,
+            params=(start, end.strftime("%Y-%m-%d")),
+        )
+        if frame.empty:
+            return None
+        frame["datetime"] = pd.to_datetime(frame["datetime"], format=DATETIME_FORMAT)
+        return frame
+
+    def _price_at(
+        self, conn: sqlite3.Connection, contract: str, when: pd.Timestamp
+    ) -> Optional[float]:
+        """Close of a contract at or before a bar time, or None."""
+        if not self.handler._symbol_exists(contract, conn):
+            return None
+        row = conn.execute(
+            f"SELECT close FROM {_quote(contract)} WHERE datetime <= ? "
+            "ORDER BY datetime DESC LIMIT 1",
+            (when.strftime(DATETIME_FORMAT),),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _add_segment(
+        self, conn: sqlite3.Connection, contract: str, frame: pd.DataFrame
+    ) -> Optional[float]:
+        """
+        Register a new contract segment and measure the roll gap into it.
+
+        Returns:
+            Adjustment for the roll (offset or factor), None for the first segment
+
+        Raises:
+            ValueError: If method is "ratio" and the old contract's close is
+                not positive
+        """
+        adjustment = None
+        if self._segments:
+            previous = self._segments[-1]
+            roll_time = previous["last"]
+            old_price = previous["last_close"]
+            new_price = self._price_at(conn, contract, roll_time)
+            if new_price is None:
+                # No overlap: compare across the session gap instead
+                new_price = float(frame["open"].iloc[0])
+            if self.method == "ratio":
+                if old_price <= 0:
+                    raise ValueError(
+                        f"Cannot ratio-adjust the roll from {previous['contract']} "
+                        f"at {roll_time}: close is {old_price}, use "
+                        "method='difference' instead"
+                    )
+                adjustment = new_price / old_price
+            elif self.method == "difference":
+                adjustment = new_price - old_price
+            else:
+                adjustment = 0.0
+            self.rolls.loc[len(self.rolls)] = [
+                frame["datetime"].iloc[0],
+                previous["contract"],
+                contract,
+                old_price,
+                new_price,
+                adjustment,
+            ]
+        self._segments.append(
+            {
+                "contract": contract,
+                "rows": len(frame),
+                "last": frame["datetime"].iloc[-1],
+                "last_close": float(frame["close"].iloc[-1]),
+            }
+        )
+        return adjustment
+
+    # ============= Adjustment =============
+
+    def _adjust(self, raw: pd.DataFrame) -> pd.DataFrame:
+        """Back-adjust every segment of raw in one vectorized pass."""
+        adjusted = raw.copy()
+        if self.method == "none" or len(self._segments) < 2:
+            return adjusted
+
+        gaps = self.rolls["adjustment"].to_numpy(dtype=float)
+        lengths = [segment["rows"] for segment in self._segments]
+        # Each segment is shifted by every roll after it: reversed cumsum/cumprod
+        if self.method == "ratio":
+            per_segment = np.append(np.cumprod(gaps[::-1])[::-1], 1.0)
+            factors = np.repeat(per_segment, lengths)
+            for column in PRICE_COLUMNS:
+                adjusted[column] = raw[column].to_numpy(dtype=float) * factors
+        else:
+            per_segment = np.append(np.cumsum(gaps[::-1])[::-1], 0.0)
+            offsets = np.repeat(per_segment, lengths)
+            for column in PRICE_COLUMNS:
+                adjusted[column] = raw[column].to_numpy(dtype=float) + offsets
+        return adjusted
+
+    def _apply_roll(self, adjusted: pd.DataFrame, adjustment: float):
+        """Shift already-adjusted history by one new roll, in place."""
+        if self.method == "ratio":
+            for column in PRICE_COLUMNS:
+                adjusted[column] = adjusted[column].to_numpy(dtype=float) * adjustment
+        elif self.method == "difference":
+            for column in PRICE_COLUMNS:
+                adjusted[column] = adjusted[column].to_numpy(dtype=float) + adjustment
+
+    # ============= Public API =============
+
+    def build(
+        self,
+        start: Union[str, datetime.date],
+        end: Optional[Union[str, datetime.date]] = None,
+    ) -> pd.DataFrame:
+        """
+        Build the continuous series from scratch and cache it.
+
+        Args:
+            start: First date ("YYYY-MM-DD" or date)
+            end: Last date, inclusive (default: today)
+
+        Returns:
+            DataFrame with datetime, open, high, low, close, volume (and oi if
+            stored) plus the contract each bar came from
+
+        Raises:
+            ValueError: If method is "ratio" and a roll is from a non-positive
+                close
+        """
+        if isinstance(start, str):
+            start = datetime.datetime.strptime(start, "%Y-%m-%d").date()
+        if isinstance(end, str):
+            end = datetime.datetime.strptime(end, "%Y-%m-%d").date()
+        end = end or datetime.date.today()
+
+        self._segments = []
+        self.rolls = self.rolls.iloc[0:0]
+        schedule = self.roll_schedule(start, end)
+        stop = end + datetime.timedelta(days=1)
+
+        frames = []
+        with self.handler.read_connection() as conn:
+            for row in schedule.itertuples(index=False):
+                frame = self._load_segment(
+                    conn, row.contract, row.start, min(row.end, stop)
+                )
+                if frame is None:
+                    continue
+                frame["contract"] = row.contract
+                self._add_segment(conn, row.contract, frame)
+                frames.append(frame)
+
+        if frames:
+            self._raw = pd.concat(frames, ignore_index=True)
+        else:
+            logger.warning(f"No contract data found for {self.symbol}")
+            self._raw = pd.DataFrame(
+                columns=["datetime", *PRICE_COLUMNS, "volume", "contract"]
+            )
+        self._end = end
+        self._adjusted = self._adjust(self._raw)
+        logger.info(
+            f"Built continuous {self.symbol} series: {len(self._raw)} bars, "
+            f"{len(self.rolls)} rolls ({self.method})"
+        )
+        return self._adjusted
+
+    def extend(self, end: Optional[Union[str, datetime.date]] = None) -> pd.DataFrame:
+        """
+        Append bars added since the last build/extend to the cached series.
+
+        Only bars after the cached series are read. If they cross a roll,
+        the new contract's gap is applied to a copy of the cached history;
+        frames returned earlier are left unchanged.
+
+        Args:
+            end: Last date, inclusive (default: today)
+
+        Returns:
+            The extended continuous series
+
+        Raises:
+            RuntimeError: If build() has not been called
+            ValueError: If method is "ratio" and a new roll is from a
+                non-positive close
+        """
+        if self._adjusted is None:
+            raise RuntimeError("Nothing cached to extend, call build() first")
+        if not self._segments:
+            return self.build(self._end, end)
+        if isinstance(end, str):
+            end = datetime.datetime.strptime(end, "%Y-%m-%d").date()
+        end = end or datetime.date.today()
+
+        last = self._segments[-1]["last"]
+        after = (last + pd.Timedelta(seconds=1)).strftime(DATETIME_FORMAT)
+        schedule = self.roll_schedule(last.date(), end)
+        stop = end + datetime.timedelta(days=1)
+
+        # Rolls are applied to a copy: callers may hold the previous series
+        raw_frames, adjusted_frames = [self._raw], [self._adjusted.copy()]
+        with self.handler.read_connection() as conn:
+            for row in schedule.itertuples(index=False):
+                frame = self._load_segment(
+                    conn,
+                    row.contract,
+                    max(after, row.start.strftime("%Y-%m-%d")),
+                    min(row.end, stop),
+                )
+                if frame is None:
+                    continue
+                frame["contract"] = row.contract
+                if row.contract == self._segments[-1]["contract"]:
+                    segment = self._segments[-1]
+                    segment["rows"] += len(frame)
+                    segment["last"] = frame["datetime"].iloc[-1]
+                    segment["last_close"] = float(frame["close"].iloc[-1])
+                else:
+                    adjustment = self._add_segment(conn, row.contract, frame)
+                    for adjusted in adjusted_frames:
+                        self._apply_roll(adjusted, adjustment)
+                raw_frames.append(frame)
+                # The newest segment is never adjusted
+                adjusted_frames.append(frame.copy())
+
+        if len(raw_frames) > 1:
+            self._raw = pd.concat(raw_frames, ignore_index=True)
+            self._adjusted = pd.concat(adjusted_frames, ignore_index=True)
+        self._end = end
+        return self._adjusted
+
+    @property
+    def series(self) -> Optional[pd.DataFrame]:
+        """The cached continuous series, or None before build()."""
+        return self._adjusted
+
+    def save(
+        self, table: Optional[str] = None, handler: Optional[DataHandler] = None
+    ) -> str:
+        """
+        Store the cached series as a table, replacing any previous copy.
+
+        Args:
+            table: Table name (default: "{symbol}_CONT")
+            handler: DataHandler to write to (default: the source handler)
+
+        Returns:
+            Name of the written table
+        """
+        if self._adjusted is None:
+            raise RuntimeError("Nothing cached to save, call build() first")
+        table = table or f"{self.symbol}_CONT"
+        (handler or self.handler).inject_data(
+            table, self._adjusted.drop(columns="contract"), if_exists="replace"
+        )
+        return table
@@ -0,0 +1,188 @@
+"""
+Background maintenance for SQLite market data databases.
+
+Large deletes (delete_security_from_date, check_db_integrity with
+delete_stale=True) leave free pages behind, backfills grow the WAL, and
+query plans drift without fresh statistics. DataHandler exposes the
+individual maintenance steps (optimize, incremental_vacuum, checkpoint) and
+run_maintenance() to run them together. MaintenanceScheduler runs
+run_maintenance() periodically, but only once the handler's connection pool
+has been idle for a while, so maintenance never competes with ingest.
+
+Classes:
+    MaintenanceReport: Durations and bytes reclaimed by one maintenance run
+    MaintenanceScheduler: Background thread running maintenance in idle windows
+
+Usage:
+    from quant_toolkit.sqlite_data_manager import DataHandler
+
+    handler = DataHandler(db_path)
+
+    # One-off run after a large delete
+    report = handler.run_maintenance()
+    print(report.bytes_reclaimed, report.durations_ms)
+
+    # Hourly maintenance once the pool has been idle for 60 seconds
+    scheduler = handler.schedule_maintenance(interval=3600, idle_seconds=60)
+    ...
+    scheduler.stop()
+"""
+
+import datetime
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from quant_toolkit.sqlite_data_manager import DataHandler
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class MaintenanceReport:
+    """
+    Outcome of one DataHandler.run_maintenance() call.
+
+    Attributes:
+        started_at: When the run started
+        durations_ms: Milliseconds spent per step ("optimize", "vacuum",
+            "checkpoint")
+        db_bytes_before: Database file size before the run
+        db_bytes_after: Database file size after the run
+        wal_bytes_before: WAL file size before the run
+        wal_bytes_after: WAL file size after the run
+        pages_freed: Pages released by incremental vacuum
+        checkpoint: (busy, wal_frames, checkpointed_frames) from wal_checkpoint
+    """
+
+    started_at: datetime.datetime = field(default_factory=datetime.datetime.now)
+    durations_ms: Dict[str, float] = field(default_factory=dict)
+    db_bytes_before: int = 0
+    db_bytes_after: int = 0
+    wal_bytes_before: int = 0
+    wal_bytes_after: int = 0
+    pages_freed: int = 0
+    checkpoint: Optional[Tuple[int, int, int]] = None
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        """Bytes released from the database and WAL files combined."""
+        return (self.db_bytes_before + self.wal_bytes_before) - (
+            self.db_bytes_after + self.wal_bytes_after
+        )
+
+    @property
+    def total_ms(self) -> float:
+        """Total milliseconds spent across all steps."""
+        return sum(self.durations_ms.values())
+
+
+class MaintenanceScheduler:
+    """
+    Background thread running DataHandler.run_maintenance() in idle windows.
+
+    Every ``interval`` seconds the scheduler waits until no pooled connection
+    is checked out and none has been used for ``idle_seconds``, then runs
+    maintenance. Reports of recent runs are kept in ``reports``.
+
+    Attributes:
+        handler: DataHandler to maintain
+        interval: Seconds between maintenance runs
+        idle_seconds: Required pool idle time before a run starts
+        reports: Most recent MaintenanceReports, newest last
+    """
+
+    def __init__(
+        self,
+        handler: "DataHandler",
+        interval: float = 3600.0,
+        idle_seconds: float = 30.0,
+        poll_seconds: float = 1.0,
+        history: int = 24,
+        **maintenance_kwargs,
+    ):
+        """
+        Initialize the scheduler (call start() to begin).
+
+        Args:
+            handler: DataHandler to maintain
+            interval: Seconds between maintenance runs (default: 3600.0)
+            idle_seconds: Pool idle time required before running (default: 30.0)
+            poll_seconds: How often to re-check for an idle window (default: 1.0)
+            history: Number of reports kept (default: 24)
+            **maintenance_kwargs: Passed to DataHandler.run_maintenance()
+        """
+        self.handler = handler
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self.poll_seconds = poll_seconds
+        self.maintenance_kwargs = maintenance_kwargs
+        self.reports: deque = deque(maxlen=history)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def last_report(self) -> Optional[MaintenanceReport]:
+        """Report of the most recent run, if any."""
+        return self.reports[-1] if self.reports else None
+
+    def start(self) -> "MaintenanceScheduler":
+        """Start the background thread."""
+        if self.running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="quant-toolkit-maintenance", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Maintenance scheduler started for {self.handler.db_path} "
+            f"(interval={self.interval}s, idle={self.idle_seconds}s)"
+        )
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the background thread.
+
+        Args:
+            timeout: Seconds to wait for a running maintenance step to finish
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        logger.info(f"Maintenance scheduler stopped for {self.handler.db_path}")
+
+    def _is_idle(self) -> bool:
+        """Check whether the handler's pool is in an idle window."""
+        pool = self.handler.pool
+        return pool.in_use == 0 and pool.idle_for >= self.idle_seconds
+
+    def _run(self):
+        """Scheduler loop: wait an interval, then an idle window, then run."""
+        while not self._stop.wait(self.interval):
+            while not self._is_idle():
+                if self._stop.wait(self.poll_seconds):
+                    return
+            try:
+                report = self.handler.run_maintenance(**self.maintenance_kwargs)
+            except Exception as e:
+                logger.error(f"Scheduled maintenance failed: {e}")
+                continue
+            # QuantLogger logs and swallows errors, returning None
+            if report is not None:
+                self.reports.append(report)
+
+    def __enter__(self) -> "MaintenanceScheduler":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,677 @@
+"""
+Coalescing writer for live bars.
+
+Calling DataHandler.inject_data once per symbol per bar pays for validation,
+a pool checkout, a transaction and a WAL sync on every call; with a few
+hundred symbols on a one-minute feed that is hundreds of commits a minute.
+LiveBarWriter accepts single bars from any number of threads or asyncio
+tasks, buffers them in a bounded queue, coalesces them per symbol (a bar
+resubmitted for the same datetime before the next flush replaces the earlier
+one) and writes every symbol in a single transaction ("group commit") once
+the flush interval elapses or enough rows are buffered. When a group commit
+fails, each symbol is retried in a transaction of its own, so one symbol
+whose bars cannot be written (a column its table lacks, say) is set aside
+instead of stalling the whole feed.
+
+Classes:
+    LiveBarWriter: Background group-commit writer for live bars
+    WriterMetrics: Snapshot of throughput, latency and durability counters
+
+Usage:
+    from quant_toolkit.sqlite_data_manager import DataHandler
+
+    handler = DataHandler(db_path)
+
+    with handler.live_writer(flush_interval_ms=500) as writer:
+        writer.submit("NIFTY", {"datetime": ts, "open": 1.0, "high": 2.0,
+                                "low": 0.5, "close": 1.5, "volume": 100})
+        await writer.asubmit("BANKNIFTY", bar)   # from async code
+
+        writer.flush()          # block until everything submitted is committed
+        print(writer.metrics())
+
+    bad = writer.take_set_aside()   # bars of symbols that kept failing
+"""
+
+import asyncio
+import datetime
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from quant_toolkit.sqlite_data_manager import (
+    DATETIME_FORMAT,
+    REQUIRED_COLUMNS,
+    InvalidDataError,
+    ValidationRules,
+)
+
+if TYPE_CHECKING:
+    from quant_toolkit.sqlite_data_manager import DataHandler
+
+logger = logging.getLogger(__name__)
+
+# Queue item asking the flusher to commit now and set the event
+_FLUSH = object()
+# Queue item asking the flusher to commit and exit
+_STOP = object()
+# Longest wait, in seconds, between retries of a failing flush
+MAX_RETRY_DELAY = 30.0
+
+
+@dataclass
+class WriterMetrics:
+    """
+    Snapshot of a LiveBarWriter's counters.
+
+    Attributes:
+        submitted: Bars accepted by submit()/asubmit()
+        rejected: Bars rejected by validation (on_invalid="drop")
+        coalesced: Bars replaced by a later bar for the same symbol and datetime
+        committed: Rows written by successful flushes
+        flushes: Successful flushes (one transaction each)
+        failed_flushes: Flushes that rolled back; their rows are retried
+            with exponential backoff
+        last_error: Error of the last failed flush, cleared by a commit
+        set_aside: Bars of symbols set aside after repeated failures,
+            until take_set_aside()
+        set_aside_symbols: Symbols set aside, with the error that did it
+        queue_depth: Bars waiting in the queue
+        queue_capacity: Queue bound at which submitters block
+        pending: Bars accepted but not yet committed (lost on a crash)
+        last_commit_at: When the last flush committed
+        last_flush_ms: Duration of the last flush transaction
+        latency_p50_ms: Median submit-to-commit latency of recent bars
+        latency_p95_ms: 95th percentile submit-to-commit latency
+        latency_p99_ms: 99th percentile submit-to-commit latency
+        latency_max_ms: Worst submit-to-commit latency of recent bars
+    """
+
+    submitted: int = 0
+    rejected: int = 0
+    coalesced: int = 0
+    committed: int = 0
+    flushes: int = 0
+    failed_flushes: int = 0
+    queue_depth: int = 0
+    queue_capacity: int = 0
+    pending: int = 0
+    last_commit_at: Optional[datetime.datetime] = None
+    last_flush_ms: float = 0.0
+    last_error: Optional[str] = None
+    set_aside: int = 0
+    set_aside_symbols: Dict[str, str] = field(default_factory=dict)
+    latency_p50_ms: float = 0.0
+    latency_p95_ms: float = 0.0
+    latency_p99_ms: float = 0.0
+    latency_max_ms: float = 0.0
+
+
+def _format_datetime(value) -> str:
+    """Render a bar's datetime as the "YYYY-MM-DD HH:MM:SS" storage key."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, np.datetime64):
+        value = value.astype("datetime64[s]").item()
+    if isinstance(value, datetime.datetime):
+        # Aware timestamps are stored as wall-clock time, like inject_data
+        return value.replace(tzinfo=None).strftime(DATETIME_FORMAT)
+    if isinstance(value, datetime.date):
+        return value.strftime(DATETIME_FORMAT)
+    raise TypeError(f"Unsupported datetime value: {value!r}")
+
+
+def _sql_type(value) -> str:
+    """Map a Python bar value to the SQLite column type pandas.to_sql would use."""
+    if isinstance(value, (bool, int, np.integer)):
+        return "INTEGER"
+    if isinstance(value, (float, np.floating)):
+        return "REAL"
+    return "TEXT"
+
+
+class LiveBarWriter:
+    """
+    Background writer that group-commits live bars from many producers.
+
+    Producers call submit() (threads) or asubmit() (asyncio). When the
+    bounded queue is full they block, or wait asynchronously, until the
+    flusher catches up, so a slow disk throttles the feed instead of growing
+    memory. The flusher thread drains the queue, keeps the last bar per
+    (symbol, datetime), and writes all symbols in one transaction every
+    ``flush_interval_ms`` or as soon as ``max_batch_rows`` bars are buffered.
+
+    A failed flush is rolled back and retried symbol by symbol, each in its
+    own transaction, so the symbols that can be written are committed. Rows
+    that still fail stay buffered and are retried, the wait doubling from
+    the flush interval up to MAX_RETRY_DELAY while failures last. A symbol
+    that fails ``max_symbol_failures`` times while other symbols commit is
+    set aside: its bars leave the buffer, are listed in metrics() and can
+    be taken back with take_set_aside(). When every write fails (a locked
+    or full disk) nothing is set aside. Rows are durable only once
+    committed; ``pending`` in metrics() counts what a crash would lose,
+    flush() reports whether it was committed and stop() raises if rows are
+    left uncommitted.
+
+    Attributes:
+        handler: DataHandler written to
+        flush_interval_ms: Maximum time a bar waits before being committed
+        max_batch_rows: Buffered bars that trigger an early flush
+        rules: ValidationRules checked on submit (OHLC/volume checks only;
+            coalescing always keeps the last bar per datetime)
+        max_symbol_failures: Failed writes after which a symbol is set aside
+    """
+
+    def __init__(
+        self,
+        handler: "DataHandler",
+        flush_interval_ms: float = 250.0,
+        max_batch_rows: int = 10_000,
+        max_queue: int = 100_000,
+        rules: Optional[ValidationRules] = None,
+        latency_window: int = 10_000,
+        max_symbol_failures: int = 3,
+    ):
+        """
+        Initialize the writer (call start() to begin flushing).
+
+        Args:
+            handler: DataHandler to write to
+            flush_interval_ms: Flush at least this often (default: 250.0)
+            max_batch_rows: Flush early once this many bars are buffered
+                (default: 10,000)
+            max_queue: Queue bound; producers block beyond it
+                (default: 100,000)
+            rules: Validation applied to each bar on submit (defaults to
+                the handler's validation_rules)
+            latency_window: Number of recent bars used for latency
+                percentiles (default: 10,000)
+            max_symbol_failures: Times a symbol's own write may fail, while
+                other symbols commit, before it is set aside (default: 3)
+        """
+        if flush_interval_ms <= 0:
+            raise ValueError("flush_interval_ms must be positive")
+        if max_batch_rows <= 0:
+            raise ValueError("max_batch_rows must be positive")
+        if max_queue <= 0:
+            raise ValueError("max_queue must be positive")
+        if max_symbol_failures <= 0:
+            raise ValueError("max_symbol_failures must be positive")
+
+        self.handler = handler
+        self.flush_interval_ms = flush_interval_ms
+        self.max_batch_rows = max_batch_rows
+        self.rules = rules or handler.validation_rules
+        self.max_symbol_failures = max_symbol_failures
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        # Coalesced rows waiting for a commit: symbol -> datetime -> (bar, t0)
+        self._buffer: Dict[str, Dict[str, Tuple[Mapping, float]]] = {}
+        self._buffered = 0
+        # Symbols whose table this writer has already created
+        self._tables: set = set()
+        # Failed writes per symbol while other symbols committed
+        self._symbol_failures: Dict[str, int] = {}
+        # Bars of symbols that kept failing: symbol -> datetime -> (bar, t0)
+        self._set_aside: Dict[str, Dict[str, Tuple[Mapping, float]]] = {}
+        # Set-aside bars handed back by take_set_aside()
+        self._released = 0
+
+        self._metrics = WriterMetrics(queue_capacity=max_queue)
+        self._latencies: deque = deque(maxlen=latency_window)
+
+    @property
+    def running(self) -> bool:
+        """Whether the flusher thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "LiveBarWriter":
+        """Start the flusher thread."""
+        if self.running:
+            return self
+        self._thread = threading.Thread(
+            target=self._run, name="quant-toolkit-live-writer", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Live writer started for {self.handler.db_path} "
+            f"(interval={self.flush_interval_ms}ms, batch={self.max_batch_rows})"
+        )
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Commit everything submitted so far and stop the flusher thread.
+
+        Args:
+            timeout: Seconds to wait for the final flush
+
+        Raises:
+            RuntimeError: If the final flush failed (the rows stay buffered
+                and start() retries them), or symbols were set aside
+        """
+        if not self.running:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(
+                f"Live writer for {self.handler.db_path} "
+                f"still flushing after {timeout}s"
+            )
+            return
+        logger.info(
+            f"Live writer stopped for {self.handler.db_path} "
+            f"({self._metrics.committed} rows in {self._metrics.flushes} flushes)"
+        )
+        if self._buffered:
+            raise RuntimeError(
+                f"Live writer stopped with {self._buffered} rows not committed: "
+                f"{self._metrics.last_error}"
+            )
+        if self._set_aside:
+            raise RuntimeError(
+                f"Live writer stopped with bars of {sorted(self._set_aside)} set "
+                "aside, see take_set_aside()"
+            )
+
+    def _prepare(self, symbol: str, bar: Mapping) -> Optional[tuple]:
+        """
+        Validate a bar and build its queue item.
+
+        Returns:
+            (symbol, datetime key, bar, submit time), or None if the bar was
+            rejected by the validation rules
+        """
+        if not symbol:
+            raise ValueError("Symbol cannot be empty")
+        missing_columns = set(REQUIRED_COLUMNS) - set(bar)
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        rules = self.rules
+        invalid = False
+        if rules.check_ohlc:
+            high, low = bar["high"], bar["low"]
+            invalid = (
+                high < low
+                or high < bar["open"]
+                or high < bar["close"]
+                or low > bar["open"]
+                or low > bar["close"]
+            )
+        if rules.check_volume and bar["volume"] < 0:
+            invalid = True
+        if invalid:
+            if rules.on_invalid == "raise":
+                raise InvalidDataError(f"Invalid OHLC bar for {symbol}: {dict(bar)}")
+            logger.warning(f"Invalid OHLC bar for {symbol}: {dict(bar)}")
+            if rules.on_invalid == "drop":
+                with self._lock:
+                    self._metrics.rejected += 1
+                return None
+
+        key = _format_datetime(bar["datetime"])
+        return (symbol, key, bar, time.monotonic())
+
+    def _accepted(self):
+        with self._lock:
+            self._metrics.submitted += 1
+
+    def submit(
+        self, symbol: str, bar: Mapping, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Queue one bar for writing, blocking while the queue is full.
+
+        Args:
+            symbol: Security symbol
+            bar: Mapping with datetime, open, high, low, close, volume and
+                optionally oi or other columns
+            timeout: Seconds to wait for queue space (default: forever)
+
+        Returns:
+            True if queued, False if rejected by validation
+
+        Raises:
+            ValueError: If the bar misses columns
+            InvalidDataError: If the bar fails validation with
+                on_invalid="raise"
+            queue.Full: If no queue space freed up within timeout
+        """
+        item = self._prepare(symbol, bar)
+        if item is None:
+            return False
+        self._queue.put(item, timeout=timeout)
+        self._accepted()
+        return True
+
+    def submit_many(
+        self, symbol: str, bars: Iterable[Mapping], timeout: Optional[float] = None
+    ) -> int:
+        """
+        Queue several bars for one symbol.
+
+        Args:
+            symbol: Security symbol
+            bars: Iterable of bar mappings
+            timeout: Seconds to wait for queue space per bar
+
+        Returns:
+            Number of bars queued
+        """
+        return sum(self.submit(symbol, bar, timeout) for bar in bars)
+
+    async def asubmit(
+        self, symbol: str, bar: Mapping, timeout: Optional[float] = None
+    ) -> bool:
+        """
+        Queue one bar from asyncio code without blocking the event loop.
+
+        While the queue is full the coroutine sleeps and retries, yielding to
+        other tasks.
+
+        Args:
+            symbol: Security symbol
+            bar: Bar mapping, as for submit()
+            timeout: Seconds to wait for queue space (default: forever)
+
+        Returns:
+            True if queued, False if rejected by validation
+
+        Raises:
+            ValueError: If the bar misses columns
+            InvalidDataError: If the bar fails validation with
+                on_invalid="raise"
+            queue.Full: If no queue space freed up within timeout
+        """
+        item = self._prepare(symbol, bar)
+        if item is None:
+            return False
+        deadline = None if timeout is None else time.monotonic() + timeout
+        poll = min(self.flush_interval_ms / 4000, 0.01)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                break
+            except queue.Full:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+                await asyncio.sleep(poll)
+        self._accepted()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every bar submitted before this call is committed.
+
+        Args:
+            timeout: Seconds to wait (default: forever)
+
+        Returns:
+            True if the bars were committed within timeout, False if the
+            flush failed (see metrics().last_error), set symbols aside or
+            timed out
+        """
+        if not self.running:
+            raise RuntimeError("Live writer is not running, call start() first")
+        done: Future = Future()
+        self._queue.put((_FLUSH, done), timeout=timeout)
+        try:
+            return done.result(timeout)
+        except FutureTimeoutError:
+            return False
+
+    def metrics(self) -> WriterMetrics:
+        """
+        Snapshot of the writer's counters and recent latency percentiles.
+
+        Returns:
+            WriterMetrics
+        """
+        with self._lock:
+            snapshot = WriterMetrics(**vars(self._metrics))
+            snapshot.set_aside_symbols = dict(snapshot.set_aside_symbols)
+            latencies = np.fromiter(self._latencies, dtype=float)
+        snapshot.queue_depth = self._queue.qsize()
+        snapshot.pending = (
+            snapshot.submitted
+            - snapshot.committed
+            - snapshot.coalesced
+            - self._released
+        )
+        if latencies.size:
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            snapshot.latency_p50_ms = float(p50)
+            snapshot.latency_p95_ms = float(p95)
+            snapshot.latency_p99_ms = float(p99)
+            snapshot.latency_max_ms = float(latencies.max())
+        return snapshot
+
+    def take_set_aside(self) -> Dict[str, List[Mapping]]:
+        """
+        Take the bars of symbols set aside after repeated write failures.
+
+        They are removed from the writer and from metrics(); fix them (or
+        the table) and submit them again.
+
+        Returns:
+            Dict of symbol to its bars in datetime order
+        """
+        with self._lock:
+            set_aside, self._set_aside = self._set_aside, {}
+            self._released += self._metrics.set_aside
+            self._metrics.set_aside = 0
+            self._metrics.set_aside_symbols = {}
+        return {
+            symbol: [rows[key][0] for key in sorted(rows)]
+            for symbol, rows in set_aside.items()
+        }
+
+    def _add(self, item: tuple):
+        """Coalesce one queued bar into the buffer."""
+        symbol, key, bar, submitted_at = item
+        rows = self._buffer.setdefault(symbol, {})
+        previous = rows.get(key)
+        if previous is None:
+            self._buffered += 1
+        else:
+            with self._lock:
+                self._metrics.coalesced += 1
+            # Latency counts from the first submission of this datetime
+            submitted_at = previous[1]
+        rows[key] = (bar, submitted_at)
+
+    def _run(self):
+        """Flusher loop: drain the queue, then group-commit the buffer."""
+        interval = self.flush_interval_ms / 1000
+        delay = interval
+        while True:
+            deadline = time.monotonic() + delay
+            waiters: List[Future] = []
+            stopping = False
+            # After a failed flush, wait out the backoff even with a full
+            # buffer (flush() and stop() still cut it short)
+            while self._buffered < self.max_batch_rows or delay > interval:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                if item[0] is _FLUSH:
+                    waiters.append(item[1])
+                    break
+                self._add(item)
+
+            committed = self._write() if self._buffer else True
+            # Waiters learn the outcome; failed rows stay buffered for a retry
+            for done in waiters:
+                done.set_result(committed)
+            if stopping:
+                return
+            # Back off only while rows wait for a retry
+            delay = interval if not self._buffer else min(delay * 2, MAX_RETRY_DELAY)
+
+    def _write(self) -> bool:
+        """
+        Write all buffered symbols in one transaction, or one by one if it fails.
+
+        Returns:
+            True if every buffered row was committed; rows that failed stay
+            buffered, or are set aside
+        """
+        start = time.perf_counter()
+        symbols = list(self._buffer)
+        try:
+            with self.handler.transaction() as conn:
+                for symbol in symbols:
+                    self._write_symbol(conn, symbol)
+        except Exception as e:
+            # Tables may have been dropped underneath us; re-check next time
+            self._tables.clear()
+            with self._lock:
+                self._metrics.failed_flushes += 1
+                self._metrics.last_error = f"{type(e).__name__}: {e}"
+            logger.error(
+                f"Live writer flush of {self._buffered} rows failed, "
+                f"retrying per symbol: {e}"
+            )
+            if len(symbols) == 1:
+                return False
+            return self._write_each(symbols)
+
+        self._committed(symbols, (time.perf_counter() - start) * 1000)
+        return True
+
+    def _write_each(self, symbols: List[str]) -> bool:
+        """
+        Write each symbol in a transaction of its own after a failed flush.
+
+        Returns:
+            True if every symbol was committed
+        """
+        committed: List[str] = []
+        failed: Dict[str, Exception] = {}
+        for symbol in symbols:
+            start = time.perf_counter()
+            try:
+                with self.handler.transaction() as conn:
+                    self._write_symbol(conn, symbol)
+            except Exception as e:
+                self._tables.discard(symbol)
+                failed[symbol] = e
+                continue
+            self._committed([symbol], (time.perf_counter() - start) * 1000)
+            committed.append(symbol)
+
+        # Only failures next to successful writes single a symbol out
+        if committed:
+            for symbol, error in failed.items():
+                failures = self._symbol_failures.get(symbol, 0) + 1
+                self._symbol_failures[symbol] = failures
+                if failures >= self.max_symbol_failures:
+                    self._set_symbol_aside(symbol, error)
+        if failed:
+            logger.error(
+                f"Live writer could not write {sorted(failed)}, "
+                f"committed {len(committed)} other symbols"
+            )
+        return not failed
+
+    def _write_symbol(self, conn, symbol: str):
+        """Insert the buffered rows of one symbol on conn."""
+        rows = self._buffer[symbol]
+        keys = sorted(rows)
+        first = rows[keys[0]][0]
+        columns = list(REQUIRED_COLUMNS) + [
+            name for name in first if name not in REQUIRED_COLUMNS
+        ]
+        if symbol not in self._tables:
+            column_types = {
+                name: "TEXT" if name == "datetime" else _sql_type(first[name])
+                for name in columns
+            }
+            self.handler._create_table(conn, symbol, column_types)
+            self._tables.add(symbol)
+        self.handler._insert_rows(
+            conn,
+            symbol,
+            columns,
+            (
+                (key,) + tuple(rows[key][0].get(name) for name in columns[1:])
+                for key in keys
+            ),
+        )
+
+    def _committed(self, symbols: List[str], elapsed_ms: float):
+        """Record committed symbols and drop their rows from the buffer."""
+        committed_at = time.monotonic()
+        rows = sum(len(self._buffer[symbol]) for symbol in symbols)
+        with self._lock:
+            metrics = self._metrics
+            metrics.committed += rows
+            metrics.flushes += 1
+            metrics.last_commit_at = datetime.datetime.now()
+            metrics.last_flush_ms = elapsed_ms
+            for symbol in symbols:
+                self._latencies.extend(
+                    (committed_at - submitted_at) * 1000
+                    for _, submitted_at in self._buffer[symbol].values()
+                )
+        for symbol in symbols:
+            del self._buffer[symbol]
+            self._symbol_failures.pop(symbol, None)
+        self._buffered -= rows
+        if not self._buffer:
+            with self._lock:
+                metrics.last_error = None
+        logger.debug(
+            f"Live writer committed {rows} rows for {len(symbols)} symbols "
+            f"in {elapsed_ms:.1f}ms"
+        )
+
+    def _set_symbol_aside(self, symbol: str, error: Exception):
+        """Move a failing symbol's rows out of the buffer (see take_set_aside())."""
+        rows = self._buffer.pop(symbol)
+        self._buffered -= len(rows)
+        self._symbol_failures.pop(symbol, None)
+        with self._lock:
+            held = self._set_aside.setdefault(symbol, {})
+            # A datetime set aside twice is one bar, the later one
+            replaced = len(held.keys() & rows.keys())
+            held.update(rows)
+            self._metrics.coalesced += replaced
+            self._metrics.set_aside += len(rows) - replaced
+            self._metrics.set_aside_symbols[symbol] = f"{type(error).__name__}: {error}"
+        logger.error(
+            f"Live writer set aside {len(rows)} bars of {symbol} after "
+            f"{self.max_symbol_failures} failed writes: {error}"
+        )
+
+    def __enter__(self) -> "LiveBarWriter":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.stop()
+            return
+        # Don't mask the exception leaving the block
+        try:
+            self.stop()
+        except RuntimeError as e:
+            logger.error(str(e))
@@ -22,7 +22,6 @@ Contract Formats:
 
 import datetime
 import calendar
-import pandas as pd
 from enum import Enum, auto
 from typing import Optional, Literal, Tuple  # noqa: F401
 from pathlib import Path
@@ -30,6 +29,10 @@ import os
 from functools import lru_cache
 from dataclasses import dataclass
 
+from quant_toolkit._lazy import LazyModule
+
+pd = LazyModule("pandas")
+
 
 class Exchange(Enum):
     """Supported exchanges for derivatives trading in India.
@@ -555,26 +558,14 @@ class MarketCalendar:
             ... )
             datetime.date(2024, 6, 27)  # Last Thursday of June
         """
-        target_weekday = self.get_expiry_day_of_week(exchange)
-
-        # Get last occurrence in current month
-        last_day = self.find_last_weekday_of_month(
-            today.year, today.month, target_weekday
-        )
+        expiry = self.monthly_expiry(today.year, today.month, exchange)
 
         # If it has passed, get next month's expiry
-        if last_day < today:
-            if today.month == 12:
-                last_day = self.find_last_weekday_of_month(
-                    today.year + 1, 1, target_weekday
-                )
-            else:
-                last_day = self.find_last_weekday_of_month(
-                    today.year, today.month + 1, target_weekday
-                )
-
-        # Adjust for holidays
-        return self.adjust_for_holiday(last_day)
+        if expiry < today:
+            expiry = self.monthly_expiry(
+                *self._following_month(today.year, today.month), exchange
+            )
+        return expiry
 
     def find_next_month_expiry(
         self, today: datetime.date, exchange: Exchange
@@ -601,23 +592,72 @@ class MarketCalendar:
             datetime.date(2024, 7, 25)  # Last Thursday of July
         """
         current_expiry = self.find_current_month_expiry(today, exchange)
+        return self.monthly_expiry(
+            *self._following_month(current_expiry.year, current_expiry.month),
+            exchange,
+        )
 
-        # Get the month after current expiry
-        if current_expiry.month == 12:
-            next_year = current_expiry.year + 1
-            next_month = 1
-        else:
-            next_year = current_expiry.year
-            next_month = current_expiry.month + 1
+    @staticmethod
+    def _following_month(year: int, month: int) -> tuple[int, int]:
+        """Return the (year, month) after the given month, rolling over December."""
+        return (year + 1, 1) if month == 12 else (year, month + 1)
 
-        target_weekday = self.get_expiry_day_of_week(exchange)
+    @lru_cache(maxsize=512)
+    def monthly_expiry(
+        self, year: int, month: int, exchange: Exchange
+    ) -> datetime.date:
+        """Get the holiday-adjusted monthly expiry of a given month.
+
+        Args:
+            year: Expiry year
+            month: Expiry month (1-12)
+            exchange: Exchange (NSE or BSE) to determine expiry day
+
+        Returns:
+            datetime.date: Monthly expiry date (holiday-adjusted)
+
+        Example:
+            >>> calendar = MarketCalendar()
+            >>> calendar.monthly_expiry(2024, 12, Exchange.NSE)
+            datetime.date(2024, 12, 26)
+        """
         last_day = self.find_last_weekday_of_month(
-            next_year, next_month, target_weekday
+            year, month, self.get_expiry_day_of_week(exchange)
         )
-
-        # Adjust for holidays
         return self.adjust_for_holiday(last_day)
 
+    def monthly_expiries(
+        self, start: datetime.date, end: datetime.date, exchange: Exchange
+    ) -> list[datetime.date]:
+        """Get every monthly expiry from the month of start to the month of end.
+
+        Expiries are cached per month, so repeated calendar lookups (e.g.
+        when stitching continuous futures) only compute each month once.
+
+        Args:
+            start: First month to include
+            end: Last month to include
+            exchange: Exchange (NSE or BSE) to determine expiry day
+
+        Returns:
+            list[datetime.date]: Holiday-adjusted monthly expiries, ascending
+
+        Example:
+            >>> calendar = MarketCalendar()
+            >>> calendar.monthly_expiries(
+            ...     datetime.date(2024, 11, 1),
+            ...     datetime.date(2024, 12, 31),
+            ...     Exchange.NSE,
+            ... )
+            [datetime.date(2024, 11, 28), datetime.date(2024, 12, 26)]
+        """
+        expiries = []
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            expiries.append(self.monthly_expiry(year, month, exchange))
+            year, month = self._following_month(year, month)
+        return expiries
+
 
 class ContractGenerator:
     """Advanced contract ticker generator for Indian derivatives markets.
@@ -1352,6 +1392,30 @@ class MarketContracts:
                 "Use 'current_week', 'next_week', 'current_month', or 'next_month'"
             )
 
+    def monthly_expiries(
+        self, exchange: str, start: datetime.date, end: datetime.date
+    ) -> list[datetime.date]:
+        """
+        Get the monthly (futures) expiry calendar between two dates.
+
+        Args:
+            exchange: "NSE" or "BSE"
+            start: First month to include
+            end: Last month to include
+
+        Returns:
+            Holiday-adjusted monthly expiries, ascending
+
+        Example:
+            >>> mc.monthly_expiries(
+            ...     "NSE", datetime.date(2024, 1, 1), datetime.date(2024, 3, 31)
+            ... )
+            [datetime.date(2024, 1, 25),
+             datetime.date(2024, 2, 29),
+             datetime.date(2024, 3, 28)]
+        """
+        return self._calendar.monthly_expiries(start, end, Exchange[exchange.upper()])
+
     # ============= Configuration Methods =============
 
     def get_strike_multiple(self, symbol: str) -> int:
@@ -0,0 +1,656 @@
+"""
+Chain-oriented storage for option bars.
+
+Storing every option contract in its own table (the layout DataHandler uses
+for stocks, indices and futures) means thousands of tables per underlying,
+and every _symbol_exists()/get_available_securities() lookup scans
+sqlite_master. OptionChainStore keeps all contracts of all underlyings in one
+WITHOUT ROWID table keyed by (underlying, expiry, datetime, strike,
+option_type), so the rows of one chain at one bar are contiguous on disk:
+
+- A full chain snapshot for an expiry at time T is one primary-key seek
+  followed by a contiguous range read.
+- "Strikes within ±N multiples of ATM at T" narrows that range on strike.
+- A secondary index on (underlying, expiry, strike, option_type, datetime)
+  serves single-contract history.
+
+A small option_contracts table catalogues every contract with its ticker,
+so strike and expiry lists never touch the bar data.
+
+Classes:
+    OptionChainStore: Ingest and query option chains in a dedicated database
+
+Usage:
+    from quant_toolkit.option_chain import OptionChainStore
+
+    store = OptionChainStore(data_dir / "options" / "options_data.db")
+
+    # One contract's bars, identified by ticker or ContractDetails
+    store.inject_contract("NSE:NIFTY24DEC25000CE", df)
+
+    # A whole chain: long frame with strike, option_type and OHLCV columns
+    store.inject_chain("NIFTY", "2024-12-26", chain_df)
+
+    # Queries
+    snapshot = store.chain_snapshot("NIFTY", "2024-12-26", "2024-12-20 10:15")
+    near_atm = store.atm_strikes("NIFTY", "2024-12-26", "2024-12-20 10:15", n=5)
+"""
+
+import datetime
+import logging
+import re
+import sqlite3
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from quant_toolkit.market_contracts import (
+    ContractDetails,
+    ContractType,
+    Exchange,
+    ExpiryType,
+    MarketConfig,
+    OptionType,
+)
+from quant_toolkit.sqlite_data_manager import (
+    DATETIME_FORMAT,
+    REQUIRED_COLUMNS,
+    DataHandler,
+    _report_invalid,
+)
+
+logger = logging.getLogger(__name__)
+
+BARS_TABLE = "option_bars"
+CONTRACTS_TABLE = "option_contracts"
+
+BAR_COLUMNS = (
+    "underlying",
+    "expiry",
+    "strike",
+    "option_type",
+    "datetime",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "oi",
+)
+
+SCHEMA = (
+    f"""
+    CREATE TABLE IF NOT EXISTS {BARS_TABLE} (
+        underlying TEXT NOT NULL,
+        expiry TEXT NOT NULL,
+        strike INTEGER NOT NULL,
+        option_type TEXT NOT NULL,
+        datetime TEXT NOT NULL,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume INTEGER,
+        oi INTEGER,
+        PRIMARY KEY (underlying, expiry, datetime, strike, option_type)
+    ) WITHOUT ROWID
+    """,
+    f"""
+    CREATE INDEX IF NOT EXISTS idx_{BARS_TABLE}_contract
+    ON {BARS_TABLE} (underlying, expiry, strike, option_type, datetime)
+    """,
+    f"""
+    CREATE TABLE IF NOT EXISTS {CONTRACTS_TABLE} (
+        underlying TEXT NOT NULL,
+        expiry TEXT NOT NULL,
+        strike INTEGER NOT NULL,
+        option_type TEXT NOT NULL,
+        exchange TEXT NOT NULL,
+        expiry_type TEXT NOT NULL,
+        ticker TEXT NOT NULL UNIQUE,
+        PRIMARY KEY (underlying, expiry, strike, option_type)
+    ) WITHOUT ROWID
+    """,
+)
+
+# {Ex}:{Symbol}{YY}{MMM}{Strike}{Type} or {Ex}:{Symbol}{YY}{M}{DD}{Strike}{Type}
+_TICKER_PATTERN = re.compile(
+    r"^(?P<exchange>NSE|BSE):(?P<symbol>[A-Z&-]+?)(?P<year>\d{2})"
+    r"(?:(?P<month>JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)"
+    r"|(?P<week_month>[1-9OND])(?P<day>\d{2}))"
+    r"(?P<strike>\d+)(?P<type>CE|PE)$"
+)
+_WEEKLY_MONTHS = {code: month for month, code in MarketConfig.WEEKLY_MONTH_MAP.items()}
+
+
+def _date_text(value: Union[str, datetime.date]) -> str:
+    """Render an expiry as "YYYY-MM-DD"."""
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value[:10]).isoformat()
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return value.isoformat()
+
+
+def _datetime_text(value: Union[str, datetime.datetime, pd.Timestamp]) -> str:
+    """Render a point in time as "YYYY-MM-DD HH:MM:SS"."""
+    return pd.Timestamp(value).strftime(DATETIME_FORMAT)
+
+
+class OptionChainStore:
+    """
+    Option bars for many underlyings and expiries in one indexed table.
+
+    Attributes:
+        db_path: Path of the options database
+        handler: DataHandler providing the connection pool and transactions
+        market_contracts: MarketContracts used for expiries and strike multiples
+    """
+
+    def __init__(self, db_path: Union[str, Path], **handler_kwargs):
+        """
+        Open (and create if needed) an option chain database.
+
+        Args:
+            db_path: Path to the options SQLite database
+            **handler_kwargs: Passed to DataHandler (e.g. profile=True)
+        """
+        self.handler = DataHandler(db_path, **handler_kwargs)
+        self.db_path = self.handler.db_path
+        self.market_contracts = self.handler.market_contracts
+
+        with self.handler.transaction() as conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    # ============= Contracts =============
+
+    def parse_ticker(self, ticker: str) -> ContractDetails:
+        """
+        Turn an option ticker back into ContractDetails.
+
+        Monthly tickers name the month only, so their expiry comes from the
+        monthly expiry calendar.
+
+        Args:
+            ticker: e.g. "NSE:NIFTY24DEC25000CE" or "NSE:NIFTY24D1925000CE"
+
+        Returns:
+            ContractDetails of the option
+
+        Raises:
+            ValueError: If the ticker is not an option ticker
+        """
+        match = _TICKER_PATTERN.match(ticker)
+        if not match:
+            raise ValueError(f"Not an option ticker: {ticker}")
+
+        exchange = Exchange[match["exchange"]]
+        year = 2000 + int(match["year"])
+        if match["month"]:
+            month = datetime.datetime.strptime(match["month"], "%b").month
+            first_day = datetime.date(year, month, 1)
+            expiry = self.market_contracts.monthly_expiries(
+                exchange.value, first_day, first_day
+            )[0]
+            expiry_type = ExpiryType.MONTHLY
+        else:
+            month = int(_WEEKLY_MONTHS[match["week_month"]])
+            expiry = datetime.date(year, month, int(match["day"]))
+            expiry_type = ExpiryType.WEEKLY
+
+        return ContractDetails(
+            exchange=exchange,
+            symbol=match["symbol"],
+            expiry_date=expiry,
+            contract_type=ContractType.OPT,
+            expiry_type=expiry_type,
+            strike=int(match["strike"]),
+            option_type=OptionType[match["type"]],
+        )
+
+    def _expiry_type(self, expiry: datetime.date, exchange: str) -> str:
+        """MONTHLY if expiry is the monthly expiry of its month, else WEEKLY."""
+        month = expiry.replace(day=1)
+        monthly = self.market_contracts.monthly_expiries(exchange, month, month)
+        return ExpiryType.MONTHLY.name if expiry in monthly else ExpiryType.WEEKLY.name
+
+    def _register_contracts(self, conn: sqlite3.Connection, contracts: List[tuple]):
+        """Add (underlying, expiry, strike, type, exchange, expiry_type) rows."""
+        rows = []
+        for underlying, expiry, strike, option_type, exchange, expiry_type in contracts:
+            details = ContractDetails(
+                exchange=Exchange[exchange],
+                symbol=underlying,
+                expiry_date=datetime.date.fromisoformat(expiry),
+                contract_type=ContractType.OPT,
+                expiry_type=ExpiryType[expiry_type],
+                strike=int(strike),
+                option_type=OptionType[option_type],
+            )
+            ticker = self.market_contracts.generate_ticker_from_details(details)
+            rows.append(
+                (
+                    underlying,
+                    expiry,
+                    int(strike),
+                    option_type,
+                    exchange,
+                    expiry_type,
+                    ticker,
+                )
+            )
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {CONTRACTS_TABLE} "
+            "(underlying, expiry, strike, option_type, exchange, expiry_type, ticker) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    # ============= Ingest =============
+
+    def _prepare(self, data: pd.DataFrame, label: str) -> pd.DataFrame:
+        """Check columns and OHLC validity, format datetimes for storage."""
+        missing_columns = set(REQUIRED_COLUMNS) - set(data.columns)
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        rules = self.handler.validation_rules
+        if rules.check_ohlc:
+            high = data["high"].to_numpy()
+            low = data["low"].to_numpy()
+            open_, close = data["open"].to_numpy(), data["close"].to_numpy()
+            invalid = (high < low) | (high < open_) | (high < close)
+            invalid |= (low > open_) | (low > close)
+            invalid_count = int(invalid.sum())
+            _report_invalid(label, invalid_count, rules)
+            if invalid_count and rules.on_invalid == "drop":
+                data = data[~invalid]
+
+        # Second-resolution cast to string renders "YYYY-MM-DD HH:MM:SS"
+        datetimes = pa.array(pd.to_datetime(data["datetime"]).dt.tz_localize(None))
+        datetimes = datetimes.cast(pa.timestamp("s"), safe=False).cast(pa.string())
+        return data.assign(datetime=datetimes.to_numpy(zero_copy_only=False))
+
+    def _write(
+        self,
+        conn: sqlite3.Connection,
+        underlying: str,
+        expiry: str,
+        data: pd.DataFrame,
+    ) -> int:
+        """Upsert prepared chain rows for one underlying and expiry."""
+        n = len(data)
+        oi = data["oi"] if "oi" in data.columns else np.full(n, None)
+        columns = [
+            np.full(n, underlying, dtype=object),
+            np.full(n, expiry, dtype=object),
+            data["strike"].to_numpy(dtype=np.int64).tolist(),
+            data["option_type"].tolist(),
+            data["datetime"].tolist(),
+            data["open"].tolist(),
+            data["high"].tolist(),
+            data["low"].tolist(),
+            data["close"].tolist(),
+            data["volume"].tolist(),
+            list(oi),
+        ]
+        # Re-sent bars overwrite the stored ones instead of duplicating them
+        return self.handler._insert_rows(
+            conn, BARS_TABLE, list(BAR_COLUMNS), zip(*columns), or_replace=True
+        )
+
+    def inject_chain(
+        self,
+        underlying: str,
+        expiry: Union[str, datetime.date],
+        data: pd.DataFrame,
+        exchange: str = "NSE",
+        expiry_type: Optional[str] = None,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> int:
+        """
+        Store bars for many strikes of one expiry.
+
+        Args:
+            underlying: Underlying symbol (e.g. "NIFTY")
+            expiry: Expiry date
+            data: Long DataFrame with strike, option_type ("CE"/"PE"),
+                datetime, open, high, low, close, volume and optionally oi
+            exchange: "NSE" or "BSE" (default: "NSE")
+            expiry_type: "WEEKLY" or "MONTHLY", used for catalogue tickers
+                (default: MONTHLY if expiry is its month's monthly expiry,
+                otherwise WEEKLY)
+            conn: Optional connection for an enclosing transaction
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            ValueError: If columns are missing, a strike is not a whole
+                number or option types are invalid
+        """
+        missing_columns = {"strike", "option_type"} - set(data.columns)
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+        if data.empty:
+            logger.warning(f"Empty chain provided for {underlying}, skipping injection")
+            return 0
+
+        expiry = _date_text(expiry)
+        if expiry_type is None:
+            expiry_type = self._expiry_type(
+                datetime.date.fromisoformat(expiry), exchange
+            )
+        # Strikes are stored as integers; truncating 412.5 would merge it
+        # with a real 412 strike
+        strikes = pd.to_numeric(data["strike"])
+        fractional = strikes[strikes != np.floor(strikes)]
+        if not fractional.empty:
+            raise ValueError(
+                f"Strikes must be whole numbers: {sorted(set(fractional.tolist()))}"
+            )
+        data = data.assign(option_type=data["option_type"].str.upper())
+        bad_types = set(data["option_type"].unique()) - {"CE", "PE"}
+        if bad_types:
+            raise ValueError(f"Invalid option types: {bad_types}")
+        data = self._prepare(data, f"{underlying} {expiry}")
+
+        contracts = (
+            data[["strike", "option_type"]].drop_duplicates().itertuples(index=False)
+        )
+        contracts = [
+            (
+                underlying,
+                expiry,
+                strike,
+                option_type,
+                exchange.upper(),
+                expiry_type.upper(),
+            )
+            for strike, option_type in contracts
+        ]
+
+        def _inject(connection) -> int:
+            self._register_contracts(connection, contracts)
+            return self._write(connection, underlying, expiry, data)
+
+        if conn:
+            written = _inject(conn)
+        else:
+            with self.handler.transaction() as conn:
+                written = _inject(conn)
+        logger.info(f"Injected {written} option rows for {underlying} {expiry}")
+        return written
+
+    def inject_contract(
+        self,
+        contract: Union[str, ContractDetails],
+        data: pd.DataFrame,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> int:
+        """
+        Store bars of a single option contract.
+
+        Args:
+            contract: Option ticker or ContractDetails
+            data: DataFrame with datetime, open, high, low, close, volume
+                and optionally oi
+            conn: Optional connection for an enclosing transaction
+
+        Returns:
+            Number of rows written
+        """
+        details = self.parse_ticker(contract) if isinstance(contract, str) else contract
+        if details.contract_type != ContractType.OPT:
+            raise ValueError("Only option contracts can be stored in the chain store")
+
+        data = data.assign(strike=details.strike, option_type=details.option_type.value)
+        return self.inject_chain(
+            details.symbol,
+            details.expiry_date,
+            data,
+            exchange=details.exchange.value,
+            expiry_type=details.expiry_type.name,
+            conn=conn,
+        )
+
+    # ============= Queries =============
+
+    def _read(self, query: str, params: tuple) -> pd.DataFrame:
+        """Run a query on a pooled connection and parse the datetime column."""
+        with self.handler.read_connection() as conn:
+            df = pd.read_sql_query(query, conn, params=params)
+        if "datetime" in df.columns:
+            df["datetime"] = pd.to_datetime(df["datetime"], format=DATETIME_FORMAT)
+        return df
+
+    def underlyings(self) -> List[str]:
+        """Get the underlyings with stored contracts."""
+        with self.handler._db_cursor() as cursor:
+            cursor.execute(f"SELECT DISTINCT underlying FROM {CONTRACTS_TABLE}")
+            return [row[0] for row in cursor.fetchall()]
+
+    def expiries(self, underlying: str) -> List[datetime.date]:
+        """
+        Get the stored expiries of an underlying, ascending.
+
+        Args:
+            underlying: Underlying symbol
+
+        Returns:
+            List of expiry dates
+        """
+        with self.handler._db_cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT expiry FROM {CONTRACTS_TABLE} "
+                "WHERE underlying = ? ORDER BY expiry",
+                (underlying,),
+            )
+            return [datetime.date.fromisoformat(row[0]) for row in cursor.fetchall()]
+
+    def strikes(self, underlying: str, expiry: Union[str, datetime.date]) -> List[int]:
+        """
+        Get the stored strikes of an expiry, ascending.
+
+        Args:
+            underlying: Underlying symbol
+            expiry: Expiry date
+
+        Returns:
+            List of strikes
+        """
+        with self.handler._db_cursor() as cursor:
+            cursor.execute(
+                f"SELECT DISTINCT strike FROM {CONTRACTS_TABLE} "
+                "WHERE underlying = ? AND expiry = ? ORDER BY strike",
+                (underlying, _date_text(expiry)),
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def contracts(self, underlying: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get the contract catalogue with tickers.
+
+        Args:
+            underlying: Only this underlying (default: all)
+
+        Returns:
+            DataFrame with underlying, expiry, strike, option_type, exchange,
+            expiry_type and ticker columns
+        """
+        query = f"SELECT * FROM {CONTRACTS_TABLE}"
+        params: tuple = ()
+        if underlying:
+            query += " WHERE underlying = ?"
+            params = (underlying,)
+        return self._read(
+            query + " ORDER BY underlying, expiry, strike, option_type", params
+        )
+
+    def _snapshot_time(
+        self, conn: sqlite3.Connection, underlying: str, expiry: str, at: str
+    ) -> Optional[str]:
+        """Latest bar time at or before at for an expiry (primary-key seek)."""
+        row = conn.execute(
+            f"SELECT MAX(datetime) FROM {BARS_TABLE} "
+            "WHERE underlying = ? AND expiry = ? AND datetime <= ?",
+            (underlying, expiry, at),
+        ).fetchone()
+        return row[0] if row else None
+
+    def chain_snapshot(
+        self,
+        underlying: str,
+        expiry: Union[str, datetime.date],
+        at: Union[str, datetime.datetime],
+        min_strike: Optional[float] = None,
+        max_strike: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Get every stored strike of an expiry at the latest bar at or before at.
+
+        Args:
+            underlying: Underlying symbol
+            expiry: Expiry date
+            at: Point in time; the snapshot uses the last bar time <= at
+            min_strike: Lowest strike to include (default: no limit)
+            max_strike: Highest strike to include (default: no limit)
+
+        Returns:
+            Long DataFrame with strike, option_type, datetime, OHLCV and oi,
+            ordered by strike then option type (empty if no bar <= at)
+        """
+        expiry = _date_text(expiry)
+        query = (
+            "SELECT strike, option_type, datetime, open, high, low, close, volume, oi "
+            f"FROM {BARS_TABLE} WHERE underlying = ? AND expiry = ? AND datetime = ?"
+        )
+        with self.handler.read_connection() as conn:
+            bar_time = self._snapshot_time(conn, underlying, expiry, _datetime_text(at))
+            params = [underlying, expiry, bar_time]
+            if min_strike is not None:
+                query += " AND strike >= ?"
+                params.append(min_strike)
+            if max_strike is not None:
+                query += " AND strike <= ?"
+                params.append(max_strike)
+            df = pd.read_sql_query(
+                query + " ORDER BY strike, option_type", conn, params=params
+            )
+        df["datetime"] = pd.to_datetime(df["datetime"], format=DATETIME_FORMAT)
+        return df
+
+    def atm_strike(
+        self,
+        underlying: str,
+        expiry: Union[str, datetime.date],
+        at: Union[str, datetime.datetime],
+        spot: Optional[float] = None,
+    ) -> Optional[int]:
+        """
+        Get the at-the-money strike at a point in time.
+
+        With spot given, ATM is spot rounded to the strike multiple.
+        Otherwise it comes from put-call parity on the stored chain: at the
+        strike where |CE - PE| is smallest, the synthetic forward is
+        strike + CE - PE, rounded to the strike multiple.
+
+        Args:
+            underlying: Underlying symbol
+            expiry: Expiry date
+            at: Point in time
+            spot: Underlying price (default: use the synthetic forward)
+
+        Returns:
+            ATM strike, or None if the chain has no CE/PE pair at that time
+        """
+        multiple = self.market_contracts.get_strike_multiple(underlying)
+        if spot is None:
+            snapshot = self.chain_snapshot(underlying, expiry, at)
+            pairs = snapshot.pivot_table(
+                index="strike", columns="option_type", values="close"
+            ).dropna()
+            if pairs.empty or not {"CE", "PE"} <= set(pairs.columns):
+                return None
+            diff = pairs["CE"] - pairs["PE"]
+            closest = diff.abs().idxmin()
+            spot = closest + diff.loc[closest]
+        return int(round(spot / multiple) * multiple)
+
+    def atm_strikes(
+        self,
+        underlying: str,
+        expiry: Union[str, datetime.date],
+        at: Union[str, datetime.datetime],
+        n: int = 5,
+        spot: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Get all strikes within ±n strike multiples of ATM at a point in time.
+
+        Args:
+            underlying: Underlying symbol
+            expiry: Expiry date
+            at: Point in time; the last bar time <= at is used
+            n: Number of strike multiples on each side of ATM (default: 5)
+            spot: Underlying price for ATM (default: synthetic forward)
+
+        Returns:
+            Long DataFrame like chain_snapshot(), with the ATM strike in
+            df.attrs["atm"]
+
+        Example:
+            near = store.atm_strikes("NIFTY", "2024-12-26", "2024-12-20 10:15",
+                                     n=3, spot=24610.5)
+        """
+        atm = self.atm_strike(underlying, expiry, at, spot)
+        if atm is None:
+            return self.chain_snapshot(underlying, expiry, at).iloc[0:0]
+
+        width = n * self.market_contracts.get_strike_multiple(underlying)
+        df = self.chain_snapshot(
+            underlying, expiry, at, min_strike=atm - width, max_strike=atm + width
+        )
+        df.attrs["atm"] = atm
+        return df
+
+    def contract_history(
+        self,
+        underlying: str,
+        expiry: Union[str, datetime.date],
+        strike: int,
+        option_type: str,
+        start: Optional[Union[str, datetime.datetime]] = None,
+        end: Optional[Union[str, datetime.datetime]] = None,
+    ) -> pd.DataFrame:
+        """
+        Get the bars of one contract over time.
+
+        Args:
+            underlying: Underlying symbol
+            expiry: Expiry date
+            strike: Strike price
+            option_type: "CE" or "PE"
+            start: First bar time to include (default: all)
+            end: Last bar time to include (default: all)
+
+        Returns:
+            DataFrame with datetime, OHLCV and oi, ordered by datetime
+        """
+        query = (
+            "SELECT datetime, open, high, low, close, volume, oi "
+            f"FROM {BARS_TABLE} INDEXED BY idx_{BARS_TABLE}_contract "
+            "WHERE underlying = ? AND expiry = ? AND strike = ? AND option_type = ?"
+        )
+        params = [underlying, _date_text(expiry), int(strike), option_type.upper()]
+        if start is not None:
+            query += " AND datetime >= ?"
+            params.append(_datetime_text(start))
+        if end is not None:
+            query += " AND datetime <= ?"
+            params.append(_datetime_text(end))
+        return self._read(query + " ORDER BY datetime", tuple(params))
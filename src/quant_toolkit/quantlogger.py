@@ -1,27 +1,52 @@
 """
 QuantLogger: Comprehensive async-first logging decorator for quant_toolkit.
-Provides thread-safe, async-compatible logging with Pydantic validation.
+Provides thread-safe, async-compatible logging with validated configuration.
+
+Importing this module is cheap and has no filesystem side effects: asyncio,
+aiofiles and aiohttp are imported on first log write, and log directories
+are created when the first entry is written to them.
 """
 
-from pydantic.dataclasses import dataclass
-from pydantic import Field, validator
-import asyncio
-import aiofiles
-import aiohttp
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import inspect
 import json
 import os
+import sys
 import time
 import traceback
+import weakref
 from pathlib import Path
-from typing import Optional, Literal, Any, Callable, Dict, ClassVar, List
+from typing import (
+    Optional,
+    Literal,
+    Any,
+    Callable,
+    Dict,
+    ClassVar,
+    List,
+    Set,
+    Tuple,
+    Type,
+)
 from datetime import datetime
 from functools import wraps
 
+from quant_toolkit._lazy import LazyModule
+
+asyncio = LazyModule("asyncio")
+aiofiles = LazyModule("aiofiles")
+aiohttp = LazyModule("aiohttp")
+
+_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_SERVICES = frozenset({"discord", "slack", "twilio"})
+
 
 @dataclass
 class QuantLogger:
     """
-    Comprehensive async-first logging decorator with Pydantic validation.
+    Comprehensive async-first logging decorator with validated configuration.
 
     A powerful logging decorator that seamlessly handles both synchronous and
     asynchronous functions while providing thread-safe, high-performance logging
@@ -33,12 +58,14 @@ class QuantLogger:
         - **Thread-safe I/O**: Per-file asyncio.Lock prevents concurrent write conflicts
         - **Daily log rotation**: Automatic date-based file naming (module-YYYY-MM-DD.log)
         - **Background processing**: Non-blocking log writing via dedicated async task
-        - **Pydantic validation**: All configuration validated at instantiation time
+        - **Validated configuration**: Level and services checked at instantiation time
+        - **Cheap instantiation**: No I/O or asyncio work until the first log write
 
     Features:
         - **Configurable logging**: Control what gets logged (args, results, timing, exceptions)
         - **Multiple log levels**: DEBUG, INFO, WARNING, ERROR, CRITICAL with special error formatting
-        - **Exception handling**: Captures and logs exceptions without re-raising
+        - **Exception handling**: Captures and logs exceptions without re-raising,
+          except for the types listed in reraise
         - **Performance timing**: High-resolution execution timing with perf_counter
         - **Flexible output**: File logging with optional stdout duplication
         - **JSON export**: Convert human-readable logs to structured JSON format
@@ -56,6 +83,7 @@ class QuantLogger:
         log_time: Whether to measure and log execution duration
         to_stdout: Whether to duplicate log entries to console
         services: List of notification services ('discord', 'slack', 'twilio')
+        reraise: Exception types that are logged and then re-raised to the caller
 
     Usage Examples:
         # Basic usage with timing
@@ -82,6 +110,11 @@ class QuantLogger:
             # Errors sent to Discord and SMS via Twilio
             pass
 
+        # Errors the caller must see are logged, then propagate
+        @QuantLogger(log_time=True, reraise=(TimeoutError,))
+        def read_quotes(symbol: str) -> list:
+            ...
+
         # Global configuration
         QuantLogger.set_global_path(Path("/var/log/quant_toolkit"))
 
@@ -106,38 +139,34 @@ class QuantLogger:
 
     Error Handling:
         - Exceptions in decorated functions are caught and logged as ERROR level
+        - Exceptions listed in reraise are logged the same way, then re-raised
         - Logging failures are handled gracefully without breaking application flow
         - Background writer task continues processing even if individual writes fail
         - Sync functions work correctly even without active event loop
     """
 
-    # Instance configuration with Pydantic validation
-    name: Optional[str] = Field(
-        default=None, description="Logger name, defaults to module.function"
-    )
-    log_path: Optional[Path] = Field(
-        default=None, description="Directory for log files"
-    )
-    level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = Field(
-        default="INFO"
-    )
-    log_args: bool = Field(default=False, description="Log function arguments")
-    log_result: bool = Field(default=False, description="Log function return value")
-    log_time: bool = Field(
-        default=False, description="Log execution duration in milliseconds"
-    )
-    to_stdout: bool = Field(default=True, description="Also print to stdout")
-    services: List[str] = Field(
-        default_factory=list,
-        description="List of notification services: 'discord', 'slack', 'twilio'",
-    )
+    # Instance configuration, validated in __post_init__
+    name: Optional[str] = None  # Logger name, defaults to module.function
+    log_path: Optional[Path] = None  # Directory for log files
+    level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO"
+    log_args: bool = False  # Log function arguments
+    log_result: bool = False  # Log function return value
+    log_time: bool = False  # Log execution duration in milliseconds
+    to_stdout: bool = True  # Also print to stdout
+    # Notification services: 'discord', 'slack', 'twilio'
+    services: List[str] = field(default_factory=list)
+    # Exception types re-raised after logging instead of swallowed
+    reraise: Tuple[Type[BaseException], ...] = ()
 
     # Class-level shared resources (using ClassVar to exclude from dataclass fields)
     _global_log_path: ClassVar[Optional[Path]] = None
     _log_queue: ClassVar[Optional[asyncio.Queue]] = None
     _writer_task: ClassVar[Optional[asyncio.Task]] = None
-    _file_locks: ClassVar[Dict[Path, asyncio.Lock]] = {}
+    # Per-file locks of each event loop: asyncio locks belong to one loop,
+    # and sync callers in different threads each run their own
+    _file_locks: ClassVar[weakref.WeakKeyDictionary] = weakref.WeakKeyDictionary()
     _initialized: ClassVar[bool] = False
+    _created_dirs: ClassVar[Set[Path]] = set()
 
     # Notification configuration
     _discord_webhook_url: ClassVar[Optional[str]] = None
@@ -161,51 +190,27 @@ class QuantLogger:
         "DEBUG": 10,
     }
 
-    @validator("services")
-    def validate_services(cls, v):
-        """Validate service names."""
-        valid_services = {"discord", "slack", "twilio"}
-        invalid = set(v) - valid_services
-        if invalid:
-            raise ValueError(
-                f"Invalid services: {invalid}. Valid options: {valid_services}"
-            )
-        return v
-
-    @validator("log_path")
-    def validate_path(cls, v, values):
-        """Validate and create log path if needed.
-
-        Args:
-            v: The log_path value being validated.
-            values: Other field values from the dataclass.
-
-        Returns:
-            Path: The validated path object, or None if no path specified.
-
-        Note:
-            Creates the directory structure if it doesn't exist.
-            Falls back to global path if instance path is None.
-        """
-        # Use instance path, fall back to global path
-        path = v or cls._global_log_path
-        if path and not path.exists():
-            path.mkdir(parents=True, exist_ok=True)
-        return path
-
     def __post_init__(self):
-        """Initialize async components after dataclass initialization.
+        """Validate the configuration.
 
-        This method is called automatically by Pydantic after the dataclass
-        is created. It ensures that class-level async components are initialized
-        exactly once across all instances.
+        Construction is cheap and touches neither the filesystem nor asyncio,
+        since decorators are instantiated at import time. Shared async
+        components are initialized on the first log write instead.
 
-        Note:
-            This is part of the Pydantic dataclass lifecycle and handles the
-            async/sync dual nature initialization.
+        Raises:
+            ValueError: If level or services are invalid.
         """
-        if not self.__class__._initialized:
-            self.__class__._initialize_async_components()
+        if self.level not in _LEVELS:
+            raise ValueError(f"Invalid level: {self.level}. Valid options: {_LEVELS}")
+        invalid = set(self.services) - _SERVICES
+        if invalid:
+            raise ValueError(
+                f"Invalid services: {invalid}. Valid options: {set(_SERVICES)}"
+            )
+        self.services = list(self.services)
+        if self.log_path is not None:
+            self.log_path = Path(self.log_path)
+        self.reraise = tuple(self.reraise)
 
     @classmethod
     def load_notification_config(cls):
@@ -244,8 +249,6 @@ class QuantLogger:
         if os.getenv("THIRD_PARTY_LOG_ENABLED", "true").lower() == "true":
             third_party_path = os.getenv("THIRD_PARTY_LOG_PATH", "logs/third-party.log")
             cls._third_party_log_path = Path(third_party_path)
-            # Create directory if doesn't exist
-            cls._third_party_log_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Global settings
         cls._notifications_enabled = (
@@ -259,9 +262,11 @@ class QuantLogger:
     def _initialize_async_components(cls):
         """Initialize class-level async components exactly once.
 
-        Creates the shared log queue and attempts to start the background
-        writer task if an event loop is available. This method is thread-safe
-        and idempotent.
+        Called on the first log write rather than at instantiation, so
+        decorating functions at import time stays free of side effects.
+        Loads the notification configuration, creates the shared log queue
+        and attempts to start the background writer task if an event loop
+        is available. This method is idempotent.
 
         Note:
             If no event loop is running, the writer task creation is deferred
@@ -289,15 +294,13 @@ class QuantLogger:
 
         Note:
             This sets a class-level default that applies to all instances
-            unless overridden by the instance's log_path field. Creates
-            the directory structure if it doesn't exist.
+            unless overridden by the instance's log_path field. The
+            directory is created when the first entry is written to it.
 
         Example:
             QuantLogger.set_global_path(Path("/var/log/quant"))
         """
-        cls._global_log_path = path
-        if not path.exists():
-            path.mkdir(parents=True, exist_ok=True)
+        cls._global_log_path = Path(path)
 
     def __call__(self, func: Callable) -> Callable:
         """Main decorator entry point that wraps functions with logging.
@@ -324,7 +327,7 @@ class QuantLogger:
         # Ensure writer task is running
         self._ensure_writer_task()
 
-        if asyncio.iscoroutinefunction(func):
+        if inspect.iscoroutinefunction(func):
             return self._create_async_wrapper(func)
         else:
             return self._create_sync_wrapper(func)
@@ -341,6 +344,11 @@ class QuantLogger:
             If no event loop is running, this method silently returns.
             The writer task will be created when an event loop becomes available.
         """
+        if "asyncio" not in sys.modules:
+            # No event loop can be running before asyncio is imported
+            return
+        if not cls._initialized:
+            cls._initialize_async_components()
         try:
             loop = asyncio.get_running_loop()
             if cls._writer_task is None or cls._writer_task.done():
@@ -377,6 +385,15 @@ class QuantLogger:
             except Exception as e:
                 print(f"Error in log writer: {e}")
 
+    @classmethod
+    def _file_lock(cls, file_path: Path) -> asyncio.Lock:
+        """Get or create the running event loop's lock for a log file."""
+        locks = cls._file_locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.get(file_path)
+        if lock is None:
+            lock = locks[file_path] = asyncio.Lock()
+        return lock
+
     @classmethod
     async def _write_log_entry(cls, entry_data: dict):
         """Write a single log entry to file and optionally to stdout.
@@ -410,15 +427,13 @@ class QuantLogger:
 
         if log_path is None:
             log_path = Path("logs")
-            log_path.mkdir(exist_ok=True)
+        if log_path not in cls._created_dirs:
+            log_path.mkdir(parents=True, exist_ok=True)
+            cls._created_dirs.add(log_path)
 
         file_path = log_path / filename
 
-        # Get or create lock for this file
-        if file_path not in cls._file_locks:
-            cls._file_locks[file_path] = asyncio.Lock()
-
-        async with cls._file_locks[file_path]:
+        async with cls._file_lock(file_path):
             # Write to file using aiofiles
             async with aiofiles.open(file_path, "a") as f:
                 await f.write(formatted_entry + "\n")
@@ -634,11 +649,9 @@ class QuantLogger:
             f"  Original log: [{level}] {module}.{function}\n"
         )
 
-        # Get or create lock for third-party log file
-        if cls._third_party_log_path not in cls._file_locks:
-            cls._file_locks[cls._third_party_log_path] = asyncio.Lock()
+        cls._third_party_log_path.parent.mkdir(parents=True, exist_ok=True)
 
-        async with cls._file_locks[cls._third_party_log_path]:
+        async with cls._file_lock(cls._third_party_log_path):
             # Write to third-party log file
             async with aiofiles.open(cls._third_party_log_path, "a") as f:
                 await f.write(failure_entry)
@@ -760,7 +773,8 @@ class QuantLogger:
         Note:
             The wrapper captures exceptions but does not re-raise them,
             instead logging them as ERROR level entries. This is by design
-            to prevent decorated functions from failing unexpectedly.
+            to prevent decorated functions from failing unexpectedly. Types
+            listed in reraise are logged and then re-raised.
         """
 
         @wraps(func)
@@ -785,7 +799,9 @@ class QuantLogger:
                 level = "ERROR"
                 # Always print exceptions to stdout
                 print(f"Exception in {function}: {e}")
-                # Don't re-raise as per requirement
+                # Don't re-raise as per requirement, unless opted in
+                if isinstance(e, self.reraise):
+                    raise
             finally:
                 duration_ms = None
                 if self.log_time:
@@ -818,6 +834,8 @@ class QuantLogger:
                     "exception": exception,  # For error notifications
                 }
 
+                if not self._initialized:
+                    self._initialize_async_components()
                 await self._log_queue.put(entry_data)
 
         return wrapper
@@ -838,7 +856,8 @@ class QuantLogger:
         Note:
             Handles the async/sync bridge by attempting to use an existing
             event loop or creating one if necessary. The wrapper captures
-            exceptions but does not re-raise them, logging them as ERROR entries.
+            exceptions but does not re-raise them, logging them as ERROR entries
+            (types listed in reraise are logged and then re-raised).
         """
 
         @wraps(func)
@@ -863,7 +882,9 @@ class QuantLogger:
                 level = "ERROR"
                 # Always print exceptions to stdout
                 print(f"Exception in {function}: {e}")
-                # Don't re-raise as per requirement
+                # Don't re-raise as per requirement, unless opted in
+                if isinstance(e, self.reraise):
+                    raise
             finally:
                 duration_ms = None
                 if self.log_time:
@@ -896,6 +917,9 @@ class QuantLogger:
                     "exception": exception,  # For error notifications
                 }
 
+                if not self._initialized:
+                    self._initialize_async_components()
+
                 # Handle sync context - try to use existing loop or create one
                 try:
                     loop = asyncio.get_running_loop()  # noqa: F841
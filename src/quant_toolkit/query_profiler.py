@@ -0,0 +1,449 @@
+"""
+Statement-level SQL profiling for the SQLite data manager.
+
+QuantLogger times whole DataHandler methods; this module records what each
+method actually sent to SQLite. Every statement executed through a profiled
+connection is captured as a QueryRecord (SQL text, parameters, rows returned,
+elapsed time) in a bounded ring buffer. Statements slower than a configurable
+threshold are flagged and logged. Every query gets its ``EXPLAIN QUERY PLAN``,
+captured once per distinct SQL text and cached, so full-table scans can be
+spotted before they are slow.
+
+Classes:
+    QueryRecord: One executed statement
+    QueryProfiler: Thread-safe ring buffer of QueryRecords
+    ProfiledConnection: sqlite3.Connection factory that feeds a QueryProfiler
+    ProfiledCursor: Cursor used by ProfiledConnection to time statements
+
+Usage:
+    from quant_toolkit.sqlite_data_manager import DataHandler
+
+    handler = DataHandler(db_path, profile=True, slow_query_ms=50)
+    handler.get_security_data("NIFTY")
+
+    # Every statement, newest last
+    print(handler.query_log())
+
+    # Only slow statements
+    print(handler.query_log(slow_only=True))
+
+    # Statements whose plan scans a whole table
+    log = handler.query_log()
+    print(log[log["full_scan"]])
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import sqlite3
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, List, Optional
+
+from quant_toolkit._lazy import LazyModule
+
+pd = LazyModule("pandas")
+
+logger = logging.getLogger(__name__)
+
+# Parameter lists longer than this (multi-row INSERTs) are truncated in records
+MAX_RECORDED_PARAMS = 64
+
+# Distinct SQL texts whose query plans are cached (least recently used dropped)
+MAX_CACHED_PLANS = 4096
+
+
+@dataclass
+class QueryRecord:
+    """
+    A single statement executed on a profiled connection.
+
+    Attributes:
+        sql: Statement text as passed to execute()
+        params: Bound parameters, truncated to MAX_RECORDED_PARAMS values
+            (None for executemany)
+        rows: Rows fetched for queries, rows affected for DML
+        elapsed_ms: Time spent executing and fetching, in milliseconds
+        timestamp: When the statement started
+        executemany: Whether the statement ran via executemany()
+        slow: Whether elapsed_ms reached the profiler's slow threshold
+        plan: EXPLAIN QUERY PLAN details of queries (shared by every record
+            of the same SQL text)
+    """
+
+    sql: str
+    params: Any
+    rows: int = 0
+    elapsed_ms: float = 0.0
+    timestamp: datetime.datetime = field(default_factory=datetime.datetime.now)
+    executemany: bool = False
+    slow: bool = False
+    plan: Optional[List[str]] = None
+
+    @property
+    def full_scan(self) -> bool:
+        """True if the captured query plan contains a table scan."""
+        return bool(self.plan) and any(step.startswith("SCAN") for step in self.plan)
+
+
+class QueryProfiler:
+    """
+    Thread-safe ring buffer of executed statements.
+
+    Attributes:
+        capacity: Maximum number of records kept (oldest are dropped)
+        slow_query_ms: Threshold at which a statement is flagged as slow
+        explain: Whether to capture EXPLAIN QUERY PLAN for queries
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1000,
+        slow_query_ms: float = 100.0,
+        explain: bool = True,
+    ):
+        """
+        Initialize the profiler.
+
+        Args:
+            capacity: Maximum number of records kept (default: 1000)
+            slow_query_ms: Slow-query threshold in milliseconds (default: 100.0)
+            explain: Capture the plan of every distinct query, fast or slow
+                (default: True)
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+
+        self.capacity = capacity
+        self.slow_query_ms = slow_query_ms
+        self.explain = explain
+        self._records: deque = deque(maxlen=capacity)
+        # SQL text -> plan steps, so each distinct query is explained once
+        self._plans: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.total_statements = 0
+
+    def _start(self, sql: str, params: Any, executemany: bool) -> QueryRecord:
+        """Create a record and push it into the ring buffer."""
+        if isinstance(params, (list, tuple)) and len(params) > MAX_RECORDED_PARAMS:
+            params = tuple(params[:MAX_RECORDED_PARAMS])
+        record = QueryRecord(sql=sql, params=params, executemany=executemany)
+        with self._lock:
+            self._records.append(record)
+            self.total_statements += 1
+        return record
+
+    def _finish(self, record: QueryRecord, conn: sqlite3.Connection):
+        """
+        Finalize a record once its statement is fully consumed.
+
+        Attaches the query plan, then flags and logs slow statements.
+        """
+        if self.explain and record.plan is None and not record.executemany:
+            record.plan = self._plan(record, conn)
+        if record.slow or record.elapsed_ms < self.slow_query_ms:
+            return
+
+        record.slow = True
+        sql_text = " ".join(record.sql.split())
+        if len(sql_text) > 200:
+            sql_text = sql_text[:200] + "..."
+        logger.warning(
+            f"Slow query ({record.elapsed_ms:.1f}ms, {record.rows} rows"
+            f"{', full scan' if record.full_scan else ''}): {sql_text}"
+        )
+
+    def _plan(
+        self, record: QueryRecord, conn: sqlite3.Connection
+    ) -> Optional[List[str]]:
+        """
+        Query plan of a record's SQL text, explained on first sight only.
+
+        Returns:
+            Plan steps, or None for statements that are not queries
+        """
+        sql = record.sql
+        with self._lock:
+            plan = self._plans.get(sql)
+            if plan is not None:
+                self._plans.move_to_end(sql)
+                return plan
+        if not _is_select(sql):
+            return None
+
+        try:
+            # Plain sqlite3.Cursor so the EXPLAIN itself is not profiled
+            plan_cursor = sqlite3.Cursor(conn)
+            plan_cursor.execute(f"EXPLAIN QUERY PLAN {sql}", record.params or ())
+            plan = [row[3] for row in plan_cursor.fetchall()]
+            plan_cursor.close()
+        except sqlite3.Error as e:
+            logger.debug(f"Could not capture query plan: {e}")
+            return None
+
+        with self._lock:
+            self._plans[sql] = plan
+            if len(self._plans) > MAX_CACHED_PLANS:
+                self._plans.popitem(last=False)
+        return plan
+
+    def records(
+        self,
+        slow_only: bool = False,
+        min_ms: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[QueryRecord]:
+        """
+        Get recorded statements, oldest first.
+
+        Args:
+            slow_only: Only return statements flagged as slow
+            min_ms: Only return statements at least this slow
+            limit: Only return the most recent N matching statements
+
+        Returns:
+            List of QueryRecords
+        """
+        with self._lock:
+            records = list(self._records)
+
+        if slow_only:
+            records = [r for r in records if r.slow]
+        if min_ms is not None:
+            records = [r for r in records if r.elapsed_ms >= min_ms]
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        return records
+
+    def slow_queries(self, limit: Optional[int] = None) -> List[QueryRecord]:
+        """
+        Get statements flagged as slow, oldest first.
+
+        Args:
+            limit: Only return the most recent N slow statements
+
+        Returns:
+            List of slow QueryRecords
+        """
+        return self.records(slow_only=True, limit=limit)
+
+    def to_dataframe(
+        self, slow_only: bool = False, limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Get recorded statements as a DataFrame.
+
+        Args:
+            slow_only: Only include statements flagged as slow
+            limit: Only include the most recent N matching statements
+
+        Returns:
+            DataFrame with one row per statement
+        """
+        columns = [
+            "timestamp",
+            "sql",
+            "params",
+            "rows",
+            "elapsed_ms",
+            "executemany",
+            "slow",
+            "full_scan",
+            "plan",
+        ]
+        rows = [
+            {
+                "timestamp": r.timestamp,
+                "sql": r.sql,
+                "params": r.params,
+                "rows": r.rows,
+                "elapsed_ms": r.elapsed_ms,
+                "executemany": r.executemany,
+                "slow": r.slow,
+                "full_scan": r.full_scan,
+                "plan": r.plan,
+            }
+            for r in self.records(slow_only=slow_only, limit=limit)
+        ]
+        return pd.DataFrame(rows, columns=columns)
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Aggregate recorded statements by SQL text.
+
+        Returns:
+            DataFrame with count, total/mean/max elapsed time, rows, slow
+            count and full_scan per distinct statement, most expensive first
+        """
+        df = self.to_dataframe()
+        if df.empty:
+            return pd.DataFrame(
+                columns=[
+                    "sql",
+                    "count",
+                    "total_ms",
+                    "mean_ms",
+                    "max_ms",
+                    "rows",
+                    "slow",
+                    "full_scan",
+                ]
+            )
+
+        summary = (
+            df.groupby("sql")
+            .agg(
+                count=("elapsed_ms", "size"),
+                total_ms=("elapsed_ms", "sum"),
+                mean_ms=("elapsed_ms", "mean"),
+                max_ms=("elapsed_ms", "max"),
+                rows=("rows", "sum"),
+                slow=("slow", "sum"),
+                full_scan=("full_scan", "any"),
+            )
+            .reset_index()
+        )
+        return summary.sort_values("total_ms", ascending=False, ignore_index=True)
+
+    def clear(self):
+        """Drop all recorded statements and cached query plans."""
+        with self._lock:
+            self._records.clear()
+            self._plans.clear()
+            self.total_statements = 0
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Cursor that records each statement into the connection's QueryProfiler.
+
+    Elapsed time covers execute() plus every fetch until the result set is
+    exhausted, the cursor is closed or another statement is executed.
+    """
+
+    _record: Optional[QueryRecord] = None
+
+    def _complete(self):
+        """Finalize the record of the statement currently held by the cursor."""
+        record, self._record = self._record, None
+        if record is not None:
+            self.connection.profiler._finish(record, self.connection)
+
+    def _timed(self, record: QueryRecord, method, *args):
+        """Run a cursor method and add its duration to the record."""
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            record.elapsed_ms += (time.perf_counter() - start) * 1000
+
+    def execute(self, sql, parameters=()):
+        """Execute a statement and start a new QueryRecord for it."""
+        self._complete()
+        profiler = self.connection.profiler
+        if profiler is None:
+            return super().execute(sql, parameters)
+        record = profiler._start(sql, parameters, executemany=False)
+        self._record = record
+        self._timed(record, super().execute, sql, parameters)
+        if self.description is None:
+            # DML/DDL: nothing to fetch, record affected rows
+            record.rows = max(self.rowcount, 0)
+            self._complete()
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        """Execute a statement for every parameter set as one QueryRecord."""
+        self._complete()
+        profiler = self.connection.profiler
+        if profiler is None:
+            return super().executemany(sql, seq_of_parameters)
+        record = profiler._start(sql, None, executemany=True)
+        self._timed(record, super().executemany, sql, seq_of_parameters)
+        record.rows = max(self.rowcount, 0)
+        profiler._finish(record, self.connection)
+        return self
+
+    def fetchone(self):
+        """Fetch one row, counting it against the current record."""
+        record = self._record
+        if record is None:
+            return super().fetchone()
+        row = self._timed(record, super().fetchone)
+        if row is None:
+            self._complete()
+        else:
+            record.rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        """Fetch up to size rows, counting them against the current record."""
+        record = self._record
+        size = self.arraysize if size is None else size
+        if record is None:
+            return super().fetchmany(size)
+        rows = self._timed(record, super().fetchmany, size)
+        record.rows += len(rows)
+        if len(rows) < size:
+            self._complete()
+        return rows
+
+    def fetchall(self):
+        """Fetch all remaining rows and finalize the current record."""
+        record = self._record
+        if record is None:
+            return super().fetchall()
+        rows = self._timed(record, super().fetchall)
+        record.rows += len(rows)
+        self._complete()
+        return rows
+
+    def __next__(self):
+        """Iterate rows, counting them against the current record."""
+        record = self._record
+        if record is None:
+            return super().__next__()
+        try:
+            row = self._timed(record, super().__next__)
+        except StopIteration:
+            self._complete()
+            raise
+        record.rows += 1
+        return row
+
+    def close(self):
+        """Finalize the current record and close the cursor."""
+        self._complete()
+        super().close()
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection that routes every statement through a ProfiledCursor.
+
+    Pass as ``factory=`` to sqlite3.connect() and assign ``profiler``; until
+    then statements run unprofiled.
+    """
+
+    profiler: Optional[QueryProfiler] = None
+
+    def cursor(self, factory=ProfiledCursor):
+        """Create a cursor, profiled by default."""
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        """Shortcut execute() on a profiled cursor."""
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        """Shortcut executemany() on a profiled cursor."""
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _is_select(sql: str) -> bool:
+    """Check whether a statement is a query that EXPLAIN QUERY PLAN can describe."""
+    head = sql.lstrip().split(None, 1)
+    return bool(head) and head[0].upper() in ("SELECT", "WITH")
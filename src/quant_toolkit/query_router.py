@@ -0,0 +1,301 @@
+"""
+Cross-database query router over the index, futures and stocks stores.
+
+DBPaths keeps index, futures and stock bars in three SQLite files, so a
+multi-asset question ("RELIANCE close next to its future and NIFTY") used
+to mean three DataHandlers, three reads and an alignment in pandas.
+QueryRouter ATTACHes all three databases read-only on one connection and
+answers such questions with a single SQL join on datetime, so only the
+aligned rows ever leave SQLite.
+
+Tables are addressed as ``<database>.<symbol>``, where the database is the
+alias it was attached under ("index", "futures" and "stocks" for DBPaths).
+Legs name stored tables as-is: futures are stored per contract ticker, so
+a rolling alias such as "RELIANCE_FUT" is not a table. For a continuous
+futures series, build and store it first with
+``ContinuousFuturesBuilder.save()`` and address its "<SYMBOL>_CONT" table.
+
+Classes:
+    QueryRouter: One read-only connection over several market databases
+
+Usage:
+    from quant_toolkit.query_router import QueryRouter
+
+    with QueryRouter() as router:          # attaches DBPaths databases
+        df = router.aligned(
+            {
+                "nifty": "index.NIFTY",
+                "reliance": "stocks.RELIANCE",
+                "reliance_fut": "futures.NSE:RELIANCE24MARFUT",
+            },
+            columns=["close"],
+            start="2024-01-01",
+            end="2024-03-31",
+        )
+        # datetime | nifty_close | reliance_close | reliance_fut_close
+"""
+
+import datetime
+import logging
+import sqlite3
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Literal, Mapping, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from quant_toolkit.quantlogger import QuantLogger
+from quant_toolkit.sqlite_data_manager import DATETIME_FORMAT, DBPaths, _quote
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[str, datetime.date, datetime.datetime, None]
+
+
+class QueryRouter:
+    """
+    Read-only connection with several market databases attached.
+
+    The main database is in-memory and empty; every store is ATTACHed with
+    ``mode=ro`` and the connection is ``query_only``, so the router can
+    never write to the stores. In WAL mode it also never blocks their
+    writers. One connection is shared by all threads and queries are
+    serialized on it.
+
+    Attributes:
+        databases: Mapping of alias to database path, for attached databases
+    """
+
+    def __init__(
+        self,
+        paths: Optional[DBPaths] = None,
+        databases: Optional[Mapping[str, Union[str, Path]]] = None,
+        timeout: float = 30.0,
+    ):
+        """
+        Attach the databases.
+
+        Args:
+            paths: DBPaths whose index, futures and stocks databases are
+                attached (default: DBPaths() when databases is not given)
+            databases: Explicit mapping of alias to database path, used
+                instead of paths
+            timeout: Seconds to wait on a locked database (default: 30.0)
+        """
+        if databases is None:
+            paths = paths or DBPaths()
+            databases = {
+                "index": paths.index_db_path,
+                "futures": paths.futures_db_path,
+                "stocks": paths.stocks_db_path,
+            }
+
+        self._conn = sqlite3.connect(
+            "file::memory:", uri=True, timeout=timeout, check_same_thread=False
+        )
+        self._lock = Lock()
+        self.databases: Dict[str, Path] = {}
+
+        for alias, path in databases.items():
+            path = Path(path)
+            if not path.is_file():
+                logger.warning(f"Database {path} not found, '{alias}' not attached")
+                continue
+            uri = path.resolve().as_uri() + "?mode=ro"
+            self._conn.execute(f"ATTACH DATABASE ? AS {_quote(alias)}", (uri,))
+            self.databases[alias] = path
+
+        self._conn.execute("PRAGMA query_only=ON")
+        logger.info(f"QueryRouter attached: {', '.join(self.databases) or 'none'}")
+
+    def tables(self, database: str) -> List[str]:
+        """
+        Symbol tables of an attached database.
+
+        Args:
+            database: Alias of the database
+
+        Returns:
+            List of table names
+
+        Raises:
+            ValueError: If the database is not attached
+        """
+        self._check_database(database)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT name FROM {_quote(database)}.sqlite_master "
+                "WHERE type='table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    # Errors are logged and then propagate: a failed query is not an empty one
+    @QuantLogger(log_time=True, reraise=(Exception,))
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        """
+        Run an arbitrary read query across the attached databases.
+
+        Args:
+            sql: SQL text; tables are referenced as "alias"."symbol"
+            params: Query parameters
+
+        Returns:
+            Query result as a DataFrame
+
+        Raises:
+            pandas.errors.DatabaseError: If the query fails
+        """
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    @QuantLogger(log_time=True, reraise=(Exception,))
+    def aligned(
+        self,
+        legs: Union[Mapping[str, str], Sequence[str]],
+        columns: Sequence[str] = ("close",),
+        start: DateLike = None,
+        end: DateLike = None,
+        how: Literal["inner", "left"] = "inner",
+    ) -> pd.DataFrame:
+        """
+        Bars of several symbols side by side, joined on datetime in SQL.
+
+        Args:
+            legs: Tables to align, as "database.symbol" strings. A mapping
+                of label to table names the output columns; a plain
+                sequence uses the symbols as labels.
+            columns: Bar columns to return for every leg (default: close)
+            start: First datetime to include (str, date or datetime)
+            end: Last datetime to include; a date or "YYYY-MM-DD" string
+                includes that whole day
+            how: "inner" keeps timestamps present in every leg, "left"
+                keeps every timestamp of the first leg (default: "inner")
+
+        Returns:
+            DataFrame with a datetime column and one "<label>_<column>"
+            column per leg and column
+
+        Raises:
+            ValueError: If a leg is malformed, its database is not attached
+                or its table does not exist, or how is invalid
+
+        Example:
+            router.aligned(["index.NIFTY", "stocks.RELIANCE"], columns=["close"])
+            # datetime | NIFTY_close | RELIANCE_close
+        """
+        if how not in ("inner", "left"):
+            raise ValueError(f"how must be 'inner' or 'left', got '{how}'")
+        resolved = self._resolve_legs(legs)
+        if not resolved:
+            raise ValueError("At least one leg is required")
+
+        select = ["t0.datetime AS datetime"]
+        joins = []
+        for i, (label, database, symbol) in enumerate(resolved):
+            alias = f"t{i}"
+            select.extend(
+                f"{alias}.{_quote(column)} AS {_quote(f'{label}_{column}')}"
+                for column in columns
+            )
+            table = f"{_quote(database)}.{_quote(symbol)} AS {alias}"
+            if i == 0:
+                joins.append(f"FROM {table}")
+            else:
+                join = "JOIN" if how == "inner" else "LEFT JOIN"
+                joins.append(f"{join} {table} ON {alias}.datetime = t0.datetime")
+
+        where, params = [], []
+        if start is not None:
+            where.append("t0.datetime >= ?")
+            params.append(_format_bound(start, end=False))
+        if end is not None:
+            where.append("t0.datetime < ?")
+            params.append(_format_bound(end, end=True))
+
+        sql = f"SELECT {', '.join(select)} {' '.join(joins)}"
+        if where:
+            sql += f" WHERE {' AND '.join(where)}"
+        sql += " ORDER BY t0.datetime"
+
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        df["datetime"] = pd.to_datetime(df["datetime"], format=DATETIME_FORMAT)
+        return df
+
+    def _resolve_legs(
+        self, legs: Union[Mapping[str, str], Sequence[str]]
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Parse and check legs into (label, database, symbol) triples.
+
+        Args:
+            legs: Mapping of label to "database.symbol", or a sequence of them
+
+        Returns:
+            List of (label, database, symbol)
+
+        Raises:
+            ValueError: If a leg is malformed or its table does not exist
+        """
+        items = (
+            list(legs.items())
+            if isinstance(legs, Mapping)
+            else [(None, leg) for leg in legs]
+        )
+        resolved = []
+        known: Dict[str, set] = {}
+        for label, leg in items:
+            database, sep, symbol = leg.partition(".")
+            if not sep or not symbol:
+                raise ValueError(f"Leg '{leg}' must be 'database.symbol'")
+            if database not in known:
+                known[database] = set(self.tables(database))
+            if symbol not in known[database]:
+                raise ValueError(f"Table '{symbol}' not found in '{database}'")
+            resolved.append((label or symbol, database, symbol))
+        return resolved
+
+    def _check_database(self, database: str) -> None:
+        """Raise ValueError unless the alias is attached."""
+        if database not in self.databases:
+            raise ValueError(
+                f"Database '{database}' is not attached "
+                f"(attached: {', '.join(self.databases) or 'none'})"
+            )
+
+    def close(self) -> None:
+        """Close the connection and detach every database."""
+        self._conn.close()
+
+    def __enter__(self) -> "QueryRouter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _format_bound(value: DateLike, end: bool) -> str:
+    """
+    Render a datetime bound in the stored text format.
+
+    Args:
+        value: str, date or datetime
+        end: Whether this is an exclusive end bound; a bare date then
+            moves to the start of the following day
+
+    Returns:
+        Datetime string comparable with the datetime column
+    """
+    if isinstance(value, str):
+        value = (
+            datetime.datetime.strptime(value, "%Y-%m-%d").date()
+            if len(value) == 10
+            else datetime.datetime.strptime(value, DATETIME_FORMAT)
+        )
+    if isinstance(value, datetime.datetime):
+        if end:
+            value += datetime.timedelta(seconds=1)
+        return value.strftime(DATETIME_FORMAT)
+    if end:
+        value += datetime.timedelta(days=1)
+    return value.strftime(DATETIME_FORMAT)
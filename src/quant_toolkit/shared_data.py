@@ -0,0 +1,416 @@
+"""
+Shared-memory publication of loaded datasets to worker processes.
+
+A backtest fanned out over a ProcessPoolExecutor either reloads every
+symbol in every worker or ships pickled DataFrames to them; both keep one
+copy of the data per worker. SharedDataset loads a symbol set once and
+copies its columns into a single multiprocessing.shared_memory segment.
+Workers receive a small picklable SharedDatasetDescriptor and attach to the
+segment, getting read-only numpy views and DataFrames over the same
+physical pages, so N workers cost one copy of the data.
+
+Only numeric, boolean and datetime columns can be shared; columns are laid
+out back to back, 64-byte aligned, one block per symbol.
+
+Lifecycle:
+    - The publishing SharedDataset owns the segment and unlinks it on
+      close(), on garbage collection or at interpreter exit, whichever
+      comes first.
+    - Workers attach with attach(descriptor); attachments are cached per
+      process, so every task of a pool worker reuses one mapping.
+    - Attaching never takes ownership: a worker exiting does not remove
+      the segment from under the other workers.
+
+Classes:
+    SharedDataset: Publisher owning the shared segment
+    SharedDatasetView: Read-only attachment in a worker process
+    SharedDatasetDescriptor: Picklable handle passed to workers
+
+Usage:
+    from concurrent.futures import ProcessPoolExecutor
+    from quant_toolkit.shared_data import attach
+
+    def backtest(descriptor, symbol):
+        bars = attach(descriptor).frame(symbol)   # zero-copy, read-only
+        ...
+
+    with handler.share(symbols, columns=["close"]) as dataset:
+        with ProcessPoolExecutor() as pool:
+            descriptors = [dataset.descriptor] * len(symbols)
+            results = list(pool.map(backtest, descriptors, symbols))
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import weakref
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from quant_toolkit.sqlite_data_manager import DataHandler
+
+logger = logging.getLogger(__name__)
+
+# Column offsets are aligned for vectorized reads
+ALIGNMENT = 64
+
+# Attachments of this process: segment name -> SharedDatasetView
+_ATTACHED: Dict[str, "SharedDatasetView"] = {}
+_ATTACH_LOCK = threading.Lock()
+
+# Whether this process's resource tracker is its own rather than the
+# publisher's (decided on the first attach, Python < 3.13 only)
+_PRIVATE_TRACKER: Optional[bool] = None
+
+
+@dataclass(frozen=True)
+class ColumnLayout:
+    """
+    Placement of one column in the shared segment.
+
+    Attributes:
+        name: Column name
+        dtype: numpy dtype string, e.g. "<f4" or "<M8[us]"
+        offset: Byte offset of the first value
+    """
+
+    name: str
+    dtype: str
+    offset: int
+
+
+@dataclass(frozen=True)
+class SymbolLayout:
+    """
+    Placement of one symbol's columns in the shared segment.
+
+    Attributes:
+        rows: Number of rows
+        columns: Column layouts in DataFrame order
+    """
+
+    rows: int
+    columns: Tuple[ColumnLayout, ...]
+
+
+@dataclass(frozen=True)
+class SharedDatasetDescriptor:
+    """
+    Picklable handle to a published dataset, a few hundred bytes per symbol.
+
+    Attributes:
+        shm_name: Name of the shared memory segment
+        nbytes: Bytes of column data in the segment
+        symbols: Layout of every symbol
+    """
+
+    shm_name: str
+    nbytes: int
+    symbols: Mapping[str, SymbolLayout]
+
+
+class _SharedColumns:
+    """Read access to the columns of a mapped segment."""
+
+    _shm: shared_memory.SharedMemory
+    descriptor: SharedDatasetDescriptor
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols in the dataset."""
+        return list(self.descriptor.symbols)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of column data in the segment."""
+        return self.descriptor.nbytes
+
+    def arrays(self, symbol: str) -> Dict[str, np.ndarray]:
+        """
+        Read-only numpy views of a symbol's columns.
+
+        Args:
+            symbol: Symbol to read
+
+        Returns:
+            Mapping of column name to array backed by the shared segment
+
+        Raises:
+            KeyError: If the symbol is not in the dataset
+        """
+        layout = self.descriptor.symbols[symbol]
+        arrays = {}
+        for column in layout.columns:
+            array = np.ndarray(
+                (layout.rows,),
+                dtype=np.dtype(column.dtype),
+                buffer=self._shm.buf,
+                offset=column.offset,
+            )
+            array.flags.writeable = False
+            arrays[column.name] = array
+        return arrays
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """
+        DataFrame over a symbol's shared columns, without copying them.
+
+        The frame is read-only in effect: with copy-on-write, modifying it
+        copies the touched column into private memory first.
+
+        Args:
+            symbol: Symbol to read
+
+        Returns:
+            DataFrame with the columns the symbol was published with
+
+        Raises:
+            KeyError: If the symbol is not in the dataset
+        """
+        return pd.DataFrame(self.arrays(symbol), copy=False)
+
+
+class SharedDataset(_SharedColumns):
+    """
+    Publisher of a dataset in shared memory; owns and unlinks the segment.
+
+    Attributes:
+        descriptor: Picklable handle for workers
+    """
+
+    def __init__(self, frames: Mapping[str, pd.DataFrame]):
+        """
+        Copy DataFrames into a new shared memory segment.
+
+        Args:
+            frames: Mapping of symbol to DataFrame
+
+        Raises:
+            ValueError: If a column is not numeric, boolean or datetime
+        """
+        layouts, nbytes = _plan_layout(frames)
+        # A zero-byte segment cannot be created
+        self._shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        self._finalizer = weakref.finalize(self, _release, self._shm, True)
+        self.descriptor = SharedDatasetDescriptor(self._shm.name, nbytes, layouts)
+
+        for symbol, frame in frames.items():
+            layout = layouts[symbol]
+            for column in layout.columns:
+                target = np.ndarray(
+                    (layout.rows,),
+                    dtype=np.dtype(column.dtype),
+                    buffer=self._shm.buf,
+                    offset=column.offset,
+                )
+                target[:] = frame[column.name].to_numpy()
+                del target
+
+        logger.info(
+            f"Published {len(layouts)} symbols ({nbytes / 1e6:.1f}MB) "
+            f"in shared memory {self._shm.name}"
+        )
+
+    @classmethod
+    def from_handler(
+        cls, handler: "DataHandler", symbols: List[str], **read_kwargs
+    ) -> "SharedDataset":
+        """
+        Load symbols with get_security_data and publish them.
+
+        Args:
+            handler: DataHandler to read from
+            symbols: Symbols to load; missing symbols are skipped
+            **read_kwargs: Passed to get_security_data (start_datetime,
+                end_datetime, columns, dtypes, ...)
+
+        Returns:
+            Published SharedDataset
+        """
+        frames = {}
+        for symbol in symbols:
+            frame = handler.get_security_data(symbol, **read_kwargs)
+            if frame is None:
+                logger.warning(f"Symbol {symbol} not found, not shared")
+                continue
+            frames[symbol] = frame
+        return cls(frames)
+
+    @property
+    def closed(self) -> bool:
+        """Whether the segment has been released."""
+        return not self._finalizer.alive
+
+    def close(self) -> None:
+        """
+        Unlink the segment.
+
+        Workers that are still attached keep their mapping until they
+        detach; no new attachments are possible afterwards.
+        """
+        self._finalizer()
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        state = "closed" if self.closed else self.descriptor.shm_name
+        return f"SharedDataset({len(self.descriptor.symbols)} symbols, {state})"
+
+
+class SharedDatasetView(_SharedColumns):
+    """
+    Read-only attachment to a published dataset.
+
+    Attributes:
+        descriptor: Handle the view was attached with
+    """
+
+    def __init__(self, descriptor: SharedDatasetDescriptor):
+        """
+        Map a published segment.
+
+        Prefer attach(), which reuses one view per process.
+
+        Args:
+            descriptor: Handle from SharedDataset.descriptor
+
+        Raises:
+            FileNotFoundError: If the publisher has already closed it
+        """
+        self.descriptor = descriptor
+        self._shm = _open_segment(descriptor.shm_name)
+        self._finalizer = weakref.finalize(self, _release, self._shm, False)
+
+    def close(self) -> None:
+        """Unmap the segment once no arrays or frames reference it."""
+        self._finalizer()
+
+
+def attach(descriptor: SharedDatasetDescriptor) -> SharedDatasetView:
+    """
+    Attach to a published dataset, reusing this process's earlier attachment.
+
+    Args:
+        descriptor: Handle from SharedDataset.descriptor
+
+    Returns:
+        SharedDatasetView
+    """
+    with _ATTACH_LOCK:
+        view = _ATTACHED.get(descriptor.shm_name)
+        if view is None:
+            view = _ATTACHED[descriptor.shm_name] = SharedDatasetView(descriptor)
+        return view
+
+
+def detach(descriptor: Optional[SharedDatasetDescriptor] = None) -> None:
+    """
+    Drop cached attachments of this process.
+
+    Args:
+        descriptor: Attachment to drop (default: all)
+    """
+    with _ATTACH_LOCK:
+        if descriptor is None:
+            views = list(_ATTACHED.values())
+            _ATTACHED.clear()
+        else:
+            view = _ATTACHED.pop(descriptor.shm_name, None)
+            views = [view] if view is not None else []
+    for view in views:
+        view.close()
+
+
+def _plan_layout(
+    frames: Mapping[str, pd.DataFrame],
+) -> Tuple[Dict[str, SymbolLayout], int]:
+    """
+    Assign aligned offsets to every column of every frame.
+
+    Args:
+        frames: Mapping of symbol to DataFrame
+
+    Returns:
+        Tuple of (symbol layouts, total bytes)
+
+    Raises:
+        ValueError: If a column is not numeric, boolean or datetime
+    """
+    layouts = {}
+    offset = 0
+    for symbol, frame in frames.items():
+        columns = []
+        for name in frame.columns:
+            dtype = frame[name].to_numpy().dtype
+            if dtype.kind not in "biufM":
+                raise ValueError(
+                    f"Column {name} of {symbol} has dtype {dtype}; only numeric, "
+                    "boolean and datetime columns can be shared"
+                )
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            columns.append(ColumnLayout(str(name), dtype.str, offset))
+            offset += dtype.itemsize * len(frame)
+        layouts[symbol] = SymbolLayout(len(frame), tuple(columns))
+    return layouts, offset
+
+
+def _open_segment(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a segment without taking part in its cleanup.
+
+    Before Python 3.13, attaching registers the segment with the resource
+    tracker. A tracker shared with the publisher (fork after publication,
+    spawn, forkserver) keeps a set of names, so that is harmless; but a
+    process that had no tracker yet starts its own, which unlinks the
+    segment when the process exits and breaks every other worker.
+
+    Args:
+        name: Segment name
+
+    Returns:
+        Attached SharedMemory
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    global _PRIVATE_TRACKER
+    if _PRIVATE_TRACKER is None:
+        tracker = getattr(resource_tracker, "_resource_tracker", None)
+        _PRIVATE_TRACKER = getattr(tracker, "_fd", None) is None
+    shm = shared_memory.SharedMemory(name=name)
+    if _PRIVATE_TRACKER and os.name == "posix":
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _release(shm: shared_memory.SharedMemory, unlink: bool) -> None:
+    """
+    Close a mapping and optionally unlink the segment.
+
+    Args:
+        shm: Segment to release
+        unlink: Remove the segment name (publisher only)
+    """
+    try:
+        shm.close()
+    except BufferError:
+        # Arrays or frames still reference the mapping; it is unmapped
+        # when the last of them is garbage collected
+        logger.debug(f"Shared memory {shm.name} still referenced, left mapped")
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
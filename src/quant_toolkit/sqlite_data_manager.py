@@ -13,6 +13,15 @@ Classes:
     DataHandler: Main interface for database operations with connection pooling
     DBPaths: Configuration manager for database paths and symbol lists
     ConnectionPool: Internal connection pool manager
+    InvalidDataError: Rows failed ValidationRules(on_invalid="raise")
+    QueryTimeoutError: A read exceeded its timeout= deadline
+
+Statement-level profiling (see query_profiler.py) is opt-in via
+DataHandler(db_path, profile=True). Processes sharing a database can
+serialize their writers with DataHandler(db_path, writer_lease=True) (see
+write_lease.py). Handlers pickle as their configuration and pools discard
+connections inherited across fork(), so a handler can be passed straight to
+ProcessPoolExecutor workers.
 
 Usage:
     from quant_toolkit.sqlite_data_manager import DataHandler, DBPaths
@@ -29,33 +38,168 @@ Usage:
         handler.inject_data("NIFTY", new_data, conn=conn)
 """
 
+from __future__ import annotations
+
+from quant_toolkit._lazy import LazyModule
+from quant_toolkit.db_maintenance import MaintenanceReport, MaintenanceScheduler
 from quant_toolkit.market_contracts import MarketContracts
 from quant_toolkit.quantlogger import QuantLogger
+from quant_toolkit.query_profiler import ProfiledConnection, QueryProfiler
+from quant_toolkit.write_lease import LeaseStats, WriterLease
 
-import pandas as pd
-import polars as pl
 import sqlite3
 import datetime
 import os
+import sys
 import logging
+import time
+import uuid
 from pathlib import Path
-from dataclasses import dataclass, field
-from contextlib import contextmanager
-from typing import Optional, Union, List
+from dataclasses import dataclass, field, replace
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Optional, Sequence, Tuple, Union, List, Literal
 from collections import deque
-from threading import Lock
+from itertools import chain, islice
+from threading import Condition, Lock
 
-# Load environment variables
-from dotenv import load_dotenv
+# Heavy backends are imported on first use, keeping `import` cheap for
+# scripts that only touch one of them
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+pl = LazyModule("polars")
+pa = LazyModule("pyarrow")
+pc = LazyModule("pyarrow.compute")
+
+# Configure module logger
+logger = logging.getLogger(__name__)
 
-load_dotenv()
+_ENV_LOADED = False
 
-# Internal imports
 
+def _load_env() -> None:
+    """
+    Load the .env file and configure the log path, once per process.
 
-# Configure module logger
-logger = logging.getLogger(__name__)
-QuantLogger.set_global_path(Path(os.getenv("LOG_PATH", "logs")))
+    Runs on first use of DataHandler or DBPaths rather than at import, so
+    importing this module reads no files and creates no directories.
+    """
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    QuantLogger.set_global_path(Path(os.getenv("LOG_PATH", "logs")))
+    _ENV_LOADED = True
+
+
+REQUIRED_COLUMNS = ("datetime", "open", "high", "low", "close", "volume")
+DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# dtypes="compact" for get_security_data: half the memory of float64/int64
+COMPACT_DTYPES = {
+    "open": "float32",
+    "high": "float32",
+    "low": "float32",
+    "close": "float32",
+    "volume": "int32",
+    "oi": "int32",
+}
+
+# Time part ("HH:MM:SS") of the stored datetime text; index expressions and
+# queries must spell it identically for SQLite to match them
+TIME_OF_DAY_SQL = "substr(datetime, 12)"
+
+# Indexes every symbol table gets when it is written, as (suffix, columns):
+# datetime for range reads, tail(), page() and latest_bars(), time of day for
+# session filters
+BAR_INDEXES = (
+    ("datetime", "datetime"),
+    ("time_of_day", f"{TIME_OF_DAY_SQL}, datetime"),
+)
+
+# SQLite VM instructions between deadline checks of reads with a timeout
+# (a check every ~10-50us of query time)
+DEADLINE_CHECK_OPS = 1000
+
+# Process-wide handlers of DataHandler.shared(), keyed by resolved db path
+_SHARED_HANDLERS: dict = {}
+_SHARED_LOCK = Lock()
+
+# Connections a forked child inherited from its parent. They are never used
+# nor closed: closing one would run SQLite's last-connection cleanup
+# (checkpoint, WAL removal) against the database the parent still uses.
+_INHERITED_CONNECTIONS: list = []
+
+# Symbol CSVs read by DBPaths: path -> ((mtime_ns, size), symbols)
+_CSV_SYMBOLS: dict = {}
+
+
+class QueryTimeoutError(TimeoutError):
+    """A read was interrupted because it ran past its timeout."""
+
+
+@dataclass(frozen=True)
+class PoolDecision:
+    """
+    One resize of a ConnectionPool.
+
+    Attributes:
+        at: Unix time of the decision
+        action: "grow" or "shrink"
+        size: Pool size after the decision
+        open: Open connections after the decision
+        reason: Why the pool was resized
+    """
+
+    at: float
+    action: Literal["grow", "shrink"]
+    size: int
+    open: int
+    reason: str
+
+
+@dataclass
+class PoolStats:
+    """
+    Sizing counters and current state of a ConnectionPool.
+
+    Attributes:
+        size: Connections the pool may open now
+        min_size: Connections kept open however long they idle
+        max_size: Ceiling the pool may grow to
+        open: Open connections, idle or checked out
+        idle: Connections waiting in the pool
+        in_use: Connections checked out
+        checkouts: Connections handed out
+        waits: Checkouts that had to wait for a connection
+        wait_ms: Total time spent waiting
+        max_wait_ms: Longest single wait
+        timeouts: Checkouts that gave up after timeout
+        grown: Times the pool grew under sustained waits
+        expired: Idle connections closed after idle_ttl
+        decisions: Most recent sizing decisions, oldest first
+    """
+
+    size: int = 0
+    min_size: int = 0
+    max_size: int = 0
+    open: int = 0
+    idle: int = 0
+    in_use: int = 0
+    checkouts: int = 0
+    waits: int = 0
+    wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+    timeouts: int = 0
+    grown: int = 0
+    expired: int = 0
+    decisions: List[PoolDecision] = field(default_factory=list)
+
+    @property
+    def mean_wait_ms(self) -> float:
+        """Average wait per waiting checkout."""
+        return self.wait_ms / self.waits if self.waits else 0.0
 
 
 class ConnectionPool:
@@ -64,28 +208,134 @@ class ConnectionPool:
 
     Manages a pool of database connections for efficient resource utilization
     and prevents connection exhaustion in multi-threaded environments.
+    In a forked child the pool starts over: connections and lock inherited
+    from the parent are discarded on first use.
+
+    The pool adapts its size between min_size and max_size. A checkout that
+    finds every connection busy waits for one to be returned; once it has
+    waited grow_after seconds the pool grows by one connection, up to
+    max_size, and only when max_size connections stay busy for timeout
+    seconds does the checkout fail. Idle connections are reused most
+    recently returned first, so the surplus ages out: connections idle for
+    longer than idle_ttl are closed (down to min_size) and the size falls
+    back towards pool_size. Decisions and counters are kept in stats().
 
     Attributes:
         db_path: Path to SQLite database file
-        pool_size: Maximum number of connections in pool
+        pool_size: Base number of connections the pool may open
+        size: Number of connections the pool may open now
+        min_size: Connections kept open however long they idle
+        max_size: Ceiling the pool may grow to
+        idle_ttl: Seconds before an idle connection is closed (None: never)
+        grow_after: Seconds a checkout waits before the pool grows
         timeout: Connection timeout in seconds
+        profiler: Optional QueryProfiler recording every statement
+        statement_cache: Prepared statements cached per connection
+        uri: Whether db_path is an SQLite URI filename
     """
 
-    def __init__(self, db_path: Path, pool_size: int = 5, timeout: float = 30.0):
+    # Sizing decisions kept for stats()
+    DECISION_HISTORY = 32
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        pool_size: int = 5,
+        timeout: float = 30.0,
+        profiler: Optional[QueryProfiler] = None,
+        statement_cache: int = 1024,
+        uri: bool = False,
+        min_size: int = 1,
+        max_size: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        grow_after: float = 0.05,
+    ):
         """
         Initialize connection pool.
 
         Args:
             db_path: Path to SQLite database file
-            pool_size: Maximum number of connections (default: 5)
-            timeout: Connection timeout in seconds (default: 30.0)
+            pool_size: Base number of connections (default: 5)
+            timeout: Connection timeout in seconds, also the longest a
+                checkout waits for a connection (default: 30.0)
+            profiler: Optional QueryProfiler; connections are created with
+                statement-level instrumentation when set (default: None)
+            statement_cache: Prepared statements cached per connection.
+                Table names are part of the SQL text, so every symbol adds
+                its own statements; the sqlite3 default of 128 would
+                re-prepare them on each pass over a large universe
+                (default: 1024)
+            uri: Open db_path as a URI filename, e.g. an in-memory
+                database shared between connections (default: False)
+            min_size: Connections kept open however long they idle
+                (default: 1)
+            max_size: Ceiling the pool may grow to under sustained waits
+                (default: pool_size, a fixed-size pool)
+            idle_ttl: Seconds after which an idle connection is closed
+                (default: None, never)
+            grow_after: Seconds a checkout waits before the pool grows
+                (default: 0.05)
+
+        Raises:
+            ValueError: If min_size <= pool_size <= max_size does not hold
         """
+        max_size = pool_size if max_size is None else max_size
+        if not 0 <= min_size <= pool_size <= max_size:
+            raise ValueError(
+                f"Pool sizes must satisfy 0 <= min_size <= pool_size <= max_size, "
+                f"got {min_size}, {pool_size}, {max_size}"
+            )
         self.db_path = db_path
         self.pool_size = pool_size
+        self.size = pool_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.grow_after = grow_after
         self.timeout = timeout
+        self.profiler = profiler
+        self.statement_cache = statement_cache
+        self.uri = uri
+        # (connection, returned at), most recently returned last
         self._pool: deque = deque()
         self._lock = Lock()
+        self._available = Condition(self._lock)
         self._created_connections = 0
+        self._in_use = 0
+        self._last_activity = time.monotonic()
+        self._stats = PoolStats()
+        self._decisions: deque = deque(maxlen=self.DECISION_HISTORY)
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        """Discard the parent's connections and lock after a fork()."""
+        if self._pid == os.getpid():
+            return
+        # The lock may have been held by a parent thread that does not
+        # exist in this process
+        self._lock = Lock()
+        self._available = Condition(self._lock)
+        _INHERITED_CONNECTIONS.extend(conn for conn, _ in self._pool)
+        self._pool = deque()
+        self._created_connections = 0
+        self._in_use = 0
+        self.size = self.pool_size
+        self._stats = PoolStats()
+        self._decisions.clear()
+        self._pid = os.getpid()
+        logger.debug(f"Pool of {self.db_path} reset in forked process {self._pid}")
+
+    @property
+    def in_use(self) -> int:
+        """Number of connections currently checked out."""
+        return self._in_use
+
+    @property
+    def idle_for(self) -> float:
+        """Seconds since a connection was last checked out or returned."""
+        if self._in_use:
+            return 0.0
+        return time.monotonic() - self._last_activity
 
     def _create_connection(self) -> sqlite3.Connection:
         """
@@ -94,43 +344,159 @@ class ConnectionPool:
         Returns:
             Configured SQLite connection
         """
-        conn = sqlite3.connect(self.db_path, timeout=self.timeout)
+        # The pool hands each connection to one thread at a time, so
+        # connections may be created and used by different threads
+        if self.profiler is not None:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                check_same_thread=False,
+                factory=ProfiledConnection,
+                cached_statements=self.statement_cache,
+                uri=self.uri,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=self.timeout,
+                check_same_thread=False,
+                cached_statements=self.statement_cache,
+                uri=self.uri,
+            )
         # Optimize for performance
+        # Only affects new databases, and must precede the switch to WAL.
+        # Setting it takes the write lock, so existing databases are left
+        # alone: a new reader would otherwise wait for the current writer
+        if conn.execute("PRAGMA page_count").fetchone()[0] == 0:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # Allow shrinking later
         conn.execute("PRAGMA journal_mode=WAL")  # Write-ahead logging
         conn.execute("PRAGMA synchronous=NORMAL")  # Balance safety/speed
         conn.execute("PRAGMA cache_size=10000")  # Larger cache
         conn.execute("PRAGMA temp_store=MEMORY")  # Use memory for temp tables
+        if self.profiler is not None:
+            # Attached after the pragmas so connection setup is not profiled
+            conn.profiler = self.profiler
         return conn
 
     def get_connection(self) -> sqlite3.Connection:
         """
         Get a connection from the pool or create a new one.
 
+        Waits for a returned connection when all are in use, growing the
+        pool by one once the wait reaches grow_after (up to max_size).
+
         Returns:
             SQLite connection from pool
 
         Raises:
-            RuntimeError: If pool is exhausted and max connections reached
+            RuntimeError: If no connection became available within timeout
         """
+        self._check_fork()
         with self._lock:
-            # Try to get from pool
-            if self._pool:
-                conn = self._pool.popleft()
-                # Verify connection is still valid
-                try:
-                    conn.execute("SELECT 1")
-                    return conn
-                except sqlite3.Error:
-                    # Connection is dead, create a new one
-                    self._created_connections -= 1
-
-            # Create new connection if under limit
-            if self._created_connections < self.pool_size:
-                conn = self._create_connection()
-                self._created_connections += 1
-                return conn
-
-            raise RuntimeError(f"Connection pool exhausted (size: {self.pool_size})")
+            self._expire_idle()
+            waiting_since = None
+            while True:
+                # Most recently returned first: the surplus ages out
+                while self._pool:
+                    conn, _ = self._pool.pop()
+                    # Verify connection is still valid
+                    try:
+                        # Plain cursor keeps the probe out of the query profiler
+                        conn.cursor(sqlite3.Cursor).execute("SELECT 1")
+                        return self._checked_out(conn, waiting_since)
+                    except sqlite3.Error:
+                        # Connection is dead, create a new one
+                        self._created_connections -= 1
+
+                # Create new connection if under limit
+                if self._created_connections < self.size:
+                    conn = self._create_connection()
+                    self._created_connections += 1
+                    return self._checked_out(conn, waiting_since)
+
+                now = time.monotonic()
+                if waiting_since is None:
+                    waiting_since = now
+                waited = now - waiting_since
+                if waited >= self.grow_after and self.size < self.max_size:
+                    self.size += 1
+                    self._stats.grown += 1
+                    self._decide("grow", f"checkout waited {waited * 1000:.0f}ms")
+                    continue
+                if waited >= self.timeout:
+                    self._stats.timeouts += 1
+                    raise RuntimeError(
+                        f"Connection pool exhausted (size: {self.size}, "
+                        f"waited {waited:.1f}s)"
+                    )
+                wait = self.timeout - waited
+                if self.size < self.max_size:
+                    wait = min(wait, self.grow_after - waited)
+                self._available.wait(wait)
+
+    def _checked_out(
+        self, conn: sqlite3.Connection, waiting_since: Optional[float]
+    ) -> sqlite3.Connection:
+        """Record a checkout for idle tracking and stats (caller holds the lock)."""
+        self._in_use += 1
+        self._last_activity = time.monotonic()
+        stats = self._stats
+        stats.checkouts += 1
+        if waiting_since is not None:
+            waited_ms = (self._last_activity - waiting_since) * 1000
+            stats.waits += 1
+            stats.wait_ms += waited_ms
+            stats.max_wait_ms = max(stats.max_wait_ms, waited_ms)
+        return conn
+
+    def _decide(self, action: Literal["grow", "shrink"], reason: str):
+        """Record and log a sizing decision (caller holds the lock)."""
+        decision = PoolDecision(
+            time.time(), action, self.size, self._created_connections, reason
+        )
+        self._decisions.append(decision)
+        logger.info(
+            f"Pool of {self.db_path} {action}s to {self.size} connections "
+            f"({decision.open} open): {reason}"
+        )
+
+    def _expire_idle(self) -> int:
+        """Close connections idle past idle_ttl (caller holds the lock)."""
+        if self.idle_ttl is None or not self._pool:
+            return 0
+        cutoff = time.monotonic() - self.idle_ttl
+        closed = 0
+        # Oldest first, never below min_size
+        while (
+            self._pool
+            and self._pool[0][1] < cutoff
+            and self._created_connections > self.min_size
+        ):
+            conn, _ = self._pool.popleft()
+            conn.close()
+            self._created_connections -= 1
+            closed += 1
+        if closed:
+            self._stats.expired += closed
+            self.size = max(self.pool_size, self.size - closed)
+            self._decide(
+                "shrink", f"closed {closed} connections idle over {self.idle_ttl:g}s"
+            )
+        return closed
+
+    def expire_idle(self) -> int:
+        """
+        Close connections idle for longer than idle_ttl now.
+
+        Checkouts and returns do this as they go; call it (or let
+        run_maintenance() do so) to shed connections of a pool nobody uses.
+
+        Returns:
+            Number of connections closed
+        """
+        self._check_fork()
+        with self._lock:
+            return self._expire_idle()
 
     def return_connection(self, conn: sqlite3.Connection):
         """
@@ -139,20 +505,563 @@ class ConnectionPool:
         Args:
             conn: Connection to return to pool
         """
+        self._check_fork()
         with self._lock:
-            if len(self._pool) < self.pool_size:
-                self._pool.append(conn)
+            self._in_use = max(self._in_use - 1, 0)
+            self._last_activity = time.monotonic()
+            if len(self._pool) < self.size:
+                self._pool.append((conn, self._last_activity))
             else:
                 conn.close()
                 self._created_connections -= 1
+            # A waiting checkout can take this connection or open its own
+            self._available.notify()
+            self._expire_idle()
+
+    def stats(self) -> PoolStats:
+        """
+        Snapshot of the pool's size, counters and recent decisions.
+
+        Returns:
+            PoolStats
+        """
+        self._check_fork()
+        with self._lock:
+            return replace(
+                self._stats,
+                size=self.size,
+                min_size=self.min_size,
+                max_size=self.max_size,
+                open=self._created_connections,
+                idle=len(self._pool),
+                in_use=self._in_use,
+                decisions=list(self._decisions),
+            )
 
     def close_all(self):
         """Close all connections in the pool."""
+        self._check_fork()
         with self._lock:
             while self._pool:
-                conn = self._pool.popleft()
+                conn, _ = self._pool.popleft()
                 conn.close()
-            self._created_connections = 0
+                self._created_connections -= 1
+            self._available.notify_all()
+
+
+class InvalidDataError(ValueError):
+    """Rows failed ValidationRules(on_invalid="raise"); nothing was written."""
+
+
+@dataclass(frozen=True)
+class ValidationRules:
+    """
+    Validation applied to OHLCV data before it is written.
+
+    Attributes:
+        check_ohlc: Flag rows where high < low/open/close or low > open/close
+        check_volume: Flag rows with negative volume
+        on_invalid: What to do with flagged rows:
+            - "drop": Remove them with a warning (default)
+            - "raise": Raise InvalidDataError (a ValueError)
+            - "keep": Keep them with a warning
+        drop_duplicates: Remove rows sharing a datetime
+        keep: Which duplicate to keep, "first" or "last" (default)
+        sort: Sort rows by datetime
+
+    Example:
+        # Reject the whole batch instead of silently dropping bad bars
+        strict = ValidationRules(on_invalid="raise")
+        handler.inject_data("NIFTY", df, rules=strict)
+    """
+
+    check_ohlc: bool = True
+    check_volume: bool = False
+    on_invalid: Literal["drop", "raise", "keep"] = "drop"
+    drop_duplicates: bool = True
+    keep: Literal["first", "last"] = "last"
+    sort: bool = True
+
+    def __post_init__(self):
+        """Validate rule options."""
+        if self.on_invalid not in ("drop", "raise", "keep"):
+            raise ValueError(f"Invalid on_invalid option: {self.on_invalid}")
+        if self.keep not in ("first", "last"):
+            raise ValueError(f"Invalid keep option: {self.keep}")
+
+
+def _report_invalid(symbol: str, invalid_count: int, rules: ValidationRules):
+    """Log or raise for rows flagged by the validation rules."""
+    if not invalid_count:
+        return
+    if rules.on_invalid == "raise":
+        raise InvalidDataError(
+            f"Found {invalid_count} rows with invalid OHLC/volume values for {symbol}"
+        )
+    logger.warning(f"Found {invalid_count} rows with invalid OHLC relationships")
+
+
+def _validate_pandas(
+    data: pd.DataFrame, symbol: str, rules: ValidationRules
+) -> pd.DataFrame:
+    """
+    Validate, deduplicate and sort a pandas OHLCV frame.
+
+    Masks are fused into one boolean buffer on the underlying numpy arrays and
+    dedup/sort are resolved to a single row index, so the frame is copied
+    exactly once (by the final take) regardless of how many rules apply.
+
+    Args:
+        data: Frame with at least the required OHLCV columns
+        symbol: Symbol name used in log messages
+        rules: Validation rules to apply
+
+    Returns:
+        New frame with datetime formatted as "YYYY-MM-DD HH:MM:SS" strings
+    """
+    datetimes = data["datetime"]
+    if not pd.api.types.is_datetime64_any_dtype(datetimes):
+        datetimes = pd.to_datetime(datetimes)
+
+    n_rows = len(data)
+    positions = None
+
+    if rules.check_ohlc or rules.check_volume:
+        invalid = np.zeros(n_rows, dtype=bool)
+        scratch = np.empty(n_rows, dtype=bool)
+        if rules.check_ohlc:
+            high = data["high"].to_numpy()
+            low = data["low"].to_numpy()
+            for lhs, rhs in (
+                (high, low),
+                (high, data["open"].to_numpy()),
+                (high, data["close"].to_numpy()),
+            ):
+                np.less(lhs, rhs, out=scratch)
+                invalid |= scratch
+            for rhs in (data["open"].to_numpy(), data["close"].to_numpy()):
+                np.greater(low, rhs, out=scratch)
+                invalid |= scratch
+        if rules.check_volume:
+            np.less(data["volume"].to_numpy(), 0, out=scratch)
+            invalid |= scratch
+
+        invalid_count = int(invalid.sum())
+        _report_invalid(symbol, invalid_count, rules)
+        if invalid_count and rules.on_invalid == "drop":
+            positions = np.flatnonzero(~invalid)
+
+    if rules.drop_duplicates or rules.sort:
+        if positions is None:
+            positions = np.arange(n_rows)
+        keys = pd.DatetimeIndex(datetimes).asi8[positions]
+
+        if rules.drop_duplicates:
+            # np.unique returns sorted keys, so dedup and sort are one pass
+            if rules.keep == "last":
+                _, first_seen = np.unique(keys[::-1], return_index=True)
+                order = len(keys) - 1 - first_seen
+            else:
+                _, order = np.unique(keys, return_index=True)
+            dup_count = len(keys) - len(order)
+            if dup_count:
+                logger.warning(f"Removing {dup_count} duplicate datetime entries")
+            if not rules.sort:
+                order.sort()
+        else:
+            order = np.argsort(keys, kind="stable")
+        positions = positions[order]
+
+    if positions is None:
+        data = data.copy()
+    else:
+        data = data.take(positions)
+        datetimes = datetimes.take(positions)
+
+    data["datetime"] = datetimes.dt.strftime(DATETIME_FORMAT).array
+    return data
+
+
+def _validate_polars(
+    data: pl.DataFrame, symbol: str, rules: ValidationRules
+) -> pl.DataFrame:
+    """
+    Validate, deduplicate and sort a polars OHLCV frame lazily.
+
+    The whole pipeline (datetime parsing, fused OHLC/volume filter, dedup,
+    sort, datetime formatting) is one lazy query plan, so polars materializes
+    only the final frame.
+
+    Args:
+        data: Frame with at least the required OHLCV columns
+        symbol: Symbol name used in log messages
+        rules: Validation rules to apply
+
+    Returns:
+        New frame with datetime formatted as "YYYY-MM-DD HH:MM:SS" strings
+    """
+    frame = data.lazy()
+
+    dtype = data.schema["datetime"]
+    if dtype == pl.String:
+        frame = frame.with_columns(pl.col("datetime").str.to_datetime())
+    elif dtype == pl.Date:
+        frame = frame.with_columns(pl.col("datetime").cast(pl.Datetime))
+
+    invalid_count = 0
+    if rules.check_ohlc or rules.check_volume:
+        checks = []
+        if rules.check_ohlc:
+            high, low = pl.col("high"), pl.col("low")
+            checks += [
+                high < low,
+                high < pl.col("open"),
+                high < pl.col("close"),
+                low > pl.col("open"),
+                low > pl.col("close"),
+            ]
+        if rules.check_volume:
+            checks.append(pl.col("volume") < 0)
+        invalid = pl.any_horizontal(checks).fill_null(False)
+
+        # Streaming count over the raw columns, nothing is materialized
+        invalid_count = data.lazy().select(invalid.sum()).collect().item()
+        _report_invalid(symbol, invalid_count, rules)
+        if invalid_count and rules.on_invalid == "drop":
+            frame = frame.filter(~invalid)
+        else:
+            invalid_count = 0
+
+    if rules.sort:
+        frame = frame.sort("datetime", maintain_order=True)
+        if rules.drop_duplicates:
+            # Duplicates are adjacent after a stable sort: compare neighbours
+            # instead of hashing the whole column
+            neighbour = pl.col("datetime").shift(-1 if rules.keep == "last" else 1)
+            frame = frame.filter(pl.col("datetime").ne_missing(neighbour))
+    elif rules.drop_duplicates:
+        frame = frame.unique(subset="datetime", keep=rules.keep, maintain_order=True)
+
+    frame = frame.with_columns(pl.col("datetime").dt.strftime(DATETIME_FORMAT))
+    result = frame.collect()
+
+    dup_count = data.height - invalid_count - result.height
+    if dup_count:
+        logger.warning(f"Removing {dup_count} duplicate datetime entries")
+    return result
+
+
+def _validate_arrow(
+    batch: pa.RecordBatch, symbol: str, rules: ValidationRules
+) -> pa.RecordBatch:
+    """
+    Validate, deduplicate and sort one Arrow record batch.
+
+    Dedup and sort apply within the batch only; streaming callers are
+    expected to produce batches in datetime order.
+
+    Args:
+        batch: Record batch with at least the required OHLCV columns
+        symbol: Symbol name used in log messages
+        rules: Validation rules to apply
+
+    Returns:
+        Record batch with datetime formatted as "YYYY-MM-DD HH:MM:SS" strings
+    """
+    datetimes = batch.column("datetime")
+    if pa.types.is_date(datetimes.type):
+        datetimes = datetimes.cast(pa.timestamp("s"))
+    if pa.types.is_timestamp(datetimes.type):
+        if datetimes.type.tz is not None:
+            datetimes = pc.local_timestamp(datetimes)
+        # A second-resolution cast to string renders "YYYY-MM-DD HH:MM:SS"
+        # and is an order of magnitude faster than pc.strftime
+        datetimes = datetimes.cast(pa.timestamp("s"), safe=False).cast(pa.string())
+    batch = batch.set_column(
+        batch.schema.get_field_index("datetime"), "datetime", datetimes
+    )
+
+    if rules.check_ohlc or rules.check_volume:
+        checks = []
+        if rules.check_ohlc:
+            high, low = batch.column("high"), batch.column("low")
+            checks += [
+                pc.less(high, low),
+                pc.less(high, batch.column("open")),
+                pc.less(high, batch.column("close")),
+                pc.greater(low, batch.column("open")),
+                pc.greater(low, batch.column("close")),
+            ]
+        if rules.check_volume:
+            checks.append(pc.less(batch.column("volume"), 0))
+        invalid = checks[0]
+        for check in checks[1:]:
+            invalid = pc.or_kleene(invalid, check)
+        invalid = pc.fill_null(invalid, False)
+
+        invalid_count = pc.sum(invalid).as_py() or 0
+        _report_invalid(symbol, invalid_count, rules)
+        if invalid_count and rules.on_invalid == "drop":
+            batch = batch.filter(pc.invert(invalid))
+
+    if rules.sort and batch.num_rows:
+        # Arrow's sort is stable, so duplicates stay in arrival order
+        batch = batch.take(pc.sort_indices(batch, [("datetime", "ascending")]))
+        if rules.drop_duplicates:
+            datetimes = batch.column("datetime")
+            if rules.keep == "last":
+                keep = pc.not_equal(datetimes[:-1], datetimes[1:])
+                keep = pa.concat_arrays([keep, pa.array([True])])
+            else:
+                keep = pc.not_equal(datetimes[1:], datetimes[:-1])
+                keep = pa.concat_arrays([pa.array([True]), keep])
+            dup_count = batch.num_rows - (pc.sum(keep).as_py() or 0)
+            if dup_count:
+                logger.warning(f"Removing {dup_count} duplicate datetime entries")
+                batch = batch.filter(keep)
+    elif rules.drop_duplicates and batch.num_rows:
+        deduped = pl.from_arrow(batch).unique(
+            subset="datetime", keep=rules.keep, maintain_order=True
+        )
+        dup_count = batch.num_rows - deduped.height
+        if dup_count:
+            logger.warning(f"Removing {dup_count} duplicate datetime entries")
+            batch = deduped.to_arrow().to_batches()[0]
+
+    return batch
+
+
+def _arrow_sql_type(arrow_type: pa.DataType) -> str:
+    """Map an Arrow type to the SQLite column type pandas.to_sql would use."""
+    if pa.types.is_floating(arrow_type):
+        return "REAL"
+    if pa.types.is_integer(arrow_type) or pa.types.is_boolean(arrow_type):
+        return "INTEGER"
+    return "TEXT"
+
+
+def _is_dataframe(obj, backend: Literal["pandas", "polars"]) -> bool:
+    """
+    Check for a DataFrame of a backend without importing that backend.
+
+    An object cannot be a polars DataFrame unless polars was imported by
+    whoever built it, so polars-only callers never pay for importing pandas
+    (and vice versa). A backend another thread is still importing has no
+    DataFrame attribute yet, and no instances either.
+    """
+    frame_type = getattr(sys.modules.get(backend), "DataFrame", None)
+    return frame_type is not None and isinstance(obj, frame_type)
+
+
+def _read_typed_frame(
+    conn: sqlite3.Connection, query: str, params: tuple, dtypes: Dict[str, str]
+) -> pd.DataFrame:
+    """
+    Run a query and build each column directly in its requested dtype.
+
+    pandas.read_sql_query materializes float64/int64 blocks and astype then
+    copies them again; here every column goes from the fetched rows straight
+    into one array of its final dtype, and the DataFrame wraps those arrays
+    without consolidating them.
+
+    Args:
+        conn: Database connection
+        query: SQL query
+        params: Query parameters
+        dtypes: Mapping of column name to numpy dtype
+
+    Returns:
+        DataFrame with the query's columns
+    """
+    cursor = conn.execute(query, params)
+    names = [d[0] for d in cursor.description]
+    rows = cursor.fetchall()
+    # One object array of the row values (pointers only); each column is
+    # then cast from its strided view. Transposing with zip(*rows) instead
+    # allocates a tuple per column value and spends most of its time in GC.
+    cells = (
+        np.array(rows, dtype=object)
+        if rows
+        else np.empty((0, len(names)), dtype=object)
+    )
+    del rows
+
+    data = {}
+    for i, name in enumerate(names):
+        values = cells[:, i]
+        dtype = dtypes.get(name)
+        if name == "datetime":
+            # Parsed straight from the fetched strings, no string column
+            data[name] = pd.to_datetime(values, format=DATETIME_FORMAT)
+        elif dtype is None:
+            data[name] = pd.Series(values).infer_objects()
+        else:
+            try:
+                data[name] = values.astype(dtype)
+            except (TypeError, ValueError, OverflowError) as e:
+                # NULLs in an integer column, or values out of range: keep
+                # the inferred dtype for this column rather than failing
+                logger.warning(
+                    f"Column {name} kept its inferred dtype instead of {dtype}: {e}"
+                )
+                data[name] = pd.Series(values).infer_objects()
+    return pd.DataFrame(data, copy=False)
+
+
+def _time_of_day(value: Union[str, datetime.time], name: str) -> str:
+    """
+    Normalize a time of day to the stored "HH:MM:SS" text.
+
+    Args:
+        value: "HH:MM", "HH:MM:SS" or datetime.time
+        name: Argument name for error messages
+
+    Returns:
+        Time of day as "HH:MM:SS"
+
+    Raises:
+        ValueError: If the string is not a valid time
+    """
+    if isinstance(value, datetime.time):
+        return value.strftime("%H:%M:%S")
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            return datetime.datetime.strptime(value, fmt).strftime("%H:%M:%S")
+        except ValueError:
+            continue
+    raise ValueError(f"{name} must be 'HH:MM' or 'HH:MM:SS', got '{value}'")
+
+
+@contextmanager
+def _deadline(conn: sqlite3.Connection, timeout: Optional[float]):
+    """
+    Interrupt the statements run on conn once timeout seconds have passed.
+
+    A progress handler checks the clock every DEADLINE_CHECK_OPS SQLite
+    instructions and aborts the running statement past the deadline. The
+    connection stays usable: the read transaction is rolled back by
+    whoever owns the connection, as after any failed read.
+
+    SQLite counts instructions per statement, so a loop of short
+    statements never reaches the handler; such loops call the yielded
+    check() between statements.
+
+    Args:
+        conn: Connection the statements run on
+        timeout: Seconds allowed (default: no limit)
+
+    Yields:
+        check(): raises QueryTimeoutError once the deadline has passed
+
+    Raises:
+        QueryTimeoutError: If a statement was interrupted at the deadline
+        ValueError: If timeout is not positive
+    """
+    if timeout is None:
+        yield lambda: None
+        return
+    if timeout <= 0:
+        raise ValueError("timeout must be positive")
+
+    deadline = time.monotonic() + timeout
+
+    def check():
+        if time.monotonic() > deadline:
+            raise QueryTimeoutError(f"Query cancelled after its {timeout}s timeout")
+
+    conn.set_progress_handler(lambda: time.monotonic() > deadline, DEADLINE_CHECK_OPS)
+    try:
+        yield check
+    except Exception as e:
+        # pandas re-raises SQLite errors as its own DatabaseError
+        if "interrupted" in str(e) and time.monotonic() > deadline:
+            raise QueryTimeoutError(
+                f"Query cancelled after its {timeout}s timeout"
+            ) from e
+        raise
+    finally:
+        conn.set_progress_handler(None, 0)
+
+
+def _session_filters(
+    time_from: Optional[Union[str, datetime.time]],
+    time_to: Optional[Union[str, datetime.time]],
+    weekdays: Optional[Sequence[int]],
+) -> Tuple[List[str], List[str]]:
+    """
+    SQL conditions for time-of-day and weekday filters.
+
+    Args:
+        time_from: Earliest time of day (inclusive)
+        time_to: Latest time of day (inclusive)
+        weekdays: Days of the week, Monday=0 ... Sunday=6
+
+    Returns:
+        Tuple of (conditions, parameters)
+
+    Raises:
+        ValueError: If a time is malformed, time_from is after time_to, or
+            a weekday is outside 0-6
+    """
+    conditions, params = [], []
+    start = _time_of_day(time_from, "time_from") if time_from is not None else None
+    end = _time_of_day(time_to, "time_to") if time_to is not None else None
+    if start is not None and end is not None and start > end:
+        raise ValueError(f"time_from {start} is after time_to {end}")
+    if start is not None:
+        conditions.append(f"{TIME_OF_DAY_SQL} >= ?")
+        params.append(start)
+    if end is not None:
+        conditions.append(f"{TIME_OF_DAY_SQL} <= ?")
+        params.append(end)
+
+    if weekdays is not None:
+        days = sorted(set(weekdays))
+        if not days or days[0] < 0 or days[-1] > 6:
+            raise ValueError(
+                f"weekdays must be non-empty and within 0-6, got {weekdays}"
+            )
+        # strftime('%w') counts from Sunday=0
+        conditions.append(f"strftime('%w', datetime) IN ({', '.join('?' * len(days))})")
+        params.extend(str((day + 1) % 7) for day in days)
+    return conditions, params
+
+
+def _day(value: Union[str, datetime.date]) -> datetime.date:
+    """Parse a "YYYY-MM-DD" string; dates (and datetimes) pass through."""
+    if isinstance(value, str):
+        return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+    return value
+
+
+def _quote(identifier: str) -> str:
+    """Quote a table or column name for use in SQL."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _sql_type(dtype) -> str:
+    """Map a polars dtype to the SQLite column type pandas.to_sql would use."""
+    if dtype.is_float():
+        return "REAL"
+    if dtype.is_integer() or dtype == pl.Boolean:
+        return "INTEGER"
+    return "TEXT"
+
+
+def _pandas_sql_type(dtype) -> str:
+    """Map a pandas dtype to the SQLite column type pandas.to_sql would use."""
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return "INTEGER"
+    return "TEXT"
+
+
+def _pandas_column_values(series: pd.Series) -> list:
+    """Python values of a pandas column, missing values as None (NULL)."""
+    if series.hasnans:
+        series = series.astype(object).where(series.notna(), None)
+    return series.tolist()
 
 
 class DataHandler:
@@ -167,46 +1076,385 @@ class DataHandler:
         db_path: Path to SQLite database file
         pool: Connection pool manager
         market_contracts: MarketContracts instance for ticker generation
+        profiler: QueryProfiler recording every statement (None unless profiling)
+        validation_rules: Default ValidationRules applied by inject_data
+        lease: WriterLease serializing transactions across processes
+            (None unless writer_lease is enabled)
+        memory_uri: URI of the in-memory database of an open_in_memory()
+            handler (None for file databases, whose db_path is the database)
+
+    Handlers pickle as their configuration (path, profiling, validation
+    rules, writer lease, pool settings) and reopen lazily where they are
+    unpickled, so they can be passed to ProcessPoolExecutor workers.
     """
 
-    def __init__(self, db_path: Union[str, Path]):
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        profile: bool = False,
+        slow_query_ms: float = 100.0,
+        profile_capacity: int = 1000,
+        validation_rules: Optional[ValidationRules] = None,
+        writer_lease: Optional[bool] = None,
+        lease_timeout: Optional[float] = None,
+    ):
         """
         Initialize DataHandler with database path.
 
+        The connection pool is sized from the environment: DB_POOL_SIZE
+        (base size, default 5), DB_POOL_MIN_SIZE (default 1),
+        DB_POOL_MAX_SIZE (default 4 x DB_POOL_SIZE) and DB_POOL_IDLE_TTL
+        (seconds, default 300; 0 never closes idle connections).
+
         Args:
             db_path: Path to SQLite database file
+            profile: Record every SQL statement (text, parameters, rows,
+                elapsed time and, for queries, the EXPLAIN QUERY PLAN) in a
+                ring buffer readable via query_log() (default: False)
+            slow_query_ms: Statements at least this slow are flagged and
+                logged (default: 100.0)
+            profile_capacity: Number of statements kept in the ring buffer
+                (default: 1000)
+            validation_rules: Default ValidationRules for inject_data
+                (default: ValidationRules())
+            writer_lease: Take a cross-process file lock around every
+                transaction() so only one writer runs at a time
+                (default: DB_WRITER_LEASE environment variable, else False)
+            lease_timeout: Seconds to wait for the writer lease
+                (default: DB_TIMEOUT)
         """
+        _load_env()
         self.db_path = Path(db_path)
+        self.validation_rules = validation_rules or ValidationRules()
+        self.profiler = (
+            QueryProfiler(capacity=profile_capacity, slow_query_ms=slow_query_ms)
+            if profile
+            else None
+        )
+        pool_size = int(os.getenv("DB_POOL_SIZE", 5))
+        idle_ttl = float(os.getenv("DB_POOL_IDLE_TTL", 300.0))
         self.pool = ConnectionPool(
             self.db_path,
-            pool_size=int(os.getenv("DB_POOL_SIZE", 5)),
+            pool_size=pool_size,
             timeout=float(os.getenv("DB_TIMEOUT", 30.0)),
+            profiler=self.profiler,
+            min_size=min(int(os.getenv("DB_POOL_MIN_SIZE", 1)), pool_size),
+            max_size=max(int(os.getenv("DB_POOL_MAX_SIZE", 4 * pool_size)), pool_size),
+            # DB_POOL_IDLE_TTL=0 keeps idle connections open forever
+            idle_ttl=idle_ttl if idle_ttl > 0 else None,
+        )
+        self._market_contracts: Optional[MarketContracts] = None
+        # (schema_version, symbols) of the last sqlite_master scan
+        self._symbols_cache: Optional[tuple] = None
+        # Indexes queued by _ensure_index while a bulk load defers them:
+        # {index name: (symbol, suffix, columns_sql)}, None when not deferring
+        self._deferred_indexes: Optional[Dict[str, tuple]] = None
+        self.memory_uri: Optional[str] = None
+        # Connection keeping an in-memory database alive between checkouts
+        self._memory_anchor: Optional[sqlite3.Connection] = None
+
+        if writer_lease is None:
+            writer_lease = os.getenv("DB_WRITER_LEASE", "0").lower() in (
+                "1",
+                "true",
+                "yes",
+            )
+        self.lease = (
+            WriterLease(self.db_path, timeout=lease_timeout or self.pool.timeout)
+            if writer_lease
+            else None
         )
-        self.market_contracts = MarketContracts()
 
         # Ensure database directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         logger.info(f"DataHandler initialized with database: {self.db_path}")
 
+    @classmethod
+    def shared(cls, db_path: Union[str, Path], **kwargs) -> "DataHandler":
+        """
+        Process-wide DataHandler for a database file.
+
+        Handlers are keyed by the resolved path, so every caller asking for
+        the same file shares one connection pool, one symbol cache and one
+        writer lease. kwargs are only used when the handler is first
+        created; later calls return the existing handler unchanged.
+
+        Args:
+            db_path: Path to SQLite database file
+            **kwargs: DataHandler arguments for the first creation
+
+        Returns:
+            Shared DataHandler
+        """
+        key = Path(db_path).resolve()
+        with _SHARED_LOCK:
+            handler = _SHARED_HANDLERS.get(key)
+            if handler is None:
+                handler = cls(key, **kwargs)
+                _SHARED_HANDLERS[key] = handler
+            return handler
+
+    @classmethod
+    def release_shared(cls, db_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        Drop shared handlers and close their pools.
+
+        Args:
+            db_path: Database to release (default: all shared handlers)
+        """
+        with _SHARED_LOCK:
+            if db_path is None:
+                handlers = list(_SHARED_HANDLERS.values())
+                _SHARED_HANDLERS.clear()
+            else:
+                handler = _SHARED_HANDLERS.pop(Path(db_path).resolve(), None)
+                handlers = [handler] if handler is not None else []
+        for handler in handlers:
+            handler.pool.close_all()
+
+    @classmethod
+    def open_in_memory(
+        cls,
+        source_db: Union[str, Path],
+        symbols: Optional[List[str]] = None,
+        date_range: Optional[
+            Tuple[
+                Optional[Union[str, datetime.date]], Optional[Union[str, datetime.date]]
+            ]
+        ] = None,
+        shared_cache: bool = False,
+        **kwargs,
+    ) -> "DataHandler":
+        """
+        Load a database, or a slice of it, into memory for backtests.
+
+        Every method of the returned handler works as on a file handler, but
+        runs against RAM: nothing reads the source again, and writes stay in
+        memory. Without symbols or date_range the whole database is copied
+        with the backup API; otherwise the selected tables, rows and indexes
+        are copied by INSERT ... SELECT from a read-only connection to the
+        source. The in-memory database lives as long as the handler.
+
+        Pooled connections reach the database through a URI, so threads
+        using the handler share one copy. By default that is the memdb VFS,
+        with ordinary SQLite locking and a page cache per connection.
+        shared_cache=True opens a shared-cache URI instead: one page cache
+        for all connections (less memory with many reader threads) but
+        table-level locks, and a reader hitting a writer's lock fails with
+        "database table is locked" rather than waiting.
+
+        Args:
+            source_db: Database file to load
+            symbols: Symbols (tables) to load; missing symbols are skipped
+                (default: all)
+            date_range: (start, end) dates as "YYYY-MM-DD" or datetime.date,
+                both inclusive and either None for open-ended (default: all)
+            shared_cache: Share the database through a shared-cache URI
+                (default: False)
+            **kwargs: DataHandler arguments (profile, validation_rules, ...)
+
+        Returns:
+            DataHandler over the in-memory copy; db_path is source_db and
+            memory_uri the in-memory database
+
+        Raises:
+            FileNotFoundError: If source_db doesn't exist
+
+        Example:
+            handler = DataHandler.open_in_memory(
+                "index_data.db", symbols=["NIFTY"], date_range=("2024-01-01", None)
+            )
+            for day in days:
+                bars = handler.get_security_data("NIFTY", start_datetime=day)
+        """
+        source = Path(source_db)
+        if not source.is_file():
+            raise FileNotFoundError(f"Database not found: {source}")
+
+        name = f"quant_toolkit-{uuid.uuid4().hex}"
+        uri = (
+            f"file:{name}?mode=memory&cache=shared"
+            if shared_cache
+            else f"file:/{name}?vfs=memdb"
+        )
+        # Only the process holding it can write to an in-memory database
+        kwargs["writer_lease"] = False
+        handler = cls(source, **kwargs)
+        handler.memory_uri = uri
+        pool = handler.pool
+        handler.pool = ConnectionPool(
+            uri,
+            pool_size=pool.pool_size,
+            timeout=pool.timeout,
+            profiler=handler.profiler,
+            uri=True,
+            min_size=pool.min_size,
+            max_size=pool.max_size,
+            idle_ttl=pool.idle_ttl,
+        )
+        # The database is dropped with its last connection
+        handler._memory_anchor = anchor = sqlite3.connect(
+            uri, uri=True, check_same_thread=False
+        )
+
+        started = time.perf_counter()
+        if symbols is None and date_range is None:
+            reader = cls(source)
+            try:
+                # The copied header marks the database as WAL, which the
+                # memdb VFS can only open under an exclusive lock: take it,
+                # switch the copy out of WAL, then share the database again
+                anchor.execute("PRAGMA locking_mode=EXCLUSIVE")
+                reader._backup_to(anchor, pages_per_step=4096, progress=None, sleep=0.0)
+                anchor.execute("PRAGMA journal_mode=DELETE")
+                anchor.execute("PRAGMA locking_mode=NORMAL")
+                anchor.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            finally:
+                reader.pool.close_all()
+        else:
+            handler._copy_from(source, symbols, date_range)
+
+        db_bytes, _ = handler._database_sizes()
+        logger.info(
+            f"Loaded {source} into memory: {len(handler.get_available_securities())} "
+            f"symbols, {db_bytes / 1e6:.1f}MB in {time.perf_counter() - started:.2f}s"
+        )
+        return handler
+
+    def _copy_from(
+        self,
+        source: Path,
+        symbols: Optional[List[str]],
+        date_range: Optional[tuple],
+    ) -> None:
+        """
+        Copy selected tables, rows and indexes of source into memory.
+
+        The rows are copied by a read-only connection to source with the
+        in-memory database ATTACHed (ATTACHed the other way round, source
+        would be opened through the memdb VFS too).
+
+        Args:
+            source: Database file to copy from
+            symbols: Tables to copy (default: all)
+            date_range: (start, end) inclusive dates, either None (default: all)
+        """
+        start, end = date_range or (None, None)
+        bounds, params = [], []
+        if start is not None:
+            bounds.append("datetime >= ?")
+            params.append(_day(start).strftime("%Y-%m-%d"))
+        if end is not None:
+            # Whole days: every bar of the end date is included
+            bounds.append("datetime < ?")
+            params.append((_day(end) + datetime.timedelta(days=1)).strftime("%Y-%m-%d"))
+
+        reader = sqlite3.connect(
+            source.resolve().as_uri() + "?mode=ro", uri=True, timeout=self.pool.timeout
+        )
+        try:
+            # One read transaction: every table is copied as of one moment
+            reader.execute("BEGIN")
+            tables = dict(
+                reader.execute(
+                    "SELECT name, sql FROM sqlite_master "
+                    "WHERE type='table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'"
+                ).fetchall()
+            )
+            if symbols is not None:
+                missing = [symbol for symbol in symbols if symbol not in tables]
+                if missing:
+                    logger.warning(f"Symbols not found, not loaded: {missing}")
+                tables = {name: tables[name] for name in symbols if name in tables}
+            indexes = reader.execute(
+                "SELECT tbl_name, sql FROM sqlite_master "
+                "WHERE type='index' AND sql IS NOT NULL"
+            ).fetchall()
+
+            anchor = self._memory_anchor
+            with anchor:
+                for create_sql in tables.values():
+                    anchor.execute(create_sql)
+
+            reader.execute("ATTACH DATABASE ? AS memory", (self.memory_uri,))
+            for name in tables:
+                columns = {
+                    row[1]
+                    for row in reader.execute(f"PRAGMA table_info({_quote(name)})")
+                }
+                query = f"SELECT * FROM main.{_quote(name)}"
+                where = bool(bounds) and "datetime" in columns
+                if where:
+                    query += f" WHERE {' AND '.join(bounds)}"
+                if "datetime" in columns:
+                    query += " ORDER BY datetime"
+                reader.execute(
+                    f"INSERT INTO memory.{_quote(name)} {query}",
+                    params if where else (),
+                )
+            reader.commit()
+        finally:
+            reader.close()
+
+        # Indexes are built once, after the rows are in
+        with anchor:
+            for table, index_sql in indexes:
+                if table in tables:
+                    anchor.execute(index_sql)
+        self._symbols_cache = None
+
+    @property
+    def market_contracts(self) -> MarketContracts:
+        """MarketContracts for ticker generation, created on first use."""
+        if self._market_contracts is None:
+            self._market_contracts = MarketContracts()
+        return self._market_contracts
+
+    @market_contracts.setter
+    def market_contracts(self, value: MarketContracts) -> None:
+        self._market_contracts = value
+
     @contextmanager
     def transaction(self):
         """
         Context manager for database transactions.
 
-        Provides atomic operations with automatic commit/rollback.
+        Provides atomic operations with automatic commit/rollback. With a
+        writer lease, the lease is held for the whole block and the SQLite
+        write lock is taken up front (BEGIN IMMEDIATE), so writers from
+        other processes queue on the lease instead of failing with
+        "database is locked".
 
         Yields:
             SQLite connection with transaction started
 
+        Raises:
+            TimeoutError: If the writer lease was not granted in time
+
         Example:
             with handler.transaction() as conn:
                 handler.delete_old_data(symbol, conn=conn)
                 handler.inject_new_data(symbol, data, conn=conn)
                 # Automatically commits on success, rolls back on error
         """
+        if self.lease is None:
+            with self._transaction() as conn:
+                yield conn
+            return
+
+        with self.lease.hold():
+            with self._transaction(begin="BEGIN IMMEDIATE") as conn:
+                yield conn
+
+    @contextmanager
+    def _transaction(self, begin: str = "BEGIN"):
+        """Check out a connection, commit on success, roll back on error."""
         conn = self.pool.get_connection()
         try:
+            # Explicit: sqlite3 only opens one implicitly before DML, so
+            # CREATE TABLE/INDEX would otherwise commit on their own
+            conn.execute(begin)
             yield conn
             conn.commit()
         except Exception as e:
@@ -216,6 +1464,80 @@ class DataHandler:
         finally:
             self.pool.return_connection(conn)
 
+    @contextmanager
+    def _maintenance_connection(self):
+        """
+        Check out a pooled connection, outside any transaction, for steps
+        that cannot run in one (VACUUM, incremental_vacuum, wal_checkpoint).
+
+        With a writer lease the lease is held for the whole block, so these
+        steps queue behind other processes' writers like transaction() does.
+        """
+        with self.lease.hold() if self.lease is not None else nullcontext():
+            conn = self.pool.get_connection()
+            try:
+                conn.commit()
+                yield conn
+            finally:
+                self.pool.return_connection(conn)
+
+    @contextmanager
+    def read_connection(self):
+        """
+        Context manager for a pooled connection used only for reading.
+
+        Unlike transaction(), it never takes the writer lease, so readers
+        do not queue behind writers of other processes.
+
+        Yields:
+            SQLite connection; any open read transaction ends on exit
+
+        Example:
+            with handler.read_connection() as conn:
+                df = pd.read_sql_query("SELECT * FROM 'NIFTY'", conn)
+        """
+        conn = self.pool.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            self.pool.return_connection(conn)
+
+    def lease_stats(self) -> LeaseStats:
+        """
+        Get writer lease contention counters for this process.
+
+        Returns:
+            LeaseStats with acquisitions, contended waits, timeouts and
+            wait/held times in milliseconds
+
+        Raises:
+            RuntimeError: If the handler was created without writer_lease
+        """
+        if self.lease is None:
+            raise RuntimeError(
+                "Writer lease is disabled, "
+                "create the DataHandler with writer_lease=True"
+            )
+        return self.lease.stats()
+
+    def pool_stats(self) -> PoolStats:
+        """
+        Get the connection pool's size, wait counters and sizing decisions.
+
+        Returns:
+            PoolStats with the current and min/max size, open, idle and
+            checked-out connections, waits, timeouts, growth and expiry
+            counters and the most recent grow/shrink decisions
+
+        Example:
+            stats = handler.pool_stats()
+            if stats.timeouts:
+                print(f"pool at {stats.size}/{stats.max_size}, "
+                      f"{stats.mean_wait_ms:.1f}ms waits")
+        """
+        return self.pool.stats()
+
     @contextmanager
     def _db_cursor(self, conn: Optional[sqlite3.Connection] = None):
         """
@@ -242,15 +1564,45 @@ class DataHandler:
             finally:
                 cursor.close()
 
+    def query_log(
+        self, slow_only: bool = False, limit: Optional[int] = None
+    ) -> pd.DataFrame:
+        """
+        Get the statements recorded by the query profiler.
+
+        Args:
+            slow_only: Only include statements at or above slow_query_ms
+            limit: Only include the most recent N matching statements
+
+        Returns:
+            DataFrame with timestamp, sql, params, rows, elapsed_ms,
+            executemany, slow, full_scan and plan columns, oldest first
+
+        Raises:
+            RuntimeError: If the handler was created without profile=True
+
+        Example:
+            handler = DataHandler(db_path, profile=True, slow_query_ms=50)
+            handler.get_security_data("NIFTY")
+            slow = handler.query_log(slow_only=True)
+        """
+        if self.profiler is None:
+            raise RuntimeError(
+                "Query profiling is disabled, create the DataHandler with profile=True"
+            )
+        return self.profiler.to_dataframe(slow_only=slow_only, limit=limit)
+
     @QuantLogger(log_time=True, log_args=True)
     def database_exists(self) -> bool:
         """
         Check if the database file exists.
 
+        In-memory handlers always have their database.
+
         Returns:
             True if database file exists, False otherwise
         """
-        return self.db_path.is_file()
+        return self.memory_uri is not None or self.db_path.is_file()
 
     def _symbol_exists(
         self, symbol: str, conn: Optional[sqlite3.Connection] = None
@@ -269,13 +1621,7 @@ class DataHandler:
             return False
 
         try:
-            with self._db_cursor(conn) as cursor:
-                cursor.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-                    (symbol,),
-                )
-                result = cursor.fetchone()
-                return result is not None
+            return symbol in self._symbol_catalog(conn)[1]
         except sqlite3.Error as e:
             logger.error(f"Error checking symbol existence: {e}")
             return False
@@ -397,18 +1743,141 @@ class DataHandler:
         if not self.database_exists():
             return []
 
+        return list(self._symbol_catalog(conn)[0])
+
+    def _symbol_catalog(self, conn: Optional[sqlite3.Connection] = None) -> tuple:
+        """
+        Symbol tables of the database, cached per schema version.
+
+        schema_version lives in the file header and is bumped by every
+        CREATE/DROP, in this process or any other, so one PRAGMA read
+        replaces a scan of sqlite_master while the schema is unchanged.
+
+        Args:
+            conn: Optional database connection
+
+        Returns:
+            Tuple of (symbol names in sqlite_master order, frozenset of names)
+        """
         with self._db_cursor(conn) as cursor:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            symbols = [row[0] for row in cursor.fetchall()]
-            return symbols
+            version = cursor.execute("PRAGMA schema_version").fetchone()[0]
+            cached = self._symbols_cache
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
+            cursor.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type='table' AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'"
+            )
+            names = tuple(row[0] for row in cursor.fetchall())
+            catalog = (names, frozenset(names))
+            # An open transaction may still roll its schema change back
+            if not cursor.connection.in_transaction:
+                self._symbols_cache = (version, catalog)
+            return catalog
+
+    def _projection(
+        self,
+        symbol: str,
+        columns: List[str],
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> str:
+        """
+        SELECT list for a column projection, always led by datetime.
 
-    @QuantLogger(log_time=True, log_args=True)
+        Args:
+            symbol: Symbol (table name)
+            columns: Requested columns
+            conn: Optional database connection
+
+        Returns:
+            Comma-separated quoted column names
+
+        Raises:
+            ValueError: If a column does not exist in the table
+        """
+        with self._db_cursor(conn) as cursor:
+            cursor.execute(f"PRAGMA table_info({_quote(symbol)})")
+            available = {row[1] for row in cursor.fetchall()}
+        missing = [c for c in columns if c not in available]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in {symbol}")
+        selected = ["datetime"] + [c for c in dict.fromkeys(columns) if c != "datetime"]
+        return ", ".join(_quote(c) for c in selected)
+
+    def _ensure_index(
+        self,
+        symbol: str,
+        suffix: str,
+        columns_sql: str,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> bool:
+        """
+        Create an index on a symbol table unless it already exists.
+
+        The index is named "<symbol>__<suffix>" and is dropped together with
+        the table. It is built in its own transaction (or on conn, when
+        given). Only write paths and create_indexes() build indexes, so reads
+        never take the write lock. During bulk_load() the index is only
+        queued, and built when the load ends.
+
+        Args:
+            symbol: Symbol (table name)
+            suffix: Index name suffix
+            columns_sql: Indexed columns or expressions, as SQL
+            conn: Optional database connection
+
+        Returns:
+            True if the index exists, False if it could not be created or
+            is deferred
+        """
+        name = f"{symbol}__{suffix}"
+        if self._deferred_indexes is not None:
+            self._deferred_indexes[name] = (symbol, suffix, columns_sql)
+            return False
+        with self._db_cursor(conn) as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='index' AND name=?", (name,)
+            )
+            if cursor.fetchone():
+                return True
+
+        sql = (
+            f"CREATE INDEX IF NOT EXISTS {_quote(name)} "
+            f"ON {_quote(symbol)} ({columns_sql})"
+        )
+        try:
+            if conn is not None:
+                conn.execute(sql)
+            else:
+                with self.transaction() as connection:
+                    connection.execute(sql)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Index {name} not created: {e}")
+            return False
+        logger.info(f"Created index {name}")
+        return True
+
+    def _ensure_bar_indexes(
+        self, symbol: str, conn: Optional[sqlite3.Connection] = None
+    ) -> None:
+        """Build the BAR_INDEXES of a symbol table unless they exist."""
+        for suffix, columns_sql in BAR_INDEXES:
+            self._ensure_index(symbol, suffix, columns_sql, conn)
+
+    @QuantLogger(log_time=True, log_args=True, reraise=(QueryTimeoutError,))
     def get_security_data(
         self,
         symbol: str,
         start_datetime: Union[int, str, datetime.date, None] = None,
         end_datetime: Optional[Union[str, datetime.date]] = None,
         conn: Optional[sqlite3.Connection] = None,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Union[Dict[str, str], Literal["compact"]]] = None,
+        time_from: Optional[Union[str, datetime.time]] = None,
+        time_to: Optional[Union[str, datetime.time]] = None,
+        weekdays: Optional[Sequence[int]] = None,
+        timeout: Optional[float] = None,
     ) -> Optional[pd.DataFrame]:
         """
         Retrieve security data for a given symbol.
@@ -422,19 +1891,58 @@ class DataHandler:
                 - None: Retrieve all available data
             end_datetime: Optional end date (str or datetime.date)
             conn: Optional database connection
+            columns: Columns to read besides datetime, selected in SQL so the
+                rest never leave SQLite (default: all columns)
+            dtypes: Mapping of column to numpy dtype, or "compact" for
+                COMPACT_DTYPES (float32 prices, int32 volume and oi). Columns
+                are built directly in these dtypes from the fetched rows,
+                without a float64 intermediate (default: pandas inference)
+            time_from: Earliest time of day to include, "HH:MM[:SS]" or
+                datetime.time (inclusive)
+            time_to: Latest time of day to include, "HH:MM[:SS]" or
+                datetime.time (inclusive)
+            weekdays: Days of the week to include, Monday=0 ... Sunday=6
+                as in datetime.weekday() (default: all)
+            timeout: Seconds the bar query may run before it is cancelled
+                with QueryTimeoutError; the connection goes back to the pool
+                unharmed (default: no limit)
+
+        Time-of-day filters are evaluated in SQL through an expression index
+        on the time part of datetime, built when the table is written, so
+        only the matching bars are read from the table.
 
         Returns:
             DataFrame with OHLCV data or None if symbol doesn't exist
 
+        Raises:
+            ValueError: If a requested column does not exist, a time is
+                malformed, time_from is after time_to, or a weekday is
+                outside 0-6
+            QueryTimeoutError: If the read ran past timeout
+
         Example:
             # Get last 30 days of data
             data = handler.get_security_data("NIFTY", start_datetime=30)
 
             # Get data from specific date
             data = handler.get_security_data("BANKNIFTY", start_datetime="2024-01-01")
+
+            # Close only, as float32
+            closes = handler.get_security_data(
+                "RELIANCE", columns=["close"], dtypes="compact"
+            )
+
+            # Opening 30 minutes of every Monday and Friday
+            opening = handler.get_security_data(
+                "NIFTY", time_from="09:15", time_to="09:44", weekdays=[0, 4]
+            )
+
+            # Give up on a mistaken full-history read after 2 seconds
+            data = handler.get_security_data("NIFTY", timeout=2.0)
         """
         if not symbol:
             raise ValueError("Symbol cannot be empty")
+        session_filters, session_params = _session_filters(time_from, time_to, weekdays)
 
         if not self._symbol_exists(symbol, conn):
             logger.warning(f"Symbol {symbol} not found in database")
@@ -457,25 +1965,279 @@ class DataHandler:
             end_datetime = datetime.datetime.strptime(end_datetime, "%Y-%m-%d").date()
 
         # Build query with parameterized values
+        select = "*" if columns is None else self._projection(symbol, columns, conn)
+        where = ["datetime >= ?"]
+        params = [start_datetime.strftime("%Y-%m-%d")]
         if end_datetime:
-            query = f"SELECT * FROM '{symbol}' WHERE datetime >= ? AND datetime <= ? ORDER BY datetime"
-            params = (
-                start_datetime.strftime("%Y-%m-%d"),
-                end_datetime.strftime("%Y-%m-%d"),
-            )
+            where.append("datetime <= ?")
+            params.append(end_datetime.strftime("%Y-%m-%d"))
+        if session_filters:
+            where.extend(session_filters)
+            params.extend(session_params)
+        query = (
+            f"SELECT {select} FROM {_quote(symbol)} "
+            f"WHERE {' AND '.join(where)} ORDER BY datetime"
+        )
+
+        return self._read_frame(query, params, dtypes, conn, timeout)
+
+    @QuantLogger(log_time=True, log_args=True, reraise=(QueryTimeoutError,))
+    def tail(
+        self,
+        symbol: str,
+        n: int,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Union[Dict[str, str], Literal["compact"]]] = None,
+        conn: Optional[sqlite3.Connection] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get the last n bars of a symbol.
+
+        Walks the datetime index backwards from the newest row, so the cost
+        grows with n rather than with the size of the table.
+
+        Args:
+            symbol: Security symbol
+            n: Number of bars
+            columns: Columns to read besides datetime (default: all columns)
+            dtypes: Mapping of column to numpy dtype, or "compact"
+                (default: pandas inference)
+            conn: Optional database connection
+            timeout: Seconds the bar query may run before it is cancelled
+                with QueryTimeoutError; the connection goes back to the pool
+                unharmed (default: no limit)
+
+        Returns:
+            DataFrame of at most n bars in ascending datetime order, or None
+            if symbol doesn't exist
+
+        Raises:
+            ValueError: If n is negative or a requested column does not exist
+            QueryTimeoutError: If the read ran past timeout
+
+        Example:
+            # Warm up a 200-bar indicator
+            warmup = handler.tail("NIFTY", 200, columns=["close"])
+        """
+        if not symbol:
+            raise ValueError("Symbol cannot be empty")
+        if n < 0:
+            raise ValueError(f"n must be non-negative, got {n}")
+
+        if not self._symbol_exists(symbol, conn):
+            logger.warning(f"Symbol {symbol} not found in database")
+            return None
+
+        select = "*" if columns is None else self._projection(symbol, columns, conn)
+        query = (
+            f"SELECT * FROM (SELECT {select} FROM {_quote(symbol)} "
+            "ORDER BY datetime DESC LIMIT ?) ORDER BY datetime"
+        )
+        return self._read_frame(query, (n,), dtypes, conn, timeout)
+
+    @QuantLogger(log_time=True, log_args=True, reraise=(QueryTimeoutError,))
+    def page(
+        self,
+        symbol: str,
+        after: Union[str, datetime.date, None] = None,
+        limit: int = 10_000,
+        columns: Optional[List[str]] = None,
+        dtypes: Optional[Union[Dict[str, str], Literal["compact"]]] = None,
+        conn: Optional[sqlite3.Connection] = None,
+        timeout: Optional[float] = None,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get one page of bars, keyset-paginated on datetime.
+
+        Each page seeks the datetime index to its cursor, so reading page k
+        costs the same as reading page 1, unlike OFFSET.
+
+        Args:
+            symbol: Security symbol
+            after: Exclusive cursor: the datetime of the last bar of the
+                previous page (datetime, pd.Timestamp or "YYYY-MM-DD HH:MM:SS").
+                A date or "YYYY-MM-DD" starts at the beginning of that day.
+                None starts at the first bar.
+            limit: Maximum number of bars in the page (default: 10,000)
+            columns: Columns to read besides datetime (default: all columns)
+            dtypes: Mapping of column to numpy dtype, or "compact"
+                (default: pandas inference)
+            conn: Optional database connection
+            timeout: Seconds the bar query may run before it is cancelled
+                with QueryTimeoutError; the connection goes back to the pool
+                unharmed (default: no limit)
+
+        Returns:
+            DataFrame of at most limit bars in ascending datetime order
+            (empty after the last page), or None if symbol doesn't exist
+
+        Raises:
+            ValueError: If limit is not positive or a requested column does
+                not exist
+            QueryTimeoutError: If the read ran past timeout
+
+        Example:
+            page = handler.page("NIFTY", limit=50_000)
+            while len(page):
+                process(page)
+                last = page["datetime"].iloc[-1]
+                page = handler.page("NIFTY", after=last, limit=50_000)
+        """
+        if not symbol:
+            raise ValueError("Symbol cannot be empty")
+        if limit <= 0:
+            raise ValueError(f"limit must be positive, got {limit}")
+
+        if not self._symbol_exists(symbol, conn):
+            logger.warning(f"Symbol {symbol} not found in database")
+            return None
+
+        select = "*" if columns is None else self._projection(symbol, columns, conn)
+        query = f"SELECT {select} FROM {_quote(symbol)}"
+        params: list = []
+        if after is not None:
+            if isinstance(after, datetime.datetime):
+                after = after.strftime(DATETIME_FORMAT)
+            elif isinstance(after, datetime.date):
+                after = after.strftime("%Y-%m-%d")
+            query += " WHERE datetime > ?"
+            params.append(str(after))
+        query += " ORDER BY datetime LIMIT ?"
+        params.append(limit)
+        return self._read_frame(query, params, dtypes, conn, timeout)
+
+    @QuantLogger(log_time=True, reraise=(QueryTimeoutError,))
+    def latest_bars(
+        self,
+        symbols: Optional[List[str]] = None,
+        conn: Optional[sqlite3.Connection] = None,
+        timeout: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Get the newest bar of every symbol in one call.
+
+        Each symbol costs one seek on its datetime index, and all seeks run
+        on one connection inside one read transaction, so the snapshot is
+        consistent across symbols and a 500-symbol universe takes a few
+        milliseconds. Tables written by older versions need
+        create_indexes() once, or each of their seeks is a full scan.
+
+        Args:
+            symbols: Symbols to include; missing ones are skipped with a
+                warning (default: every symbol in the database)
+            conn: Optional database connection
+            timeout: Seconds the seeks may take together before they are
+                cancelled with QueryTimeoutError (default: no limit)
+
+        Returns:
+            DataFrame indexed by symbol with the datetime and bar columns of
+            each symbol's newest bar; symbols without rows are left out
+
+        Raises:
+            QueryTimeoutError: If the seeks ran past timeout
+
+        Example:
+            snapshot = handler.latest_bars()
+            snapshot.loc["RELIANCE", "close"]
+        """
+        if not self.database_exists():
+            return pd.DataFrame(index=pd.Index([], name="symbol"))
+
+        names, known = self._symbol_catalog(conn)
+        if symbols is None:
+            symbols = list(names)
         else:
-            query = f"SELECT * FROM '{symbol}' WHERE datetime >= ? ORDER BY datetime"
-            params = (start_datetime.strftime("%Y-%m-%d"),)
+            missing = [s for s in symbols if s not in known]
+            if missing:
+                logger.warning(f"Symbols not found in database: {missing}")
+            symbols = [s for s in dict.fromkeys(symbols) if s in known]
+
+        def _read(connection):
+            # Rows grouped by column layout (tables with and without oi)
+            groups: Dict[tuple, Tuple[list, list]] = {}
+            cursor = connection.cursor()
+            try:
+                with _deadline(connection, timeout) as check:
+                    for symbol in symbols:
+                        check()
+                        cursor.execute(
+                            f"SELECT * FROM {_quote(symbol)} "
+                            "ORDER BY datetime DESC LIMIT 1"
+                        )
+                        row = cursor.fetchone()
+                        if row is not None:
+                            layout = tuple(d[0] for d in cursor.description)
+                            names, rows = groups.setdefault(layout, ([], []))
+                            names.append(symbol)
+                            rows.append(row)
+            finally:
+                cursor.close()
+            return groups
+
+        if conn:
+            groups = _read(conn)
+        else:
+            with self.read_connection() as conn:
+                # One read transaction: one snapshot and one lock for all seeks
+                conn.execute("BEGIN")
+                groups = _read(conn)
+
+        if not groups:
+            return pd.DataFrame(index=pd.Index([], name="symbol"))
+        frames = [
+            pd.DataFrame(rows, columns=layout, index=pd.Index(names, name="symbol"))
+            for layout, (names, rows) in groups.items()
+        ]
+        df = frames[0]
+        if len(frames) > 1:
+            order = [s for s in symbols if any(s in f.index for f in frames)]
+            df = pd.concat(frames).reindex(order)
+        df["datetime"] = pd.to_datetime(df["datetime"], format=DATETIME_FORMAT)
+        return df
+
+    def _read_frame(
+        self,
+        query: str,
+        params: Sequence,
+        dtypes: Optional[Union[Dict[str, str], Literal["compact"]]],
+        conn: Optional[sqlite3.Connection] = None,
+        timeout: Optional[float] = None,
+    ) -> pd.DataFrame:
+        """
+        Run a bar query and parse its datetime column.
+
+        Args:
+            query: SELECT returning datetime as its first column
+            params: Query parameters
+            dtypes: Mapping of column to numpy dtype, "compact" or None
+            conn: Optional database connection
+            timeout: Seconds the query may run (default: no limit)
+
+        Returns:
+            DataFrame with a datetime64 datetime column
+
+        Raises:
+            QueryTimeoutError: If the query ran past timeout
+        """
+        if dtypes == "compact":
+            dtypes = COMPACT_DTYPES
+
+        def _read(connection):
+            with _deadline(connection, timeout):
+                if dtypes is None:
+                    return pd.read_sql_query(query, connection, params=params)
+                return _read_typed_frame(connection, query, params, dtypes)
 
         # Execute query
         if conn:
-            df = pd.read_sql_query(query, conn, params=params)
+            df = _read(conn)
         else:
-            with self.transaction() as conn:
-                df = pd.read_sql_query(query, conn, params=params)
+            with self.read_connection() as conn:
+                df = _read(conn)
 
         # Convert datetime column
-        df["datetime"] = pd.to_datetime(df["datetime"], format="%Y-%m-%d %H:%M:%S")
+        df["datetime"] = pd.to_datetime(df["datetime"], format=DATETIME_FORMAT)
 
         return df
 
@@ -565,17 +2327,25 @@ class DataHandler:
             with self.transaction() as conn:
                 _delete(conn)
 
-    @QuantLogger(log_time=True, log_args=True, log_result=True)
+    @QuantLogger(
+        log_time=True, log_args=True, log_result=True, reraise=(InvalidDataError,)
+    )
     def inject_data(
         self,
         symbol: str,
         data: Union[pd.DataFrame, pl.DataFrame],
         conn: Optional[sqlite3.Connection] = None,
         if_exists: str = "append",
+        rules: Optional[ValidationRules] = None,
     ):
         """
         Inject OHLCV data into the database for a given symbol.
 
+        Polars input is validated, deduplicated and sorted as one lazy polars
+        query and written straight from the result. Pandas input is validated
+        on its numpy arrays with fused masks and copied once. Both are written
+        with multi-row INSERTs on conn, which is never committed midway.
+
         Args:
             symbol: Security symbol
             data: DataFrame with OHLCV data (pandas or polars)
@@ -584,8 +2354,12 @@ class DataHandler:
                 - "append": Append data to existing table (default)
                 - "replace": Replace entire table
                 - "fail": Raise error if table exists
+            rules: Validation rules for this call (defaults to the
+                handler's validation_rules)
 
         Raises:
+            InvalidDataError: If rows fail rules with on_invalid="raise"; it
+                propagates, so an enclosing transaction() rolls back
             ValueError: If data validation fails
             TypeError: If data is not pandas or polars DataFrame
 
@@ -603,79 +2377,268 @@ class DataHandler:
                 handler.inject_data("NIFTY", df1, conn=conn)
                 handler.inject_data("BANKNIFTY", df2, conn=conn)
         """
-        if not symbol:
-            raise ValueError("Symbol cannot be empty")
+        if not symbol:
+            raise ValueError("Symbol cannot be empty")
+
+        is_polars = _is_dataframe(data, "polars")
+        if not (is_polars or _is_dataframe(data, "pandas")):
+            raise TypeError(
+                f"Data must be pandas or polars DataFrame, got {type(data)}"
+            )
+
+        if data.shape[0] == 0:
+            logger.warning(f"Empty DataFrame provided for {symbol}, skipping injection")
+            return
+
+        # Validate required columns
+        missing_columns = set(REQUIRED_COLUMNS) - set(data.columns)
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        rules = rules or self.validation_rules
+
+        if is_polars:
+            # Validated natively in polars and written without a pandas copy
+            data = _validate_polars(data, symbol, rules)
+
+            def _inject(connection):
+                column_types = {
+                    name: _sql_type(dtype) for name, dtype in data.schema.items()
+                }
+                self._create_table(connection, symbol, column_types, if_exists)
+                inserted = self._insert_rows(
+                    connection, symbol, data.columns, data.iter_rows()
+                )
+                logger.info(f"Injected {inserted} rows for {symbol}")
+
+        else:
+            data = _validate_pandas(data, symbol, rules)
+
+            def _inject(connection):
+                # Not DataFrame.to_sql: it commits the caller's connection,
+                # which would end an enclosing transaction() midway
+                column_types = {
+                    name: _pandas_sql_type(dtype) for name, dtype in data.dtypes.items()
+                }
+                self._create_table(connection, symbol, column_types, if_exists)
+                columns = [_pandas_column_values(data[name]) for name in data.columns]
+                inserted = self._insert_rows(
+                    connection, symbol, list(data.columns), zip(*columns)
+                )
+                logger.info(f"Injected {inserted} rows for {symbol}")
+
+        if conn:
+            _inject(conn)
+        else:
+            with self.transaction() as conn:
+                _inject(conn)
+
+    @QuantLogger(
+        log_time=True, log_args=True, log_result=True, reraise=(InvalidDataError,)
+    )
+    def inject_arrow(
+        self,
+        symbol: str,
+        batches,
+        conn: Optional[sqlite3.Connection] = None,
+        if_exists: str = "append",
+        commit_every: int = 100_000,
+        rules: Optional[ValidationRules] = None,
+    ) -> int:
+        """
+        Stream Arrow record batches into the database for a given symbol.
+
+        Each batch is validated with pyarrow.compute and inserted with
+        executemany over its column values, so no pandas DataFrame is built
+        and memory stays bounded by one batch regardless of stream length.
+
+        Args:
+            symbol: Security symbol
+            batches: pyarrow RecordBatch, Table, RecordBatchReader or any
+                iterable of RecordBatches/Tables
+            conn: Optional database connection. When given, nothing is
+                committed here and the caller's transaction covers all rows.
+            if_exists: How to behave if table exists:
+                - "append": Append data to existing table (default)
+                - "replace": Replace entire table
+                - "fail": Raise error if table exists
+            commit_every: Commit after at least this many rows when the
+                handler owns the connection (default: 100,000)
+            rules: Validation rules for this call (defaults to the
+                handler's validation_rules). Dedup and sort apply within
+                each batch.
+
+        Returns:
+            Number of rows inserted
+
+        Raises:
+            InvalidDataError: If rows fail rules with on_invalid="raise"
+            ValueError: If a batch is missing required columns
+            TypeError: If batches are not Arrow data
+
+        Note:
+            Without conn, chunks committed before an error stay committed;
+            only the current chunk is rolled back.
+
+        Example:
+            reader = pa.ipc.open_stream(source)
+            handler.inject_arrow("NIFTY", reader, commit_every=500_000)
+        """
+        if not symbol:
+            raise ValueError("Symbol cannot be empty")
+        if commit_every <= 0:
+            raise ValueError("commit_every must be positive")
+
+        rules = rules or self.validation_rules
+
+        if isinstance(batches, (pa.RecordBatch, pa.Table)):
+            batches = [batches]
+
+        def _iter_batches():
+            for item in batches:
+                if isinstance(item, pa.Table):
+                    yield from item.to_batches()
+                elif isinstance(item, pa.RecordBatch):
+                    yield item
+                else:
+                    raise TypeError(
+                        f"Expected Arrow RecordBatch or Table, got {type(item)}"
+                    )
+
+        def _stream(connection, commit: bool) -> int:
+            total = 0
+            pending = 0
+            table_ready = False
+            for batch in _iter_batches():
+                if batch.num_rows == 0:
+                    continue
+                missing_columns = set(REQUIRED_COLUMNS) - set(batch.schema.names)
+                if missing_columns:
+                    raise ValueError(f"Missing required columns: {missing_columns}")
+
+                batch = _validate_arrow(batch, symbol, rules)
+                if not table_ready:
+                    column_types = {
+                        field.name: _arrow_sql_type(field.type)
+                        for field in batch.schema
+                    }
+                    self._create_table(connection, symbol, column_types, if_exists)
+                    table_ready = True
+
+                columns = [column.to_pylist() for column in batch.columns]
+                inserted = self._insert_rows(
+                    connection, symbol, batch.schema.names, zip(*columns)
+                )
+                total += inserted
+                pending += inserted
+                if commit and pending >= commit_every:
+                    connection.commit()
+                    pending = 0
+            return total
+
+        if conn:
+            total = _stream(conn, commit=False)
+        else:
+            with self.transaction() as conn:
+                total = _stream(conn, commit=True)
+
+        logger.info(f"Injected {total} rows for {symbol} from Arrow batches")
+        return total
+
+    def _create_table(
+        self,
+        conn: sqlite3.Connection,
+        symbol: str,
+        column_types: dict,
+        if_exists: str = "append",
+    ):
+        """
+        Create a symbol table and its BAR_INDEXES if needed, honoring
+        pandas-style if_exists.
+
+        Args:
+            conn: Database connection
+            symbol: Security symbol (table name)
+            column_types: Mapping of column name to SQLite type
+            if_exists: "append", "replace" or "fail"
+
+        Raises:
+            ValueError: If if_exists is invalid, or is "fail" and the table exists
+        """
+        if if_exists not in ("append", "replace", "fail"):
+            raise ValueError(f"'{if_exists}' is not valid for if_exists")
 
-        # Validate and convert data
-        if isinstance(data, pl.DataFrame):
-            # Convert polars to pandas
-            data = data.to_pandas()
-        elif not isinstance(data, pd.DataFrame):
-            raise TypeError(
-                f"Data must be pandas or polars DataFrame, got {type(data)}"
+        exists = self._symbol_exists(symbol, conn)
+        if exists and if_exists == "fail":
+            raise ValueError(f"Table '{symbol}' already exists.")
+
+        with self._db_cursor(conn) as cursor:
+            if exists and if_exists == "replace":
+                cursor.execute(f"DROP TABLE IF EXISTS {_quote(symbol)}")
+            columns_sql = ", ".join(
+                f"{_quote(name)} {sql_type}" for name, sql_type in column_types.items()
             )
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote(symbol)} ({columns_sql})"
+            )
+        self._ensure_bar_indexes(symbol, conn)
 
-        if data.empty:
-            logger.warning(f"Empty DataFrame provided for {symbol}, skipping injection")
-            return
+    def _insert_rows(
+        self,
+        conn: sqlite3.Connection,
+        symbol: str,
+        columns: List[str],
+        rows,
+        rows_per_statement: int = 200,
+        or_replace: bool = False,
+    ) -> int:
+        """
+        Insert rows into a symbol table with executemany.
 
-        # Validate required columns
-        required_columns = {"datetime", "open", "high", "low", "close", "volume"}
-        missing_columns = required_columns - set(data.columns)
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {missing_columns}")
+        Rows are packed into multi-row INSERT statements, which SQLite
+        executes far faster than one statement per row.
+
+        Args:
+            conn: Database connection
+            symbol: Security symbol (table name)
+            columns: Column names, in the order of each row
+            rows: Iterable of row tuples, consumed lazily
+            rows_per_statement: Rows per INSERT, capped by SQLite's
+                bound-parameter limit (default: 200)
+            or_replace: Use INSERT OR REPLACE, for tables with a primary
+                key where re-sent rows should overwrite (default: False)
 
-        # Ensure datetime column is properly formatted
-        if not pd.api.types.is_datetime64_any_dtype(data["datetime"]):
-            data["datetime"] = pd.to_datetime(data["datetime"])
+        Returns:
+            Number of rows inserted
+        """
+        max_variables = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        block_size = max(1, min(rows_per_statement, max_variables // len(columns)))
 
-        # Format datetime as string for SQLite
-        data = data.copy()
-        data["datetime"] = data["datetime"].dt.strftime("%Y-%m-%d %H:%M:%S")
-
-        # Validate OHLC relationships
-        invalid_ohlc = (
-            (data["high"] < data["low"])
-            | (data["high"] < data["open"])
-            | (data["high"] < data["close"])
-            | (data["low"] > data["open"])
-            | (data["low"] > data["close"])
-        )
+        column_sql = ", ".join(_quote(name) for name in columns)
+        row_sql = "(" + ", ".join("?" * len(columns)) + ")"
+        verb = "INSERT OR REPLACE" if or_replace else "INSERT"
+        insert_sql = f"{verb} INTO {_quote(symbol)} ({column_sql}) VALUES "
 
-        if invalid_ohlc.any():
-            invalid_count = invalid_ohlc.sum()
-            logger.warning(
-                f"Found {invalid_count} rows with invalid OHLC relationships"
-            )
-            # Optionally fix or remove invalid rows
-            data = data[~invalid_ohlc]
+        rows = iter(rows)
+        remainder = []
 
-        # Check for duplicates
-        duplicates = data.duplicated(subset=["datetime"], keep="last")
-        if duplicates.any():
-            dup_count = duplicates.sum()
-            logger.warning(f"Removing {dup_count} duplicate datetime entries")
-            data = data[~duplicates]
-
-        # Sort by datetime
-        data = data.sort_values("datetime")
-
-        def _inject(connection):
-            # Use pandas to_sql for efficient insertion
-            data.to_sql(
-                symbol,
-                connection,
-                if_exists=if_exists,
-                index=False,
-                method="multi",  # Batch insert for performance
-            )
-            logger.info(f"Injected {len(data)} rows for {symbol}")
+        def _blocks():
+            while True:
+                block = list(islice(rows, block_size))
+                if len(block) < block_size:
+                    remainder.extend(block)
+                    return
+                yield tuple(chain.from_iterable(block))
 
-        if conn:
-            _inject(conn)
-        else:
-            with self.transaction() as conn:
-                _inject(conn)
+        with self._db_cursor(conn) as cursor:
+            cursor.executemany(
+                insert_sql + ", ".join([row_sql] * block_size), _blocks()
+            )
+            inserted = max(cursor.rowcount, 0)
+            if remainder:
+                cursor.executemany(insert_sql + row_sql, remainder)
+                inserted += cursor.rowcount
+            return inserted
 
     @QuantLogger(log_time=True, log_args=True, log_result=True)
     def check_db_integrity(
@@ -791,10 +2754,487 @@ class DataHandler:
 
         return report_df
 
+    def _database_sizes(self) -> tuple:
+        """Get (database bytes, WAL bytes), zero for missing files."""
+        if self.memory_uri is not None:
+            with self.read_connection() as conn:
+                pages = conn.execute("PRAGMA page_count").fetchone()[0]
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            return pages * page_size, 0
+        wal_path = self.db_path.with_name(self.db_path.name + "-wal")
+        db_bytes = self.db_path.stat().st_size if self.db_path.is_file() else 0
+        wal_bytes = wal_path.stat().st_size if wal_path.is_file() else 0
+        return db_bytes, wal_bytes
+
+    def optimize(
+        self, analyze: bool = False, conn: Optional[sqlite3.Connection] = None
+    ):
+        """
+        Refresh query planner statistics.
+
+        Args:
+            analyze: Run a full ANALYZE instead of PRAGMA optimize, which only
+                re-analyzes tables whose statistics look stale (default: False)
+            conn: Optional database connection
+        """
+        with self._db_cursor(conn) as cursor:
+            cursor.execute("ANALYZE" if analyze else "PRAGMA optimize")
+
+    @QuantLogger(log_time=True)
+    def create_indexes(self, symbols: Optional[List[str]] = None) -> int:
+        """
+        Build missing BAR_INDEXES on existing symbol tables.
+
+        Tables get their indexes when they are written; this is the one-off
+        migration for tables written by older versions, which tail(), page(),
+        latest_bars() and time-of-day reads would otherwise scan in full.
+
+        Args:
+            symbols: Symbols to index; missing ones are skipped
+                (default: every symbol in the database)
+
+        Returns:
+            Number of indexes created
+
+        Example:
+            handler.create_indexes()
+        """
+        if not self.database_exists():
+            return 0
+
+        names, known = self._symbol_catalog()
+        symbols = list(names) if symbols is None else [s for s in symbols if s in known]
+        created = 0
+        with self.transaction() as conn:
+            existing = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='index'"
+                )
+            }
+            for symbol in symbols:
+                for suffix, columns_sql in BAR_INDEXES:
+                    if f"{symbol}__{suffix}" not in existing:
+                        created += self._ensure_index(symbol, suffix, columns_sql, conn)
+        logger.info(f"Created {created} indexes on {len(symbols)} symbols")
+        return created
+
+    def enable_incremental_vacuum(self):
+        """
+        Switch an existing database to auto_vacuum=INCREMENTAL.
+
+        Databases created by this version already use incremental vacuum;
+        older ones need a one-off full VACUUM, which rewrites the whole file
+        and holds an exclusive lock while it runs.
+        """
+        if not self.database_exists():
+            return
+
+        with self._maintenance_connection() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return
+            logger.info(f"Rebuilding {self.db_path} with auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("VACUUM")
+
+    def incremental_vacuum(self, max_pages: Optional[int] = None) -> int:
+        """
+        Release free pages back to the filesystem.
+
+        Args:
+            max_pages: Maximum pages to release (default: all free pages)
+
+        Returns:
+            Number of pages released (0 unless auto_vacuum=INCREMENTAL, see
+            enable_incremental_vacuum())
+        """
+        if not self.database_exists():
+            return 0
+
+        with self._maintenance_connection() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                logger.warning(
+                    f"{self.db_path} does not use auto_vacuum=INCREMENTAL, "
+                    "run enable_incremental_vacuum() first"
+                )
+                return 0
+            free_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            pages = "" if max_pages is None else f"({int(max_pages)})"
+            # executescript steps the pragma to completion; execute() frees one page
+            conn.executescript(f"PRAGMA incremental_vacuum{pages};")
+            free_after = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            return free_before - free_after
+
+    def checkpoint(self, mode: str = "TRUNCATE") -> tuple:
+        """
+        Checkpoint the WAL into the database file.
+
+        Args:
+            mode: "PASSIVE", "FULL", "RESTART" or "TRUNCATE" (default), which
+                also truncates the WAL file to zero bytes
+
+        Returns:
+            (busy, wal_frames, checkpointed_frames) as reported by SQLite;
+            busy=1 means active readers or writers prevented completion
+        """
+        mode = mode.upper()
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+
+        with self._maintenance_connection() as conn:
+            return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+
+    @QuantLogger(log_time=True, log_result=True)
+    def run_maintenance(
+        self,
+        analyze: bool = True,
+        vacuum: bool = True,
+        checkpoint: bool = True,
+        full_analyze: bool = False,
+        vacuum_pages: Optional[int] = None,
+        checkpoint_mode: str = "TRUNCATE",
+    ) -> MaintenanceReport:
+        """
+        Run the maintenance steps and report durations and bytes reclaimed.
+
+        Intended for idle windows, e.g. after large deletes or backfills;
+        see schedule_maintenance() to run it automatically. Pooled
+        connections idle past the pool's idle_ttl are closed as well.
+
+        Args:
+            analyze: Refresh planner statistics (default: True)
+            vacuum: Release free pages with incremental vacuum (default: True)
+            checkpoint: Checkpoint the WAL (default: True)
+            full_analyze: Use ANALYZE instead of PRAGMA optimize (default: False)
+            vacuum_pages: Maximum pages to release (default: all)
+            checkpoint_mode: wal_checkpoint mode (default: "TRUNCATE")
+
+        Returns:
+            MaintenanceReport for this run
+
+        Example:
+            handler.check_db_integrity(delete_stale=True)
+            report = handler.run_maintenance()
+            print(f"Reclaimed {report.bytes_reclaimed} bytes")
+        """
+        report = MaintenanceReport()
+        report.db_bytes_before, report.wal_bytes_before = self._database_sizes()
+
+        if self.database_exists():
+            if analyze:
+                start = time.perf_counter()
+                with self.transaction() as conn:
+                    self.optimize(analyze=full_analyze, conn=conn)
+                report.durations_ms["optimize"] = (time.perf_counter() - start) * 1000
+
+            if vacuum:
+                start = time.perf_counter()
+                report.pages_freed = self.incremental_vacuum(vacuum_pages)
+                report.durations_ms["vacuum"] = (time.perf_counter() - start) * 1000
+
+            if checkpoint:
+                start = time.perf_counter()
+                report.checkpoint = self.checkpoint(checkpoint_mode)
+                report.durations_ms["checkpoint"] = (time.perf_counter() - start) * 1000
+
+        report.db_bytes_after, report.wal_bytes_after = self._database_sizes()
+        # Idle windows are when a quiet service can give file handles back
+        self.pool.expire_idle()
+
+        steps = ", ".join(f"{k}={v:.1f}ms" for k, v in report.durations_ms.items())
+        logger.info(
+            f"Maintenance on {self.db_path}: {steps or 'nothing to do'}; "
+            f"{report.pages_freed} pages freed, "
+            f"{report.bytes_reclaimed} bytes reclaimed"
+        )
+        return report
+
+    def schedule_maintenance(
+        self,
+        interval: float = 3600.0,
+        idle_seconds: float = 30.0,
+        **maintenance_kwargs,
+    ) -> MaintenanceScheduler:
+        """
+        Start a background MaintenanceScheduler for this handler.
+
+        Args:
+            interval: Seconds between maintenance runs (default: 3600.0)
+            idle_seconds: Pool idle time required before running (default: 30.0)
+            **maintenance_kwargs: Passed to run_maintenance()
+
+        Returns:
+            The running scheduler; call stop() to end it
+        """
+        return MaintenanceScheduler(
+            self, interval=interval, idle_seconds=idle_seconds, **maintenance_kwargs
+        ).start()
+
+    def live_writer(
+        self,
+        flush_interval_ms: float = 250.0,
+        max_batch_rows: int = 10_000,
+        max_queue: int = 100_000,
+        **writer_kwargs,
+    ):
+        """
+        Start a LiveBarWriter that group-commits live bars for this handler.
+
+        Args:
+            flush_interval_ms: Flush at least this often (default: 250.0)
+            max_batch_rows: Flush early once this many bars are buffered
+                (default: 10,000)
+            max_queue: Queue bound at which producers block (default: 100,000)
+            **writer_kwargs: Passed to LiveBarWriter
+
+        Returns:
+            The running writer; call stop() (or use it as a context manager)
+            to commit the remaining bars and end it
+        """
+        # Imported here: live_writer builds on this module's constants
+        from quant_toolkit.live_writer import LiveBarWriter
+
+        return LiveBarWriter(
+            self,
+            flush_interval_ms=flush_interval_ms,
+            max_batch_rows=max_batch_rows,
+            max_queue=max_queue,
+            **writer_kwargs,
+        ).start()
+
+    def bulk_load(
+        self,
+        commit_rows: int = 1_000_000,
+        cache_size_mb: int = 512,
+        analyze: bool = True,
+    ):
+        """
+        Open a BulkLoader for fast initial loads.
+
+        The loader writes on its own connection with synchronous=OFF, a
+        large page cache and, when the database is not open elsewhere, an
+        exclusive lock and a rollback journal instead of the WAL. It
+        commits every commit_rows rows and defers index creation to the
+        end, then restores the normal settings, builds the indexes, runs
+        ANALYZE and makes the load durable.
+
+        Crash-unsafe while active: a power loss or OS crash during the load
+        can corrupt the database. Load into a new database, or take a
+        snapshot() first. A crash of the process alone loses only the
+        uncommitted chunk, which the next connection rolls back.
+
+        Args:
+            commit_rows: Rows per commit (default: 1,000,000)
+            cache_size_mb: Page cache of the load connection (default: 512)
+            analyze: Run ANALYZE on the loaded tables at the end
+                (default: True)
+
+        Returns:
+            BulkLoader; use it as a context manager
+
+        Example:
+            with handler.bulk_load() as loader:
+                for symbol, bars in history.items():
+                    loader.inject(symbol, bars)
+        """
+        # Imported here: bulk_load builds on this module's writers
+        from quant_toolkit.bulk_load import BulkLoader
+
+        return BulkLoader(
+            self, commit_rows=commit_rows, cache_size_mb=cache_size_mb, analyze=analyze
+        )
+
+    def share(self, symbols: List[str], **read_kwargs):
+        """
+        Load symbols once and publish them in shared memory for workers.
+
+        Args:
+            symbols: Symbols to load; missing symbols are skipped
+            **read_kwargs: Passed to get_security_data (start_datetime,
+                end_datetime, columns, dtypes, ...)
+
+        Returns:
+            SharedDataset; pass its descriptor to workers, which read the
+            bars with shared_data.attach(descriptor).frame(symbol). Close it
+            (or use it as a context manager) once the workers are done.
+        """
+        # Imported here: shared_data builds on this module's reads
+        from quant_toolkit.shared_data import SharedDataset
+
+        return SharedDataset.from_handler(self, symbols, **read_kwargs)
+
+    def _backup_to(
+        self,
+        target: sqlite3.Connection,
+        pages_per_step: int,
+        progress: Optional[Callable[[int, int, int], None]],
+        sleep: float,
+    ):
+        """
+        Copy the database into target with the SQLite online backup API.
+
+        The source connection holds one read transaction across all steps.
+        In WAL mode that pins a consistent snapshot without blocking writers;
+        without it, every commit by another connection restarts the backup,
+        which never finishes under continuous ingest.
+        """
+        if pages_per_step <= 0:
+            raise ValueError("pages_per_step must be positive")
+
+        conn = self.pool.get_connection()
+        try:
+            conn.commit()
+            conn.execute("BEGIN")
+            conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            conn.backup(target, pages=pages_per_step, progress=progress, sleep=sleep)
+        finally:
+            conn.rollback()
+            self.pool.return_connection(conn)
+
+    @QuantLogger(log_time=True, log_args=True)
+    def snapshot(
+        self,
+        dest: Union[str, Path],
+        pages_per_step: int = 256,
+        progress: Optional[Callable[[int, int, int], None]] = None,
+        sleep: float = 0.0,
+    ) -> Path:
+        """
+        Write a consistent copy of the database while ingest keeps running.
+
+        Pages are copied in small steps through sqlite3.Connection.backup,
+        so concurrent writers are never blocked. The copy reflects the
+        database as of the moment the snapshot started. It is written next
+        to dest and renamed into place, so dest never holds a partial copy.
+
+        Args:
+            dest: Destination database file (overwritten if it exists)
+            pages_per_step: Pages copied per backup step (default: 256)
+            progress: Optional callback(status, remaining, total) called
+                after every step, as with sqlite3.Connection.backup
+            sleep: Seconds to sleep between steps (default: 0.0)
+
+        Returns:
+            Path of the snapshot
+
+        Raises:
+            ValueError: If dest is the handler's own database
+            FileNotFoundError: If the database doesn't exist
+
+        Example:
+            def report(status, remaining, total):
+                print(f"{total - remaining}/{total} pages")
+
+            handler.snapshot("backups/index_data.db", progress=report)
+        """
+        dest = Path(dest)
+        if dest.resolve() == self.db_path.resolve():
+            raise ValueError("Snapshot destination must differ from the database")
+        if not self.database_exists():
+            raise FileNotFoundError(f"Database not found: {self.db_path}")
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        partial = dest.with_name(dest.name + ".partial")
+        partial.unlink(missing_ok=True)
+
+        target = sqlite3.connect(partial)
+        try:
+            self._backup_to(target, pages_per_step, progress, sleep)
+        except Exception:
+            target.close()
+            partial.unlink(missing_ok=True)
+            raise
+        target.close()
+        os.replace(partial, dest)
+
+        logger.info(f"Snapshot of {self.db_path} written to {dest}")
+        return dest
+
+    def snapshot_to_memory(
+        self,
+        pages_per_step: int = 256,
+        progress: Optional[Callable[[int, int, int], None]] = None,
+        read_only: bool = True,
+    ) -> sqlite3.Connection:
+        """
+        Restore a consistent copy of the database into memory.
+
+        Useful for backtests that read the same data many times: the copy is
+        taken online like snapshot() and every query afterwards runs against
+        RAM without touching the live database.
+
+        Args:
+            pages_per_step: Pages copied per backup step (default: 256)
+            progress: Optional callback(status, remaining, total) per step
+            read_only: Reject writes on the returned connection (default: True)
+
+        Returns:
+            In-memory sqlite3 connection holding the copy
+
+        Example:
+            mem = handler.snapshot_to_memory()
+            df = pd.read_sql_query("SELECT * FROM 'NIFTY'", mem)
+        """
+        if not self.database_exists():
+            raise FileNotFoundError(f"Database not found: {self.db_path}")
+
+        target = sqlite3.connect(":memory:", check_same_thread=False)
+        self._backup_to(target, pages_per_step, progress, 0.0)
+        if read_only:
+            target.execute("PRAGMA query_only=ON")
+        return target
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle the handler as its configuration.
+
+        Connections, locks and caches stay behind; the unpickled handler
+        opens its own connections on first use.
+
+        Raises:
+            TypeError: For open_in_memory() handlers, whose database only
+                exists in this process
+        """
+        if self.memory_uri is not None:
+            raise TypeError(
+                "In-memory DataHandlers cannot be pickled, open one per worker "
+                "or publish the data with share()"
+            )
+        profiler = self.profiler
+        return {
+            "db_path": self.db_path,
+            "profile": profiler is not None,
+            "slow_query_ms": profiler.slow_query_ms if profiler else 100.0,
+            "profile_capacity": profiler.capacity if profiler else 1000,
+            "validation_rules": self.validation_rules,
+            "writer_lease": self.lease is not None,
+            "lease_timeout": self.lease.timeout if self.lease else None,
+            "pool": {
+                "pool_size": self.pool.pool_size,
+                "timeout": self.pool.timeout,
+                "statement_cache": self.pool.statement_cache,
+                "min_size": self.pool.min_size,
+                "max_size": self.pool.max_size,
+                "idle_ttl": self.pool.idle_ttl,
+                "grow_after": self.pool.grow_after,
+            },
+        }
+
+    def __setstate__(self, state: dict):
+        """Recreate the handler from its pickled configuration."""
+        state = dict(state)
+        pool_settings = state.pop("pool")
+        self.__init__(**state)
+        self.pool = ConnectionPool(
+            self.db_path, profiler=self.profiler, **pool_settings
+        )
+
     def __del__(self):
         """Cleanup connection pool on deletion."""
         if hasattr(self, "pool"):
             self.pool.close_all()
+        if getattr(self, "_memory_anchor", None) is not None:
+            self._memory_anchor.close()
 
 
 @dataclass
@@ -812,6 +3252,9 @@ class DBPaths:
         stocks_db_path: Path to stocks database
     """
 
+    # Database kinds, each with a "<kind>_db_path" attribute
+    DATABASES = ("index", "futures", "stocks")
+
     data_dir: Path = field(init=False)
     index_db_path: Path = field(init=False)
     futures_db_path: Path = field(init=False)
@@ -827,6 +3270,8 @@ class DBPaths:
         - INDEX_CSV_PATH: Path to index symbol list
         - FUTURES_CSV_PATH: Path to futures symbol list
         """
+        _load_env()
+
         # Get base data directory from environment
         data_dir_str = os.getenv("DATA_DIR")
         if not data_dir_str:
@@ -846,69 +3291,115 @@ class DBPaths:
         for db_path in [self.index_db_path, self.futures_db_path, self.stocks_db_path]:
             db_path.parent.mkdir(parents=True, exist_ok=True)
 
-    @QuantLogger(log_time=True)
-    def get_stocks_symbols(self) -> List[str]:
+    def handler(self, kind: Literal["index", "futures", "stocks"]) -> DataHandler:
         """
-        Get list of stock symbols from database or CSV file.
+        Shared DataHandler for one of the configured databases.
+
+        Args:
+            kind: Which database: "index", "futures" or "stocks"
 
         Returns:
-            List of stock symbols
+            Process-wide DataHandler (see DataHandler.shared)
+
+        Raises:
+            ValueError: If kind is not a configured database
+        """
+        return DataHandler.shared(self._db_path(kind))
+
+    def _db_path(self, kind: str) -> Path:
+        """Path of a database by kind, raising ValueError for unknown kinds."""
+        if kind not in self.DATABASES:
+            raise ValueError(
+                f"Unknown database kind: {kind!r} (valid: {', '.join(self.DATABASES)})"
+            )
+        return getattr(self, f"{kind}_db_path")
+
+    def backfill(
+        self,
+        fetch: Callable,
+        symbols: Optional[Dict[str, List[str]]] = None,
+        **orchestrator_kwargs,
+    ) -> dict:
+        """
+        Backfill the index, futures and stocks databases concurrently.
+
+        Args:
+            fetch: Callable(database, symbol, since) returning the bars of
+                symbol after since (a datetime, or None for a new symbol)
+                as a pandas or polars DataFrame or a pyarrow Table
+            symbols: Symbols to backfill by database name (default: every
+                symbol of every database, see get_*_symbols)
+            **orchestrator_kwargs: Passed to BackfillOrchestrator
+                (batch_rows, fetch_workers, queue_size, rules)
+
+        Returns:
+            DatabaseThroughput for each database, by name
+        """
+        # Imported here: backfill builds on this module's handlers
+        from quant_toolkit.backfill import BackfillOrchestrator
+
+        return BackfillOrchestrator(fetch, paths=self, **orchestrator_kwargs).run(
+            symbols
+        )
+
+    def _get_symbols(self, kind: Literal["index", "futures", "stocks"]) -> List[str]:
+        """
+        Symbols of a database, falling back to its symbol CSV when empty.
+
+        Args:
+            kind: Which database: "index", "futures" or "stocks"
+
+        Returns:
+            List of symbols
 
         Raises:
             FileNotFoundError: If neither database nor CSV file exists
         """
         # Try to get from database first
-        if self.stocks_db_path.is_file():
-            handler = DataHandler(self.stocks_db_path)
-            symbols = handler.get_available_securities()
+        if self._db_path(kind).is_file():
+            symbols = self.handler(kind).get_available_securities()
             if symbols:
                 return symbols
 
         # Fall back to CSV file
-        csv_path = os.getenv("STOCKS_CSV_PATH")
+        env_var = f"{kind.upper()}_CSV_PATH"
+        csv_path = os.getenv(env_var)
         if not csv_path:
-            raise FileNotFoundError(
-                "STOCKS_CSV_PATH not configured and no database found"
-            )
+            raise FileNotFoundError(f"{env_var} not configured and no database found")
 
         csv_file = Path(csv_path)
         if not csv_file.exists():
-            raise FileNotFoundError(f"Stocks CSV file not found: {csv_file}")
+            raise FileNotFoundError(
+                f"{kind.capitalize()} CSV file not found: {csv_file}"
+            )
 
-        df = pd.read_csv(csv_file)
-        return df["Ticker"].tolist()
+        return _read_symbols_csv(csv_file)
 
     @QuantLogger(log_time=True)
-    def get_index_symbols(self) -> List[str]:
+    def get_stocks_symbols(self) -> List[str]:
         """
-        Get list of index symbols from database or CSV file.
+        Get list of stock symbols from database or CSV file.
 
         Returns:
-            List of index symbols
+            List of stock symbols
 
         Raises:
             FileNotFoundError: If neither database nor CSV file exists
         """
-        # Try to get from database first
-        if self.index_db_path.is_file():
-            handler = DataHandler(self.index_db_path)
-            symbols = handler.get_available_securities()
-            if symbols:
-                return symbols
+        return self._get_symbols("stocks")
 
-        # Fall back to CSV file
-        csv_path = os.getenv("INDEX_CSV_PATH")
-        if not csv_path:
-            raise FileNotFoundError(
-                "INDEX_CSV_PATH not configured and no database found"
-            )
+    @QuantLogger(log_time=True)
+    def get_index_symbols(self) -> List[str]:
+        """
+        Get list of index symbols from database or CSV file.
 
-        csv_file = Path(csv_path)
-        if not csv_file.exists():
-            raise FileNotFoundError(f"Index CSV file not found: {csv_file}")
+        Returns:
+            List of index symbols
 
-        df = pd.read_csv(csv_file)
-        return df["Ticker"].tolist()
+        Raises:
+            FileNotFoundError: If neither database nor CSV file exists
+        """
+        return self._get_symbols("index")
 
     @QuantLogger(log_time=True)
     def get_futures_symbols(self) -> List[str]:
@@ -921,39 +3412,37 @@ class DBPaths:
         Raises:
             FileNotFoundError: If neither database nor CSV file exists
         """
-        # Try to get from database first
-        if self.futures_db_path.is_file():
-            handler = DataHandler(self.futures_db_path)
-            symbols = handler.get_available_securities()
-            if symbols:
-                return symbols
+        return self._get_symbols("futures")
 
-        # Fall back to CSV file
-        csv_path = os.getenv("FUTURES_CSV_PATH")
-        if not csv_path:
-            raise FileNotFoundError(
-                "FUTURES_CSV_PATH not configured and no database found"
-            )
 
-        csv_file = Path(csv_path)
-        if not csv_file.exists():
-            raise FileNotFoundError(f"Futures CSV file not found: {csv_file}")
+def _read_symbols_csv(csv_file: Path) -> List[str]:
+    """
+    Read the "Ticker" column of a symbol CSV, cached until the file changes.
 
-        df = pd.read_csv(csv_file)
-        return df["Ticker"].tolist()
+    Args:
+        csv_file: Path to the symbol CSV
+
+    Returns:
+        List of symbols
+    """
+    key = csv_file.resolve()
+    stat = key.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _CSV_SYMBOLS.get(key)
+    if cached is None or cached[0] != stamp:
+        symbols = tuple(pd.read_csv(key, usecols=["Ticker"])["Ticker"].tolist())
+        cached = _CSV_SYMBOLS[key] = (stamp, symbols)
+    return list(cached[1])
 
 
 if __name__ == "__main__":
     """Example usage and testing."""
 
-    # Load environment variables
-    load_dotenv()
-
-    # Initialize paths
+    # Initialize paths (loads .env)
     paths = DBPaths()
 
     # Test with index database
-    handler = DataHandler(paths.index_db_path)
+    handler = paths.handler("index")
 
     # Get available symbols
     symbols = handler.get_available_securities()
@@ -0,0 +1,587 @@
+"""
+Streaming tick-to-bar aggregation.
+
+TickAggregator turns a stream of trade ticks into OHLCV bars aligned to the
+NSE session open (09:15 by default): with 1-minute bars a tick at 09:15:42
+lands in the 09:15 bar, with 75-minute bars in the 09:15, 10:30, ... bars.
+Ticks are processed in numpy batches rather than one at a time, which keeps
+throughput well above a million ticks per second on one core.
+
+Open bars are kept as struct-of-arrays partial bars (symbol slot, bucket,
+first/last tick time, OHLC, volume). A bar closes once the watermark (the
+latest tick time seen, across all symbols) passes its end plus a grace
+window, so ticks arriving slightly out of order still land in their bar.
+Ticks for bars that have already closed are counted in ``late_ticks`` and
+dropped. Closed bars are emitted in batches to a DataHandler, a
+LiveBarWriter or any callable; they stay queued until the sink has taken
+them, so a failed write is retried by the next emission instead of losing
+the bars.
+
+Classes:
+    TickAggregator: Vectorized tick-to-bar aggregator
+
+Usage:
+    from quant_toolkit.sqlite_data_manager import DataHandler
+    from quant_toolkit.tick_aggregator import TickAggregator
+
+    handler = DataHandler(db_path)
+    aggregator = TickAggregator(sink=handler, bar_seconds=60, grace_seconds=2)
+
+    # Vectorized: arrays of symbols, datetime64 times, prices and quantities
+    aggregator.update(symbols, times, prices, quantities)
+
+    # Or tick by tick; buffered and processed in batches
+    aggregator.add_tick("NSE:NIFTY24OCTFUT", ts, 24850.5, 25)
+    aggregator.advance(datetime.datetime.now())   # close bars on a timer
+
+    aggregator.flush()   # end of session: close and emit all open bars
+"""
+
+import datetime
+import logging
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from quant_toolkit.live_writer import LiveBarWriter
+from quant_toolkit.sqlite_data_manager import DATETIME_FORMAT, DataHandler, _sql_type
+
+logger = logging.getLogger(__name__)
+
+_NS = 1_000_000_000
+_DAY_NS = 86_400 * _NS
+# Open interest of ticks that carried none; stored as NULL
+_MISSING_OI = np.iinfo(np.int64).min
+
+# Fields of a partial bar, in the order they are kept
+_FIELDS = (
+    "sym",
+    "bucket",
+    "first",
+    "last",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "oi",
+)
+
+
+def _time_of_day_ns(value: Union[str, datetime.time]) -> int:
+    """Convert "HH:MM" or a datetime.time to nanoseconds after midnight."""
+    if isinstance(value, str):
+        value = datetime.time.fromisoformat(value)
+    return (value.hour * 3600 + value.minute * 60 + value.second) * _NS
+
+
+def _oi_array(oi) -> np.ndarray:
+    """Open interest as int64, with missing values (None, NaN) as _MISSING_OI."""
+    values = np.asarray(oi)
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64)
+    missing = pd.isna(values)
+    values = np.where(missing, 0, values).astype(np.int64)
+    values[missing] = _MISSING_OI
+    return values
+
+
+def _reduce(parts: Dict[str, np.ndarray], span_base: int) -> Dict[str, np.ndarray]:
+    """
+    Merge partial bars that share (symbol slot, bucket) into one per group.
+
+    Open comes from the earliest first tick and close/oi from the latest
+    last tick; equal times resolve by arrival order, with earlier partials
+    (existing state) ahead of later ones.
+
+    Args:
+        parts: Partial bars as arrays keyed by _FIELDS
+        span_base: Smallest bucket among parts
+
+    Returns:
+        One partial bar per group, ordered by symbol slot then bucket
+    """
+    n = len(parts["sym"])
+    rel = parts["bucket"] - span_base
+    span = int(rel.max()) + 1
+    key = parts["sym"].astype(np.int64) * span + rel
+    # numpy radix-sorts 16-bit keys, several times faster than int64
+    if key.max() < 1 << 16:
+        key = key.astype(np.uint16)
+    order = np.argsort(key, kind="stable")
+    key = key[order]
+    starts = np.flatnonzero(np.concatenate(([True], key[1:] != key[:-1])))
+    counts = np.diff(np.append(starts, n))
+    positions = np.arange(n)
+
+    first = parts["first"][order]
+    last = first if parts["last"] is parts["first"] else parts["last"][order]
+    group_first = np.minimum.reduceat(first, starts)
+    group_last = np.maximum.reduceat(last, starts)
+    open_at = np.minimum.reduceat(
+        np.where(first == np.repeat(group_first, counts), positions, n), starts
+    )
+    close_at = np.maximum.reduceat(
+        np.where(last == np.repeat(group_last, counts), positions, -1), starts
+    )
+    open_at = order[open_at]
+    close_at = order[close_at]
+
+    return {
+        "sym": parts["sym"][order[starts]],
+        "bucket": parts["bucket"][order[starts]],
+        "first": group_first,
+        "last": group_last,
+        "open": parts["open"][open_at],
+        "high": np.maximum.reduceat(parts["high"][order], starts),
+        "low": np.minimum.reduceat(parts["low"][order], starts),
+        "close": parts["close"][close_at],
+        "volume": np.add.reduceat(parts["volume"][order], starts),
+        "oi": parts["oi"][close_at],
+    }
+
+
+class TickAggregator:
+    """
+    Vectorized aggregator building session-aligned OHLCV bars from ticks.
+
+    Tick times are local exchange wall-clock times. datetime64 arrays and
+    naive datetimes are taken as-is, aware datetimes by their wall-clock time;
+    numeric epoch seconds are UTC and shifted by ``utc_offset``. Volume is
+    the sum of tick quantities and oi (when given) the value of the last
+    tick in the bar, or null if that tick had none. Ticks outside the
+    session are dropped and counted.
+
+    Attributes:
+        sink: Where closed bars go: a DataHandler (inject_data per symbol in
+            one transaction), a LiveBarWriter (submitted per bar) or a
+            callable receiving a polars DataFrame with a symbol column
+        bar_seconds: Bar length in seconds
+        grace_seconds: How long after its end a bar still accepts ticks
+        watermark: Latest tick time seen, as datetime64[ns]
+        ticks_processed: Ticks aggregated into bars
+        late_ticks: Ticks dropped because their bar had already closed
+        out_of_session_ticks: Ticks dropped for falling outside the session
+        bars_closed: Bars closed so far
+    """
+
+    def __init__(
+        self,
+        sink: Union[
+            DataHandler, LiveBarWriter, Callable[[pl.DataFrame], None], None
+        ] = None,
+        bar_seconds: int = 60,
+        grace_seconds: float = 2.0,
+        session_start: Union[str, datetime.time] = "09:15",
+        session_end: Union[str, datetime.time] = "15:30",
+        utc_offset: datetime.timedelta = datetime.timedelta(hours=5, minutes=30),
+        emit_batch_bars: int = 1,
+        tick_batch: int = 10_000,
+    ):
+        """
+        Initialize the aggregator.
+
+        Args:
+            sink: DataHandler, LiveBarWriter or callable receiving closed bars;
+                when None, closed bars are kept until pop_bars() (default: None)
+            bar_seconds: Bar length in seconds (default: 60)
+            grace_seconds: Out-of-order window after a bar's end (default: 2.0)
+            session_start: Session open that bars align to (default: "09:15")
+            session_end: Session close; later ticks are dropped (default: "15:30")
+            utc_offset: Offset applied to numeric epoch timestamps
+                (default: +05:30, IST)
+            emit_batch_bars: Hold closed bars until at least this many are
+                ready, then emit them together (default: 1)
+            tick_batch: Ticks buffered by add_tick() before they are
+                processed as one batch (default: 10,000)
+        """
+        if bar_seconds <= 0:
+            raise ValueError("bar_seconds must be positive")
+        if grace_seconds < 0:
+            raise ValueError("grace_seconds cannot be negative")
+
+        self.sink = sink
+        self.bar_seconds = bar_seconds
+        self.grace_seconds = grace_seconds
+        self.emit_batch_bars = emit_batch_bars
+        self.tick_batch = tick_batch
+
+        self._bar_ns = int(bar_seconds * _NS)
+        self._grace_ns = int(grace_seconds * _NS)
+        self._open_ns = _time_of_day_ns(session_start)
+        self._close_ns = _time_of_day_ns(session_end)
+        if self._close_ns <= self._open_ns:
+            raise ValueError("session_end must be after session_start")
+        self._utc_offset_ns = int(utc_offset.total_seconds() * _NS)
+        # Bucket ids are day * buckets_per_day + bar index within the session
+        self._buckets_per_day = -(-(self._close_ns - self._open_ns) // self._bar_ns)
+
+        self._symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._state: Optional[Dict[str, np.ndarray]] = None
+        self._with_oi = False
+        self._watermark = np.iinfo(np.int64).min
+        self._closed: List[pl.DataFrame] = []
+        self._closed_count = 0
+        self._pending: Dict[str, list] = {
+            "symbols": [],
+            "times": [],
+            "prices": [],
+            "volumes": [],
+            "oi": [],
+        }
+
+        self.ticks_processed = 0
+        self.late_ticks = 0
+        self.out_of_session_ticks = 0
+        self.bars_closed = 0
+
+    @property
+    def watermark(self) -> Optional[np.datetime64]:
+        """Latest tick time seen, or None before the first tick."""
+        if self._watermark == np.iinfo(np.int64).min:
+            return None
+        return np.datetime64(self._watermark, "ns")
+
+    @property
+    def open_bars(self) -> int:
+        """Number of bars still accepting ticks."""
+        return 0 if self._state is None else len(self._state["sym"])
+
+    def _symbol_codes(self, symbols) -> np.ndarray:
+        """Map symbols (str, array of str, or registered ids) to slot ids."""
+        if isinstance(symbols, str):
+            return np.full(1, self._register(symbols), dtype=np.int32)
+        symbols = np.asarray(symbols)
+        if symbols.dtype.kind in "iu":
+            return symbols.astype(np.int32)
+        codes, uniques = pd.factorize(symbols)
+        mapping = np.fromiter(
+            (self._register(s) for s in uniques), dtype=np.int32, count=len(uniques)
+        )
+        return mapping[codes]
+
+    def _register(self, symbol: str) -> int:
+        """Get or assign the slot id of a symbol."""
+        slot = self._symbol_ids.get(symbol)
+        if slot is None:
+            slot = len(self._symbols)
+            self._symbol_ids[symbol] = slot
+            self._symbols.append(symbol)
+        return slot
+
+    def symbol_id(self, symbol: str) -> int:
+        """
+        Get the slot id of a symbol, registering it if new.
+
+        Passing slot ids instead of strings to update() skips symbol hashing.
+
+        Args:
+            symbol: Security symbol
+
+        Returns:
+            Integer slot id
+        """
+        return self._register(symbol)
+
+    def _to_ns(self, times) -> np.ndarray:
+        """Convert tick times to local wall-clock nanoseconds."""
+        times = np.asarray(times)
+        if times.dtype.kind == "M":
+            return times.astype("datetime64[ns]").view(np.int64)
+        if times.dtype.kind == "f":
+            return (times * _NS).astype(np.int64) + self._utc_offset_ns
+        if times.dtype.kind in "iu":
+            return times.astype(np.int64) * _NS + self._utc_offset_ns
+        if times.dtype == object:
+            return pd.DatetimeIndex(times).tz_localize(None).as_unit("ns").asi8
+        raise TypeError(f"Unsupported tick time dtype: {times.dtype}")
+
+    def _bucket_end(self, bucket: np.ndarray) -> np.ndarray:
+        """End of each bucket in ns, capped at the session close."""
+        day, index = np.divmod(bucket, self._buckets_per_day)
+        end = self._open_ns + (index + 1) * self._bar_ns
+        return day * _DAY_NS + np.minimum(end, self._close_ns)
+
+    def update(self, symbols, times, prices, volumes, oi=None) -> int:
+        """
+        Aggregate a batch of ticks and close bars the watermark has passed.
+
+        Ticks are taken in arrival order: each tick's lateness is judged
+        against the watermark of the ticks before it.
+
+        Args:
+            symbols: One symbol for all ticks, an array of symbols, or an
+                integer array of slot ids from symbol_id()
+            times: datetime64 array, datetimes, or UTC epoch seconds
+            prices: Trade prices
+            volumes: Trade quantities
+            oi: Optional open interest per tick; None or NaN for ticks
+                without one
+
+        Returns:
+            Number of bars closed by this batch
+
+        Raises:
+            Exception: Whatever the sink raised; the closed bars stay
+                queued and are emitted again by the next call
+        """
+        times = self._to_ns(times)
+        n = len(times)
+        if n == 0:
+            return 0
+        sym = self._symbol_codes(symbols)
+        if len(sym) == 1 and n > 1:
+            sym = np.broadcast_to(sym, n)
+        prices = np.asarray(prices, dtype=np.float64)
+        volumes = np.asarray(volumes, dtype=np.int64)
+        if oi is None:
+            oi = np.full(n, _MISSING_OI, dtype=np.int64)
+        else:
+            oi = _oi_array(oi)
+            self._with_oi = True
+
+        day, time_of_day = np.divmod(times, _DAY_NS)
+        in_session = (time_of_day >= self._open_ns) & (time_of_day < self._close_ns)
+        bucket = (
+            day * self._buckets_per_day + (time_of_day - self._open_ns) // self._bar_ns
+        )
+
+        # Watermark before each tick: running max of everything that came earlier
+        seen = np.maximum.accumulate(times)
+        before = np.empty_like(seen)
+        before[0] = self._watermark
+        np.maximum(seen[:-1], self._watermark, out=before[1:])
+        late = in_session & (self._bucket_end(bucket) + self._grace_ns <= before)
+        self._watermark = max(self._watermark, int(seen[-1]))
+
+        keep = in_session & ~late
+        late_count = int(late.sum())
+        self.late_ticks += late_count
+        self.out_of_session_ticks += n - int(in_session.sum())
+        if late_count:
+            logger.debug(f"Dropped {late_count} late ticks")
+
+        if keep.all():
+            ticks = {
+                "sym": sym,
+                "bucket": bucket,
+                "first": times,
+                "price": prices,
+                "volume": volumes,
+                "oi": oi,
+            }
+        else:
+            ticks = {
+                "sym": sym[keep],
+                "bucket": bucket[keep],
+                "first": times[keep],
+                "price": prices[keep],
+                "volume": volumes[keep],
+                "oi": oi[keep],
+            }
+        if len(ticks["sym"]):
+            self.ticks_processed += len(ticks["sym"])
+            price = ticks.pop("price")
+            ticks.update(
+                last=ticks["first"], open=price, high=price, low=price, close=price
+            )
+            bars = _reduce(ticks, int(ticks["bucket"].min()))
+            if self._state is not None:
+                merged = {f: np.concatenate((self._state[f], bars[f])) for f in _FIELDS}
+                bars = _reduce(merged, int(merged["bucket"].min()))
+            self._state = bars
+
+        return self._close_until(self._watermark)
+
+    def add_tick(
+        self,
+        symbol: str,
+        time,
+        price: float,
+        volume: int,
+        oi: Optional[int] = None,
+    ) -> int:
+        """
+        Buffer one tick; the buffer is processed every tick_batch ticks.
+
+        Args:
+            symbol: Security symbol
+            time: Tick time (datetime, datetime64 or UTC epoch seconds)
+            price: Trade price
+            volume: Trade quantity
+            oi: Optional open interest
+
+        Returns:
+            Number of bars closed if the buffer was processed, else 0
+        """
+        pending = self._pending
+        pending["symbols"].append(self._register(symbol))
+        pending["times"].append(time)
+        pending["prices"].append(price)
+        pending["volumes"].append(volume)
+        pending["oi"].append(oi)
+        if len(pending["times"]) >= self.tick_batch:
+            return self.process()
+        return 0
+
+    def process(self) -> int:
+        """
+        Aggregate ticks buffered by add_tick().
+
+        Returns:
+            Number of bars closed
+        """
+        pending = self._pending
+        if not pending["times"]:
+            return 0
+        self._pending = {key: [] for key in pending}
+        oi = pending["oi"]
+        return self.update(
+            np.array(pending["symbols"], dtype=np.int32),
+            pending["times"],
+            pending["prices"],
+            pending["volumes"],
+            None if all(v is None for v in oi) else oi,
+        )
+
+    def advance(self, now: Union[datetime.datetime, np.datetime64]) -> int:
+        """
+        Process buffered ticks and move the watermark to now.
+
+        Call periodically with the exchange clock so bars of quiet symbols
+        close on time even when no new ticks arrive.
+
+        Args:
+            now: Current local exchange time
+
+        Returns:
+            Number of bars closed
+        """
+        closed = self.process()
+        now_ns = int(np.datetime64(now, "ns").astype(np.int64))
+        self._watermark = max(self._watermark, now_ns)
+        return closed + self._close_until(self._watermark)
+
+    def flush(self) -> int:
+        """
+        Close and emit every open bar, e.g. at the end of the session.
+
+        Returns:
+            Number of bars closed
+
+        Raises:
+            Exception: Whatever the sink raised; the bars stay queued and a
+                second flush() emits them again
+        """
+        closed = self.process() + self._close_until(np.iinfo(np.int64).max)
+        self._emit(force=True)
+        return closed
+
+    def _close_until(self, watermark: int) -> int:
+        """Close bars whose end plus grace is at or before the watermark."""
+        state = self._state
+        if state is None:
+            return 0
+        if watermark == np.iinfo(np.int64).max:
+            done = np.ones(len(state["sym"]), dtype=bool)
+        else:
+            done = self._bucket_end(state["bucket"]) + self._grace_ns <= watermark
+        if not done.any():
+            return 0
+
+        closed = {f: state[f][done] for f in _FIELDS}
+        self._state = None if done.all() else {f: state[f][~done] for f in _FIELDS}
+
+        order = np.lexsort((closed["bucket"], closed["sym"]))
+        day, index = np.divmod(closed["bucket"][order], self._buckets_per_day)
+        start = day * _DAY_NS + self._open_ns + index * self._bar_ns
+        frame = pl.DataFrame(
+            {
+                "symbol": np.array(self._symbols)[closed["sym"][order]],
+                "datetime": start.astype("datetime64[ns]"),
+                "open": closed["open"][order],
+                "high": closed["high"][order],
+                "low": closed["low"][order],
+                "close": closed["close"][order],
+                "volume": closed["volume"][order],
+                "oi": closed["oi"][order],
+            }
+        )
+        if self._with_oi:
+            frame = frame.with_columns(
+                pl.when(pl.col("oi") != _MISSING_OI).then(pl.col("oi")).alias("oi")
+            )
+        else:
+            frame = frame.drop("oi")
+        self._closed.append(frame)
+        self._closed_count += frame.height
+        self.bars_closed += frame.height
+        self._emit()
+        return frame.height
+
+    def _emit(self, force: bool = False):
+        """
+        Send held closed bars to the sink once enough are ready.
+
+        Bars the sink did not take are put back at the head of the queue
+        and the sink's error propagates.
+        """
+        if self.sink is None or not self._closed:
+            return
+        if not force and self._closed_count < self.emit_batch_bars:
+            return
+        bars = self.pop_bars()
+
+        sent = 0
+        try:
+            if isinstance(self.sink, DataHandler):
+                self._write_bars(self.sink, bars)
+                sent = bars.height
+            elif isinstance(self.sink, LiveBarWriter):
+                for row in bars.iter_rows(named=True):
+                    self.sink.submit(row.pop("symbol"), row)
+                    sent += 1
+            else:
+                self.sink(bars)
+                sent = bars.height
+        except Exception as e:
+            unsent = bars.slice(sent)
+            self._closed.insert(0, unsent)
+            self._closed_count += unsent.height
+            logger.error(f"Emitting {unsent.height} bars failed, kept for a retry: {e}")
+            raise
+
+    @staticmethod
+    def _write_bars(handler: DataHandler, bars: pl.DataFrame):
+        """Write closed bars to a DataHandler in one transaction."""
+        # Not inject_data: its errors are logged, not raised, and the bars
+        # would be lost with a committed transaction
+        bars = bars.with_columns(pl.col("datetime").dt.strftime(DATETIME_FORMAT))
+        with handler.transaction() as conn:
+            for (symbol,), frame in bars.partition_by(
+                "symbol", as_dict=True, maintain_order=True
+            ).items():
+                frame = frame.drop("symbol")
+                column_types = {
+                    name: _sql_type(dtype) for name, dtype in frame.schema.items()
+                }
+                handler._create_table(conn, symbol, column_types)
+                handler._insert_rows(conn, symbol, frame.columns, frame.iter_rows())
+
+    def pop_bars(self) -> pl.DataFrame:
+        """
+        Take the closed bars not yet emitted.
+
+        Returns:
+            DataFrame with symbol, datetime, open, high, low, close, volume
+            and oi columns, ordered by symbol then datetime within each batch
+        """
+        if not self._closed:
+            return pl.DataFrame()
+        bars = pl.concat(self._closed) if len(self._closed) > 1 else self._closed[0]
+        self._closed = []
+        self._closed_count = 0
+        return bars
@@ -0,0 +1,64 @@
+"""
+Shared fixtures for the benchmark suite.
+
+Builds session-scoped datasets and databases from the synthetic NSE
+session bars of tests/market_data.py, so every benchmark runs against the same
+realistic data shape.
+
+Dataset size is controlled from the command line:
+
+    pytest tests/benchmarks --bench-symbols 20 --bench-years 3
+
+Results are autosaved under .benchmarks/ (see pyproject.toml); compare a
+run against the previous one with ``--benchmark-compare``.
+"""
+
+from pathlib import Path
+from typing import Dict
+
+import polars as pl
+import pytest
+
+from market_data import generate_session_bars
+
+
+@pytest.fixture(scope="session")
+def bench_size(request) -> Dict[str, int]:
+    """Dataset size from the command line."""
+    return {
+        "symbols": request.config.getoption("--bench-symbols"),
+        "years": request.config.getoption("--bench-years"),
+    }
+
+
+@pytest.fixture(scope="session")
+def market_bars(bench_size) -> Dict[str, pl.DataFrame]:
+    """Synthetic bars for --bench-symbols symbols over --bench-years years."""
+    symbols = [f"SYN{i:03d}" for i in range(bench_size["symbols"])]
+    return generate_session_bars(symbols, years=bench_size["years"])
+
+
+@pytest.fixture(scope="session")
+def populated_db(tmp_path_factory, market_bars) -> Path:
+    """Database holding every synthetic symbol, built once per session."""
+    from quant_toolkit.sqlite_data_manager import DataHandler
+
+    db_path = tmp_path_factory.mktemp("db") / "bench.db"
+    handler = DataHandler(db_path)
+    with handler.transaction() as conn:
+        for symbol, bars in market_bars.items():
+            handler.inject_data(symbol, bars, conn=conn)
+    handler.pool.close_all()
+    return db_path
+
+
+@pytest.fixture
+def empty_db(tmp_path) -> Path:
+    """Path for a fresh database."""
+    return tmp_path / "bench.db"
+
+
+@pytest.fixture(scope="session")
+def bench_symbol(market_bars) -> str:
+    """The symbol single-symbol benchmarks read and write."""
+    return next(iter(market_bars))
@@ -0,0 +1,70 @@
+"""
+Import-time benchmarks for quant_toolkit.
+
+Short cron scripts spend most of their runtime importing, so package import
+must stay cheap and side-effect free. An import is only cold once per
+process, so every measurement runs in a fresh interpreter; the "pass"
+case is the interpreter startup baseline to subtract.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+MODULES = ["quant_toolkit", "quant_toolkit.sqlite_data_manager"]
+
+# Backends that must only be imported on first use
+HEAVY_MODULES = (
+    "pandas",
+    "polars",
+    "pyarrow",
+    "numpy",
+    "pydantic",
+    "aiohttp",
+    "aiofiles",
+    "dotenv",
+    "filelock",
+)
+
+
+def _run(code: str, cwd: Path) -> str:
+    """Run code in a fresh interpreter importing quant_toolkit from src."""
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    env.pop("LOG_PATH", None)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+@pytest.mark.benchmark
+@pytest.mark.performance
+@pytest.mark.parametrize("statement", ["pass"] + [f"import {m}" for m in MODULES])
+def test_import_time(benchmark, statement, tmp_path):
+    benchmark.group = "import-time"
+    benchmark.pedantic(_run, args=(statement, tmp_path), rounds=5, iterations=1)
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_loads_no_heavy_backends(module, tmp_path):
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert _run(code, tmp_path).strip() == ""
+
+
+@pytest.mark.parametrize("module", MODULES)
+def test_import_has_no_filesystem_side_effects(module, tmp_path):
+    _run(f"import {module}", tmp_path)
+    assert list(tmp_path.iterdir()) == []
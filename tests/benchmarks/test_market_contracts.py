@@ -0,0 +1,69 @@
+"""
+Benchmarks for MarketContracts ticker generation and expiry lookups.
+
+Holiday lists are warmed before timing, so these measure steady-state
+ticker generation rather than the one-off holiday fetch.
+"""
+
+import datetime
+
+import numpy as np
+import pytest
+
+from quant_toolkit.market_contracts import MarketConfig, MarketContracts
+
+from market_data import REFERENCE_DATA, trading_days
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.performance]
+
+
+@pytest.fixture(scope="module")
+def contracts():
+    patch = pytest.MonkeyPatch()
+    patch.setattr(MarketConfig, "HOLIDAY_CSV_PATH", str(REFERENCE_DATA))
+    mc = MarketContracts()
+    for year in (2024, 2025):
+        mc.get_holiday_list(year)
+    yield mc
+    patch.undo()
+
+
+@pytest.fixture(scope="module")
+def days_2024():
+    return [d.item() for d in trading_days(2024, 1)]
+
+
+def test_future_tickers_one_year(benchmark, contracts, days_2024):
+    benchmark.group = "tickers"
+    benchmark.extra_info["tickers"] = len(days_2024)
+    tickers = benchmark(
+        lambda: [
+            contracts.future("NSE", "NIFTY", "current_month", d) for d in days_2024
+        ]
+    )
+    # Trading days after the December expiry roll into the January 2025 contract
+    assert len(set(tickers)) == 13
+
+
+def test_weekly_option_tickers_one_year(benchmark, contracts, days_2024):
+    benchmark.group = "tickers"
+    benchmark.extra_info["tickers"] = len(days_2024)
+    tickers = benchmark(
+        lambda: [
+            contracts.option("NSE", "NIFTY", 22000, "CE", "current_week", d)
+            for d in days_2024
+        ]
+    )
+    assert len(tickers) == len(days_2024)
+
+
+def test_monthly_expiries_two_years(benchmark, contracts):
+    benchmark.group = "expiries"
+    expiries = benchmark(
+        contracts.monthly_expiries,
+        "NSE",
+        datetime.date(2024, 1, 1),
+        datetime.date(2025, 12, 31),
+    )
+    assert len(expiries) == 24
+    assert all(np.is_busday(expiries))
@@ -0,0 +1,54 @@
+"""
+Benchmarks for QuantLogger per-call overhead.
+
+Each decorated call formats an entry and writes it to the daily log file,
+so the difference to the undecorated baseline is the cost every
+@QuantLogger method in the library adds.
+"""
+
+import asyncio
+
+import pytest
+
+from quant_toolkit.quantlogger import QuantLogger
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.performance]
+
+CALLS = 100
+
+
+def plain(x: int) -> int:
+    return x + 1
+
+
+@QuantLogger(log_time=True, to_stdout=False)
+def timed(x: int) -> int:
+    return x + 1
+
+
+@QuantLogger(log_time=True, log_args=True, log_result=True, to_stdout=False)
+def verbose(x: int) -> int:
+    return x + 1
+
+
+@QuantLogger(log_time=True, to_stdout=False)
+async def timed_async(x: int) -> int:
+    return x + 1
+
+
+@pytest.mark.parametrize("func", [plain, timed, verbose], ids=lambda f: f.__name__)
+def test_sync_call_overhead(benchmark, func):
+    benchmark.group = "quantlogger-sync"
+    benchmark.extra_info["calls"] = CALLS
+    benchmark(lambda: [func(i) for i in range(CALLS)])
+
+
+def test_async_call_overhead(benchmark):
+    async def run():
+        for i in range(CALLS):
+            await timed_async(i)
+        await QuantLogger.flush_logs()
+
+    benchmark.group = "quantlogger-async"
+    benchmark.extra_info["calls"] = CALLS
+    benchmark(lambda: asyncio.run(run()))
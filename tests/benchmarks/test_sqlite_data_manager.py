@@ -0,0 +1,374 @@
+"""
+Benchmarks for DataHandler ingest, reads and integrity checks.
+
+Every benchmark runs on the synthetic NSE session bars from conftest.py
+(one year of minute bars per symbol by default; see --bench-symbols and
+--bench-years).
+"""
+
+import itertools
+import tracemalloc
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import polars as pl
+import pytest
+
+from market_data import BARS_PER_SESSION, generate_session_bars
+from quant_toolkit.sqlite_data_manager import (
+    DATETIME_FORMAT,
+    ConnectionPool,
+    DataHandler,
+    ValidationRules,
+    _validate_pandas,
+    _validate_polars,
+)
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.performance]
+
+# get_security_data arguments compared when loading the whole universe
+PROJECTIONS = {
+    "all-columns": {},
+    "close": {"columns": ["close"]},
+    "close-compact": {"columns": ["close"], "dtypes": "compact"},
+    "all-compact": {"dtypes": "compact"},
+}
+
+
+def _row_count(handler: DataHandler, symbol: str) -> int:
+    with handler.read_connection() as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM "{symbol}"').fetchone()[0]
+
+
+def _bar_count(handler: DataHandler, symbol: str) -> int:
+    return len(handler.get_security_data(symbol, columns=["close"]))
+
+
+@pytest.fixture
+def fresh_handler(empty_db):
+    handler = DataHandler(empty_db)
+    yield handler
+    handler.pool.close_all()
+
+
+@pytest.fixture(scope="module")
+def monthly_chunks(market_bars):
+    """Every symbol's bars as monthly Arrow tables, the shape of a backfill."""
+    chunks = []
+    for symbol, bars in market_bars.items():
+        months = bars.with_columns(pl.col("datetime").dt.truncate("1mo").alias("month"))
+        for month in months.partition_by(
+            "month", maintain_order=True, include_key=False
+        ):
+            chunks.append((symbol, month.to_arrow()))
+    return chunks
+
+
+@pytest.fixture(scope="module")
+def validation_frame(request) -> pl.DataFrame:
+    """--bench-validate-rows bars with 0.1% late duplicates and 0.1% broken bars."""
+    rows = request.config.getoption("--bench-validate-rows")
+    years = -(-rows // (BARS_PER_SESSION * 240))
+    bars = generate_session_bars(["VALIDATE"], years=years)["VALIDATE"].head(rows)
+    broken = pl.int_range(pl.len()) % 1000 == 999
+    bars = bars.with_columns(
+        pl.when(broken).then(pl.col("low") - 1).otherwise(pl.col("high")).alias("high")
+    )
+    # Corrections of earlier bars arriving at the end, out of order
+    late = bars.gather_every(1000, offset=500).reverse()
+    return pl.concat([bars.head(rows - late.height), late])
+
+
+def _peak_rss_mb(func) -> float:
+    """
+    Peak resident memory of the process while func runs, in MB.
+
+    Counts what tracemalloc cannot see (polars and Arrow allocate natively).
+    Linux only: resets the kernel's high-water mark first; NaN elsewhere.
+    """
+    clear_refs, status = Path("/proc/self/clear_refs"), Path("/proc/self/status")
+    if not clear_refs.exists():
+        func()
+        return float("nan")
+
+    def resident(field):
+        line = next(
+            line for line in status.read_text().splitlines() if line.startswith(field)
+        )
+        return int(line.split()[1]) / 1024
+
+    before = resident("VmRSS")
+    clear_refs.write_text("5")
+    func()
+    return round(resident("VmHWM") - before, 1)
+
+
+def _baseline_validate(data: pd.DataFrame) -> pd.DataFrame:
+    """inject_data's validation before it was fused: a copy per step."""
+    data = data.copy()
+    data["datetime"] = data["datetime"].dt.strftime(DATETIME_FORMAT)
+    invalid_ohlc = (
+        (data["high"] < data["low"])
+        | (data["high"] < data["open"])
+        | (data["high"] < data["close"])
+        | (data["low"] > data["open"])
+        | (data["low"] > data["close"])
+    )
+    if invalid_ohlc.any():
+        data = data[~invalid_ohlc]
+    duplicates = data.duplicated(subset=["datetime"], keep="last")
+    if duplicates.any():
+        data = data[~duplicates]
+    return data.sort_values("datetime")
+
+
+@pytest.fixture(scope="module")
+def read_handler(populated_db):
+    handler = DataHandler(populated_db)
+    yield handler
+    handler.pool.close_all()
+
+
+def test_inject_data_polars(benchmark, fresh_handler, market_bars, bench_symbol):
+    bars = market_bars[bench_symbol]
+    benchmark.group = "inject"
+    benchmark.extra_info["rows"] = bars.height
+    benchmark.pedantic(
+        fresh_handler.inject_data,
+        args=(bench_symbol, bars),
+        kwargs={"if_exists": "replace"},
+        rounds=3,
+        iterations=1,
+    )
+    assert _row_count(fresh_handler, bench_symbol) == bars.height
+
+
+def test_inject_data_pandas(benchmark, fresh_handler, market_bars, bench_symbol):
+    bars = market_bars[bench_symbol].to_pandas()
+    benchmark.group = "inject"
+    benchmark.extra_info["rows"] = len(bars)
+    benchmark.pedantic(
+        fresh_handler.inject_data,
+        args=(bench_symbol, bars),
+        kwargs={"if_exists": "replace"},
+        rounds=3,
+        iterations=1,
+    )
+    assert _row_count(fresh_handler, bench_symbol) == len(bars)
+
+
+def test_inject_arrow(benchmark, fresh_handler, market_bars, bench_symbol):
+    table = market_bars[bench_symbol].to_arrow()
+    benchmark.group = "inject"
+    benchmark.extra_info["rows"] = table.num_rows
+    benchmark.pedantic(
+        fresh_handler.inject_arrow,
+        args=(bench_symbol, table),
+        kwargs={"if_exists": "replace"},
+        rounds=3,
+        iterations=1,
+    )
+    assert _row_count(fresh_handler, bench_symbol) == table.num_rows
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("pipeline", ["baseline-pandas", "pandas", "polars"])
+def test_validate_pipeline(benchmark, validation_frame, pipeline):
+    """Time and traced peak memory of ingest validation on --bench-validate-rows."""
+    rules = ValidationRules()
+    data = validation_frame if pipeline == "polars" else validation_frame.to_pandas()
+
+    def validate():
+        if pipeline == "polars":
+            return _validate_polars(data, "VALIDATE", rules)
+        if pipeline == "pandas":
+            return _validate_pandas(data, "VALIDATE", rules)
+        return _baseline_validate(data)
+
+    tracemalloc.start()
+    rows = len(validate())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    benchmark.group = "validate"
+    benchmark.extra_info["rows"] = len(data)
+    # Python heap and numpy buffers only: Arrow-backed strings and polars
+    # frames are allocated natively and missing from this figure
+    benchmark.extra_info["peak_mb"] = round(peak / 1e6, 1)
+    benchmark.extra_info["peak_rss_mb"] = _peak_rss_mb(validate)
+    benchmark.pedantic(validate, rounds=1, iterations=1)
+    # Broken bars and late duplicates are gone
+    valid = validation_frame.filter(pl.col("high") >= pl.col("low"))
+    assert rows == valid["datetime"].n_unique()
+
+
+@pytest.mark.parametrize("mode", ["regular", "bulk"])
+def test_bulk_load(benchmark, tmp_path, monthly_chunks, mode):
+    counter = itertools.count()
+    handlers = []
+
+    def setup():
+        handler = DataHandler(tmp_path / f"bulk-{next(counter)}.db")
+        handlers.append(handler)
+        return (handler,), {}
+
+    def load(handler):
+        if mode == "bulk":
+            with handler.bulk_load() as loader:
+                for symbol, chunk in monthly_chunks:
+                    loader.inject(symbol, chunk)
+        else:
+            for symbol, chunk in monthly_chunks:
+                handler.inject_arrow(symbol, chunk)
+
+    benchmark.group = "bulk-load"
+    benchmark.extra_info["chunks"] = len(monthly_chunks)
+    benchmark.extra_info["rows"] = sum(chunk.num_rows for _, chunk in monthly_chunks)
+    benchmark.pedantic(load, setup=setup, rounds=3, iterations=1)
+    for handler in handlers:
+        handler.pool.close_all()
+    assert _row_count(handlers[-1], monthly_chunks[0][0]) == sum(
+        chunk.num_rows
+        for symbol, chunk in monthly_chunks
+        if symbol == monthly_chunks[0][0]
+    )
+
+
+def test_get_security_data_full(benchmark, read_handler, market_bars, bench_symbol):
+    benchmark.group = "read"
+    result = benchmark(read_handler.get_security_data, bench_symbol)
+    assert len(result) == market_bars[bench_symbol].height
+
+
+@pytest.mark.parametrize("shared_cache", [False, True], ids=["memdb", "shared-cache"])
+def test_open_in_memory(benchmark, populated_db, market_bars, shared_cache):
+    benchmark.group = "in-memory"
+    handler = benchmark.pedantic(
+        DataHandler.open_in_memory,
+        args=(populated_db,),
+        kwargs={"shared_cache": shared_cache},
+        rounds=3,
+        iterations=1,
+    )
+    assert handler.get_available_securities() == list(market_bars)
+
+
+def test_get_security_data_in_memory(
+    benchmark, populated_db, market_bars, bench_symbol
+):
+    handler = DataHandler.open_in_memory(populated_db, symbols=[bench_symbol])
+    benchmark.group = "read"
+    result = benchmark(handler.get_security_data, bench_symbol)
+    assert len(result) == market_bars[bench_symbol].height
+
+
+def test_get_security_data_with_timeout(
+    benchmark, read_handler, market_bars, bench_symbol
+):
+    # A deadline that never fires: the cost of the progress-handler checks
+    benchmark.group = "read"
+    result = benchmark(read_handler.get_security_data, bench_symbol, timeout=60.0)
+    assert len(result) == market_bars[bench_symbol].height
+
+
+def test_get_security_data_last_30_days(benchmark, read_handler, bench_symbol):
+    benchmark.group = "read"
+    result = benchmark(read_handler.get_security_data, bench_symbol, start_datetime=30)
+    assert 0 < len(result) < 31 * 375
+
+
+def test_tail_warmup(benchmark, read_handler, bench_symbol):
+    """Last 500 bars via the datetime index, independent of table size."""
+    benchmark.group = "read"
+    result = benchmark(read_handler.tail, bench_symbol, 500, columns=["close"])
+    assert len(result) == 500
+    assert result["datetime"].is_monotonic_increasing
+
+
+def test_get_security_data_opening_window(benchmark, read_handler, bench_symbol):
+    """First 30 minutes of every session, filtered in SQL via the time index."""
+    benchmark.group = "read"
+    result = benchmark(
+        read_handler.get_security_data, bench_symbol, time_from="09:15", time_to="09:44"
+    )
+    assert len(result) % 30 == 0
+    assert result["datetime"].dt.strftime("%H:%M").between("09:15", "09:44").all()
+
+
+def test_latest_bars(benchmark, read_handler, market_bars):
+    """Newest bar of every symbol: one index seek per symbol on one connection."""
+    benchmark.group = "read"
+    benchmark.extra_info["symbols"] = len(market_bars)
+    snapshot = benchmark(read_handler.latest_bars)
+    assert sorted(snapshot.index) == sorted(market_bars)
+
+
+def test_process_pool_universe(benchmark, read_handler, market_bars):
+    symbols = list(market_bars)
+    benchmark.group = "multiprocessing"
+    benchmark.extra_info["symbols"] = len(symbols)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        # Handlers pickle as their configuration; workers open their own pools
+        counts = benchmark(
+            lambda: list(pool.map(_bar_count, [read_handler] * len(symbols), symbols))
+        )
+    assert counts == [bars.height for bars in market_bars.values()]
+
+
+@pytest.mark.parametrize("max_size", [2, 8], ids=["fixed", "adaptive"])
+def test_pool_burst(benchmark, populated_db, bench_symbol, max_size):
+    # 16 threads against a base size of 2: a fixed pool queues them, an
+    # adaptive one grows after 50ms of waiting
+    handler = DataHandler(populated_db)
+    handler.pool = ConnectionPool(populated_db, pool_size=2, max_size=max_size)
+
+    def burst():
+        with ThreadPoolExecutor(max_workers=16) as threads:
+            return list(
+                threads.map(lambda _: handler.tail(bench_symbol, 5_000), range(64))
+            )
+
+    benchmark.group = "pool"
+    frames = benchmark.pedantic(burst, rounds=3, iterations=1)
+    stats = handler.pool_stats()
+    benchmark.extra_info.update(
+        size=stats.size, waits=stats.waits, max_wait_ms=stats.max_wait_ms
+    )
+    handler.pool.close_all()
+    assert all(len(frame) == 5_000 for frame in frames)
+    assert stats.timeouts == 0 and stats.size <= max_size
+
+
+def test_check_db_integrity(benchmark, read_handler, market_bars):
+    benchmark.group = "integrity"
+    benchmark.extra_info["symbols"] = len(market_bars)
+    report = benchmark(read_handler.check_db_integrity, min_years=1)
+    assert len(report) == len(market_bars)
+
+
+@pytest.mark.parametrize("projection", list(PROJECTIONS))
+def test_load_universe_projection(benchmark, read_handler, market_bars, projection):
+    """
+    Load every symbol, as a cross-sectional study does.
+
+    Run with --bench-symbols 500 for the size of the NSE stocks universe.
+    Result size and peak traced memory of one load are in extra_info.
+    """
+    kwargs = PROJECTIONS[projection]
+
+    def load():
+        return {s: read_handler.get_security_data(s, **kwargs) for s in market_bars}
+
+    tracemalloc.start()
+    frames = load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result_bytes = sum(f.memory_usage(deep=True).sum() for f in frames.values())
+    del frames
+
+    benchmark.group = "universe-projection"
+    benchmark.extra_info["symbols"] = len(market_bars)
+    benchmark.extra_info["result_mb"] = round(result_bytes / 1e6, 2)
+    benchmark.extra_info["peak_mb"] = round(peak / 1e6, 1)
+    benchmark.pedantic(load, rounds=3, iterations=1)
@@ -0,0 +1,44 @@
+"""Project-wide pytest options and fixtures."""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    # Declared here rather than in benchmarks/conftest.py: options are only
+    # read from conftests pytest loads at startup
+    group = parser.getgroup("quant_toolkit benchmarks")
+    group.addoption(
+        "--bench-symbols",
+        type=int,
+        default=5,
+        help="Number of synthetic symbols in benchmark databases (default: 5)",
+    )
+    group.addoption(
+        "--bench-years",
+        type=int,
+        default=1,
+        help="Years of minute bars per synthetic symbol (default: 1)",
+    )
+    group.addoption(
+        "--bench-validate-rows",
+        type=int,
+        default=100_000,
+        help=(
+            "Rows in the ingest validation benchmarks (default: 100,000; "
+            "pass 10000000 for the full-size run, which needs several GB)"
+        ),
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def log_env(tmp_path_factory):
+    """Keep QuantLogger output and .env loading inside a temp directory."""
+    from quant_toolkit.quantlogger import QuantLogger
+
+    log_dir = tmp_path_factory.mktemp("logs")
+    patch = pytest.MonkeyPatch()
+    patch.setenv("LOG_PATH", str(log_dir))
+    patch.setenv("THIRD_PARTY_LOG_ENABLED", "false")
+    QuantLogger.set_global_path(log_dir)
+    yield log_dir
+    patch.undo()
@@ -0,0 +1,82 @@
+"""
+Unit tests for incremental backfills with BackfillOrchestrator.
+"""
+
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.backfill import BackfillOrchestrator
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+SYMBOLS = ["RELIANCE", "TCS", "INFY"]
+
+
+@pytest.fixture(scope="module")
+def history():
+    return generate_session_bars(SYMBOLS, years=1)
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = DataHandler(tmp_path / "stocks.db")
+    yield handler
+    handler.pool.close_all()
+
+
+def _rows(handler, symbol):
+    with handler.read_connection() as conn:
+        return conn.execute(f'SELECT COUNT(*) FROM "{symbol}"').fetchone()[0]
+
+
+def _backfill(handler, fetch):
+    orchestrator = BackfillOrchestrator(
+        fetch, handlers={"stocks": handler}, batch_rows={"stocks": 50_000}
+    )
+    return orchestrator.run({"stocks": SYMBOLS})["stocks"]
+
+
+def test_rerun_does_not_duplicate_rows(handler, history):
+    seen = []
+
+    def fetch(database, symbol, since):
+        # A broker that ignores since and resends everything it has
+        seen.append((symbol, since))
+        return history[symbol]
+
+    first = _backfill(handler, fetch)
+    assert first.rows == sum(bars.height for bars in history.values())
+    assert all(since is None for _, since in seen)
+
+    seen.clear()
+    second = _backfill(handler, fetch)
+    assert (second.rows, second.up_to_date, second.failed) == (0, len(SYMBOLS), [])
+    assert {symbol: since for symbol, since in seen} == {
+        symbol: bars["datetime"][-1] for symbol, bars in history.items()
+    }
+    for symbol, bars in history.items():
+        assert _rows(handler, symbol) == bars.height
+
+
+def test_appends_only_new_bars(handler, history):
+    cut = 10_000
+    _backfill(handler, lambda db, symbol, since: history[symbol].head(cut))
+    stats = _backfill(handler, lambda db, symbol, since: history[symbol])
+    assert stats.rows == sum(bars.height - cut for bars in history.values())
+    for symbol, bars in history.items():
+        stored = handler.get_security_data(symbol, columns=["close"])
+        assert len(stored) == bars.height and stored.index.is_unique
+
+
+def test_unreadable_cursors_fail_instead_of_refetching(handler, history, monkeypatch):
+    _backfill(handler, lambda db, symbol, since: history[symbol])
+    # latest_bars returns None when QuantLogger caught an error
+    monkeypatch.setattr(handler, "latest_bars", lambda *args, **kwargs: None)
+    fetched = []
+
+    stats = _backfill(handler, lambda db, symbol, since: fetched.append(symbol))
+    assert fetched == [] and stats.rows == 0
+    assert sorted(stats.failed) == sorted(SYMBOLS)
+    for symbol, bars in history.items():
+        assert _rows(handler, symbol) == bars.height
@@ -0,0 +1,91 @@
+"""
+Unit tests for BulkLoader chunked commits and rollback on failure.
+"""
+
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+KINDS = ["pandas", "polars", "arrow"]
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = DataHandler(tmp_path / "bulk.db")
+    yield handler
+    handler.pool.close_all()
+
+
+@pytest.fixture(scope="module")
+def chunks():
+    bars = generate_session_bars(["A"], years=1)["A"]
+    return [bars.slice(i * 100, 100) for i in range(4)]
+
+
+def _as(kind, frame):
+    if kind == "pandas":
+        return frame.to_pandas()
+    if kind == "arrow":
+        return frame.to_arrow()
+    return frame
+
+
+def _stored(handler) -> int:
+    if "A" not in handler.get_available_securities():
+        return 0
+    return len(handler.get_security_data("A", columns=["close"]))
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_commits_every_commit_rows(handler, chunks, kind):
+    with handler.bulk_load(commit_rows=250) as loader:
+        for frame in chunks:
+            assert loader.inject("A", _as(kind, frame)) == 100
+    # One commit after the third chunk, one when the load ends
+    assert (loader.rows, loader.commits) == (400, 2)
+    assert _stored(handler) == 400
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_failure_rolls_back_uncommitted_chunk(handler, chunks, kind):
+    with pytest.raises(RuntimeError, match="feed died"):
+        with handler.bulk_load(commit_rows=10_000_000) as loader:
+            loader.inject("A", _as(kind, chunks[0]))
+            raise RuntimeError("feed died")
+    assert loader.commits == 0
+    assert _stored(handler) == 0
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_failure_keeps_committed_chunks(handler, chunks, kind):
+    with pytest.raises(RuntimeError, match="feed died"):
+        with handler.bulk_load(commit_rows=250) as loader:
+            for frame in chunks:
+                loader.inject("A", _as(kind, frame))
+            raise RuntimeError("feed died")
+    assert loader.commits == 1
+    assert _stored(handler) == 300
+
+
+@pytest.mark.parametrize("kind", KINDS)
+def test_bad_input_raises_and_load_ends_cleanly(handler, chunks, kind):
+    bad = _as(kind, chunks[0].drop("volume"))
+    with pytest.raises(ValueError, match="Missing required columns"):
+        with handler.bulk_load() as loader:
+            loader.inject("A", bad)
+    assert (loader.rows, loader._symbols) == (0, [])
+    with handler.read_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_bad_input_can_be_skipped(handler, chunks):
+    with handler.bulk_load() as loader:
+        with pytest.raises(ValueError, match="Missing required columns"):
+            loader.inject("B", chunks[0].drop("volume"))
+        loader.inject("A", chunks[0])
+    assert loader._symbols == ["A"]
+    assert _stored(handler) == 100
+    assert handler.get_available_securities() == ["A"]
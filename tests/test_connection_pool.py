@@ -0,0 +1,93 @@
+"""
+Unit tests for ConnectionPool sizing: growth under waits, idle shrink and
+checkout timeouts.
+"""
+
+import threading
+import time
+
+import pytest
+
+from quant_toolkit.sqlite_data_manager import ConnectionPool
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    pools = []
+
+    def make(**kwargs):
+        pool = ConnectionPool(tmp_path / "pool.db", **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close_all()
+
+
+def test_pool_grows_under_waits_up_to_max_size(make_pool):
+    pool = make_pool(pool_size=1, max_size=3, grow_after=0.01, timeout=0.2)
+    held = [pool.get_connection() for _ in range(3)]
+
+    stats = pool.stats()
+    assert (stats.size, stats.open, stats.in_use) == (3, 3, 3)
+    assert stats.grown == 2
+    assert stats.waits == 2
+    assert [d.action for d in stats.decisions] == ["grow", "grow"]
+
+    # At max_size the checkout waits out timeout and fails
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="exhausted"):
+        pool.get_connection()
+    assert time.monotonic() - started >= 0.2
+    assert pool.stats().timeouts == 1
+
+    for conn in held:
+        pool.return_connection(conn)
+
+
+def test_idle_connections_expire_down_to_min_size(make_pool):
+    pool = make_pool(pool_size=1, min_size=1, max_size=3, grow_after=0.01, idle_ttl=0.3)
+    first, second, third = [pool.get_connection() for _ in range(3)]
+    for conn in (first, second, third):
+        pool.return_connection(conn)
+    assert pool.stats().idle == 3
+
+    # Most recently returned first, so the surplus is left to age out
+    conn = pool.get_connection()
+    assert conn is third
+    pool.return_connection(conn)
+
+    time.sleep(0.4)
+    assert pool.expire_idle() == 2
+    stats = pool.stats()
+    assert (stats.size, stats.open, stats.idle) == (1, 1, 1)
+    assert stats.expired == 2
+    assert stats.decisions[-1].action == "shrink"
+    # Nothing left above min_size
+    assert pool.expire_idle() == 0
+
+
+def test_waiting_checkout_takes_returned_connection(make_pool):
+    pool = make_pool(pool_size=1, max_size=1, timeout=5.0)
+    conn = pool.get_connection()
+    returner = threading.Timer(0.1, pool.return_connection, args=(conn,))
+    returner.start()
+    try:
+        assert pool.get_connection() is conn
+    finally:
+        returner.join()
+
+    stats = pool.stats()
+    assert stats.waits == 1
+    assert stats.max_wait_ms >= 50
+    assert stats.timeouts == 0
+    assert stats.grown == 0
+    pool.return_connection(conn)
+
+
+def test_pool_sizes_are_validated(make_pool):
+    with pytest.raises(ValueError, match="min_size <= pool_size <= max_size"):
+        make_pool(pool_size=4, max_size=2)
@@ -0,0 +1,140 @@
+"""
+Unit tests for ContinuousFuturesBuilder: roll adjustment and incremental
+extension.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.continuous_futures import PRICE_COLUMNS, ContinuousFuturesBuilder
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+START = datetime.date(2024, 1, 1)
+END = datetime.date(2024, 4, 30)
+
+# Contract k trades at spot + 10 * (k + 1) for "difference" and at
+# spot * (1 + 0.01 * (k + 1)) for "ratio", so every roll has a known gap
+PREMIUMS = {
+    "difference": lambda prices, k: prices + 10.0 * (k + 1),
+    "ratio": lambda prices, k: prices * (1 + 0.01 * (k + 1)),
+}
+
+
+@pytest.fixture(scope="module")
+def spot():
+    bars = generate_session_bars(["SPOT"], years=1)["SPOT"].to_pandas()
+    in_range = (bars["datetime"].dt.date >= START) & (bars["datetime"].dt.date <= END)
+    return bars[in_range].reset_index(drop=True)
+
+
+@pytest.fixture(scope="module")
+def handler(tmp_path_factory, spot):
+    handler = DataHandler(tmp_path_factory.mktemp("futures") / "futures.db")
+    # Every contract is stored over the whole range, so consecutive months overlap
+    with handler.transaction() as conn:
+        for symbol, method in (("DIFF", "difference"), ("RATIO", "ratio")):
+            builder = ContinuousFuturesBuilder(handler, symbol)
+            schedule = builder.roll_schedule(START, END)
+            for k, contract in enumerate(schedule["contract"]):
+                frame = spot.copy()
+                for column in PRICE_COLUMNS:
+                    frame[column] = PREMIUMS[method](frame[column], k)
+                handler.inject_data(contract, frame, conn=conn)
+    yield handler
+    handler.pool.close_all()
+
+
+@pytest.mark.parametrize("symbol, method", [("DIFF", "difference"), ("RATIO", "ratio")])
+def test_adjustment_removes_roll_gaps(handler, spot, symbol, method):
+    builder = ContinuousFuturesBuilder(handler, symbol, method=method)
+    series = builder.build(START, END)
+
+    contracts = len(builder.roll_schedule(START, END))
+    assert len(builder.rolls) == contracts - 1 == 4
+    assert series["datetime"].is_unique and len(series) == len(spot)
+    # Back-adjusted history is the spot curve at the last contract's premium
+    np.testing.assert_allclose(
+        series["close"].to_numpy(),
+        PREMIUMS[method](spot["close"].to_numpy(), contracts - 1),
+    )
+    # The newest contract keeps its real prices
+    last = series["contract"] == series["contract"].iloc[-1]
+    raw = handler.get_security_data(series["contract"].iloc[-1])
+    np.testing.assert_array_equal(
+        series.loc[last, "close"].to_numpy(), raw["close"].to_numpy()[-last.sum() :]
+    )
+
+
+@pytest.mark.parametrize("method", ["difference", "ratio"])
+def test_extend_matches_full_build(handler, method):
+    symbol = "DIFF" if method == "difference" else "RATIO"
+    incremental = ContinuousFuturesBuilder(handler, symbol, method=method)
+    incremental.build(START, "2024-02-14")
+    incremental.extend("2024-03-10")  # inside the same contract
+    extended = incremental.extend(END)  # across two rolls
+
+    full = ContinuousFuturesBuilder(handler, symbol, method=method)
+    rebuilt = full.build(START, END)
+
+    pd.testing.assert_frame_equal(extended, rebuilt)
+    pd.testing.assert_frame_equal(incremental.rolls, full.rolls)
+
+
+@pytest.mark.parametrize("method", ["difference", "ratio"])
+def test_extend_leaves_returned_series_unchanged(handler, method):
+    symbol = "DIFF" if method == "difference" else "RATIO"
+    builder = ContinuousFuturesBuilder(handler, symbol, method=method)
+    built = builder.build(START, "2024-02-14")
+    before = built.copy()
+
+    extended = builder.extend(END)  # across two rolls
+    pd.testing.assert_frame_equal(built, before)
+    assert extended is not built and len(extended) > len(built)
+    assert not np.allclose(
+        extended["close"].to_numpy()[: len(built)], built["close"].to_numpy()
+    )
+
+
+def test_roll_days_before_expiry(handler):
+    early = ContinuousFuturesBuilder(handler, "DIFF", roll_days_before_expiry=2)
+    series = early.build(START, END)
+    days = series.groupby(series["datetime"].dt.date)["contract"].first()
+
+    for row in early.roll_schedule(START, END).iloc[:-1].itertuples(index=False):
+        trading = [d for d in days.index if row.end <= d <= row.expiry]
+        # Two trading days before expiry, and the expiry itself, use the
+        # next contract
+        assert len(trading) == 3 and trading[0] == row.end
+        assert all(days[d] != row.contract for d in trading)
+        before = [d for d in days.index if d < row.end]
+        assert days[before[-1]] == row.contract
+
+    on_expiry = ContinuousFuturesBuilder(handler, "DIFF").build(START, END)
+    expiry_days = on_expiry.groupby(on_expiry["datetime"].dt.date)["contract"].first()
+    for row in early.roll_schedule(START, END).iloc[:-1].itertuples(index=False):
+        if row.expiry in expiry_days.index:
+            assert expiry_days[row.expiry] != days[row.expiry]
+
+
+def test_ratio_rejects_zero_close(tmp_path, spot):
+    handler = DataHandler(tmp_path / "zero.db")
+    try:
+        schedule = ContinuousFuturesBuilder(handler, "ZERO").roll_schedule(START, END)
+        for k, contract in enumerate(schedule["contract"][:2]):
+            frame = spot.copy()
+            for column in PRICE_COLUMNS:
+                frame[column] = frame[column] * k  # the first contract is all 0
+            handler.inject_data(contract, frame)
+
+        with pytest.raises(ValueError, match="method='difference'"):
+            ContinuousFuturesBuilder(handler, "ZERO", method="ratio").build(START, END)
+        series = ContinuousFuturesBuilder(handler, "ZERO").build(START, END)
+        assert np.isfinite(series["close"]).all()
+    finally:
+        handler.pool.close_all()
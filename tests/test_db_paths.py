@@ -0,0 +1,76 @@
+"""
+Unit tests for DBPaths' per-database handlers and the shared DataHandler
+registry behind them.
+"""
+
+import sqlite3
+
+import pytest
+
+from quant_toolkit.sqlite_data_manager import DataHandler, DBPaths
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(autouse=True)
+def release_shared():
+    yield
+    DataHandler.release_shared()
+
+
+@pytest.fixture
+def paths(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    return DBPaths()
+
+
+def test_handler_opens_each_database(paths):
+    for kind in DBPaths.DATABASES:
+        handler = paths.handler(kind)
+        assert handler.db_path == getattr(paths, f"{kind}_db_path")
+        assert paths.handler(kind) is handler
+
+
+@pytest.mark.parametrize("kind", ["data", "options", "INDEX"])
+def test_handler_rejects_unknown_kind(paths, kind):
+    with pytest.raises(ValueError, match="valid: index, futures, stocks"):
+        paths.handler(kind)
+
+
+def test_shared_handler_is_keyed_by_resolved_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    handler = DataHandler.shared("x.db")
+    assert DataHandler.shared("./x.db") is handler
+    assert DataHandler.shared(tmp_path / "sub" / ".." / "x.db") is handler
+    assert DataHandler.shared("y.db") is not handler
+
+
+def test_release_shared_closes_pools(tmp_path):
+    first = DataHandler.shared(tmp_path / "a.db")
+    other = DataHandler.shared(tmp_path / "b.db")
+    with first.transaction():
+        pass
+    assert first.pool.stats().open == 1
+
+    DataHandler.release_shared(tmp_path / "a.db")
+    assert first.pool.stats().open == 0
+    assert DataHandler.shared(tmp_path / "a.db") is not first
+    assert DataHandler.shared(tmp_path / "b.db") is other
+
+    DataHandler.release_shared()
+    assert DataHandler.shared(tmp_path / "b.db") is not other
+
+
+def test_symbol_cache_sees_tables_created_elsewhere(tmp_path):
+    handler = DataHandler.shared(tmp_path / "cache.db")
+    with handler.transaction() as conn:
+        conn.execute("CREATE TABLE A (datetime TEXT)")
+    assert handler.get_available_securities() == ["A"]
+    cached = handler._symbols_cache
+
+    # Another connection bumps schema_version in the file header
+    with sqlite3.connect(handler.db_path) as conn:
+        conn.execute("CREATE TABLE B (datetime TEXT)")
+    conn.close()
+    assert handler.get_available_securities() == ["A", "B"]
+    assert handler._symbols_cache[0] > cached[0]
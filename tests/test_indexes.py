@@ -0,0 +1,80 @@
+"""
+Unit tests for symbol table indexes: built on write, never on read.
+"""
+
+import sqlite3
+
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+BAR_INDEX_NAMES = {"A__datetime", "A__time_of_day"}
+
+
+def _indexes(handler):
+    with handler.read_connection() as conn:
+        return {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = DataHandler(tmp_path / "indexes.db")
+    bars = generate_session_bars(["A"], years=1)["A"].head(1_000)
+    handler.inject_data("A", bars)
+    yield handler
+    handler.pool.close_all()
+
+
+@pytest.fixture
+def legacy(handler):
+    """A table written before its indexes were built on write."""
+    with handler.transaction() as conn:
+        for name in BAR_INDEX_NAMES:
+            conn.execute(f'DROP INDEX "{name}"')
+    return handler
+
+
+def test_write_builds_bar_indexes(handler):
+    assert _indexes(handler) >= BAR_INDEX_NAMES
+
+
+@pytest.mark.parametrize("mode", ["read_only", "query_only"])
+def test_reads_work_without_write_access(legacy, mode):
+    if mode == "read_only":
+        conn = sqlite3.connect(f"file:{legacy.db_path}?mode=ro", uri=True)
+    else:
+        conn = sqlite3.connect(legacy.db_path)
+        conn.execute("PRAGMA query_only=ON")
+    try:
+        assert len(legacy.tail("A", 10, conn=conn)) == 10
+        assert len(legacy.page("A", limit=10, conn=conn)) == 10
+        assert legacy.latest_bars(conn=conn).index.tolist() == ["A"]
+        opening = legacy.get_security_data(
+            "A", time_from="09:15", time_to="09:15", conn=conn
+        )
+        assert len(opening) > 0
+        assert (opening["datetime"].dt.strftime("%H:%M") == "09:15").all()
+    finally:
+        conn.close()
+    # Reads went without the indexes instead of building them
+    assert not _indexes(legacy) & BAR_INDEX_NAMES
+
+
+def test_pooled_reads_do_not_build_indexes(legacy):
+    legacy.tail("A", 10)
+    legacy.page("A", limit=10)
+    legacy.latest_bars()
+    legacy.get_security_data("A", time_from="09:15", time_to="09:30")
+    assert not _indexes(legacy) & BAR_INDEX_NAMES
+
+
+def test_create_indexes_migrates_legacy_tables(legacy):
+    assert legacy.create_indexes() == 2
+    assert _indexes(legacy) >= BAR_INDEX_NAMES
+    assert legacy.create_indexes() == 0
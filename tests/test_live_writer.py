@@ -0,0 +1,150 @@
+"""
+Unit tests for LiveBarWriter's group commits and failure handling.
+"""
+
+import datetime
+
+import pandas as pd
+import pytest
+
+from quant_toolkit.live_writer import LiveBarWriter
+from quant_toolkit.sqlite_data_manager import (
+    DataHandler,
+    InvalidDataError,
+    ValidationRules,
+)
+
+pytestmark = pytest.mark.unit
+
+OPEN = datetime.datetime(2024, 1, 2, 9, 15)
+
+
+def _bar(minute: int, close: float = 100.0) -> dict:
+    return {
+        "datetime": OPEN + datetime.timedelta(minutes=minute),
+        "open": 100.0,
+        "high": 101.0,
+        "low": 99.0,
+        "close": close,
+        "volume": 10,
+    }
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = DataHandler(tmp_path / "live.db")
+    yield handler
+    handler.pool.close_all()
+
+
+@pytest.fixture
+def broken_disk(handler, monkeypatch):
+    """Make every flush fail; returns the list of write attempts."""
+    attempts = []
+
+    def fail(*args, **kwargs):
+        attempts.append(1)
+        raise OSError("disk I/O error")
+
+    monkeypatch.setattr(handler, "_insert_rows", fail)
+    return attempts
+
+
+def test_coalesces_and_commits(handler):
+    with LiveBarWriter(handler, flush_interval_ms=10) as writer:
+        writer.submit_many("NIFTY", [_bar(0), _bar(1), _bar(1, close=100.5)])
+        assert writer.flush(timeout=5)
+        metrics = writer.metrics()
+
+    assert (metrics.committed, metrics.coalesced, metrics.pending) == (2, 1, 0)
+    stored = handler.get_security_data("NIFTY")
+    assert stored["close"].tolist() == [100.0, 100.5]
+
+
+def test_failed_flush_reports_false_then_retries(handler, broken_disk, monkeypatch):
+    writer = LiveBarWriter(handler, flush_interval_ms=10).start()
+    writer.submit("NIFTY", _bar(0))
+    assert writer.flush(timeout=5) is False
+    metrics = writer.metrics()
+    assert metrics.failed_flushes >= 1 and metrics.pending == 1
+    assert "disk I/O error" in metrics.last_error
+
+    monkeypatch.undo()
+    assert writer.flush(timeout=5) is True
+    writer.stop()
+    assert writer.metrics().last_error is None
+    assert len(handler.get_security_data("NIFTY")) == 1
+
+
+def test_persistent_failure_backs_off(handler, broken_disk):
+    # A full buffer used to retry in a tight loop
+    writer = LiveBarWriter(handler, flush_interval_ms=10, max_batch_rows=1).start()
+    writer.submit("NIFTY", _bar(0))
+    writer._thread.join(0.6)
+    # Retries after 20, 40, 80, 160 and 320ms
+    assert 3 <= len(broken_disk) <= 8
+    with pytest.raises(RuntimeError):
+        writer.stop()
+
+
+def test_stop_raises_on_uncommitted_rows(handler, broken_disk, monkeypatch):
+    writer = LiveBarWriter(handler, flush_interval_ms=10).start()
+    writer.submit_many("NIFTY", [_bar(0), _bar(1)])
+    with pytest.raises(RuntimeError, match="2 rows not committed"):
+        writer.stop()
+
+    # The rows stay buffered, and a restart commits them
+    monkeypatch.undo()
+    writer.start().stop()
+    assert len(handler.get_security_data("NIFTY")) == 2
+
+
+def test_context_exit_does_not_mask_errors(handler, broken_disk):
+    with pytest.raises(KeyError):
+        with LiveBarWriter(handler, flush_interval_ms=10) as writer:
+            writer.submit("NIFTY", _bar(0))
+            raise KeyError("from the block")
+
+
+def test_failing_symbol_is_set_aside(handler):
+    # BAD's table exists without the vwap column its live bars carry
+    handler.inject_data("BAD", pd.DataFrame([_bar(0)]))
+    writer = LiveBarWriter(handler, flush_interval_ms=10, max_symbol_failures=3)
+    with writer:
+        for minute in range(1, 4):
+            writer.submit("NIFTY", _bar(minute))
+            writer.submit("BAD", dict(_bar(minute), vwap=100.2))
+            # NIFTY commits every round; BAD fails until it is set aside
+            assert writer.flush(timeout=5) is False
+        metrics = writer.metrics()
+        assert list(metrics.set_aside_symbols) == ["BAD"]
+        assert "vwap" in metrics.set_aside_symbols["BAD"]
+        assert (metrics.set_aside, metrics.pending) == (3, 3)
+
+        writer.submit("NIFTY", _bar(4))
+        assert writer.flush(timeout=5) is True
+        set_aside = writer.take_set_aside()
+        assert writer.metrics().pending == 0
+
+    assert [bar["vwap"] for bar in set_aside["BAD"]] == [100.2] * 3
+    assert len(handler.get_security_data("NIFTY")) == 4
+    assert len(handler.get_security_data("BAD")) == 1
+
+
+def test_failing_everything_sets_nothing_aside(handler, broken_disk):
+    writer = LiveBarWriter(handler, flush_interval_ms=10, max_symbol_failures=1)
+    writer.start()
+    writer.submit("NIFTY", _bar(0))
+    writer.submit("BANKNIFTY", _bar(0))
+    assert writer.flush(timeout=5) is False
+    metrics = writer.metrics()
+    assert metrics.set_aside_symbols == {}
+    assert metrics.pending == 2
+    with pytest.raises(RuntimeError, match="2 rows not committed"):
+        writer.stop()
+
+
+def test_invalid_bar_raises_invalid_data_error(handler):
+    writer = LiveBarWriter(handler, rules=ValidationRules(on_invalid="raise"))
+    with pytest.raises(InvalidDataError):
+        writer.submit("NIFTY", dict(_bar(0), high=98.0))
@@ -0,0 +1,66 @@
+"""
+Unit tests for DataHandler.run_maintenance() and MaintenanceScheduler.
+"""
+
+import time
+
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+SYMBOLS = ["A", "B", "C"]
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = DataHandler(tmp_path / "maintenance.db")
+    with handler.transaction() as conn:
+        for symbol, bars in generate_session_bars(SYMBOLS, years=1).items():
+            handler.inject_data(symbol, bars.head(20_000), conn=conn)
+    yield handler
+    handler.pool.close_all()
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_run_maintenance_after_large_delete(handler):
+    handler.delete_security("A")
+    handler.delete_security("B")
+
+    report = handler.run_maintenance()
+
+    assert report.pages_freed > 0
+    assert report.checkpoint[0] == 0  # not blocked by readers or writers
+    assert report.wal_bytes_before > 0
+    assert report.wal_bytes_after == 0
+    assert report.bytes_reclaimed > 0
+    assert set(report.durations_ms) == {"optimize", "vacuum", "checkpoint"}
+    assert len(handler.get_security_data("C")) == 20_000
+
+
+def test_scheduler_waits_for_idle_pool(handler):
+    busy = handler.pool.get_connection()
+    scheduler = handler.schedule_maintenance(
+        interval=0.02, idle_seconds=0.05, poll_seconds=0.01
+    )
+    try:
+        # A checked-out connection keeps maintenance away
+        time.sleep(0.2)
+        assert scheduler.last_report is None
+
+        handler.pool.return_connection(busy)
+        assert _wait_for(lambda: scheduler.last_report is not None)
+    finally:
+        scheduler.stop(timeout=5)
+    assert not scheduler.running
+    assert scheduler.last_report.checkpoint is not None
@@ -0,0 +1,56 @@
+"""
+Unit tests for MarketCalendar's monthly expiry lookups.
+"""
+
+import datetime
+
+import pytest
+
+from quant_toolkit.market_contracts import Exchange, MarketCalendar
+
+pytestmark = pytest.mark.unit
+
+# Last Thursday of March 2024 is made a holiday so the expiry rolls back
+HOLIDAYS = [datetime.date(2024, 3, 28)]
+
+
+@pytest.fixture
+def calendar(monkeypatch):
+    monkeypatch.setattr(
+        MarketCalendar,
+        "_get_holiday_list",
+        lambda self, year: [h for h in HOLIDAYS if h.year == year],
+    )
+    return MarketCalendar()
+
+
+def test_monthly_expiry_rolls_back_over_holiday(calendar):
+    assert calendar.monthly_expiry(2024, 3, Exchange.NSE) == datetime.date(2024, 3, 27)
+    assert calendar.monthly_expiry(2024, 6, Exchange.NSE) == datetime.date(2024, 6, 27)
+    assert calendar.monthly_expiry(2024, 6, Exchange.BSE) == datetime.date(2024, 6, 25)
+
+
+def test_current_and_next_month_expiry_match_monthly_expiry(calendar):
+    day = datetime.date(2024, 1, 1)
+    while day <= datetime.date(2024, 12, 31):
+        current = calendar.find_current_month_expiry(day, Exchange.NSE)
+        following = calendar.find_next_month_expiry(day, Exchange.NSE)
+        assert current >= day
+        assert current in calendar.monthly_expiries(day, current, Exchange.NSE)
+        assert (
+            following == calendar.monthly_expiries(current, following, Exchange.NSE)[1]
+        )
+        day += datetime.timedelta(days=1)
+
+
+def test_current_month_expiry_rolls_after_adjusted_expiry(calendar):
+    # The holiday itself is past the rolled-back expiry of March 27
+    assert calendar.find_current_month_expiry(
+        datetime.date(2024, 3, 28), Exchange.NSE
+    ) == datetime.date(2024, 4, 25)
+
+
+def test_next_month_expiry_rolls_over_december(calendar):
+    assert calendar.find_next_month_expiry(
+        datetime.date(2024, 12, 10), Exchange.NSE
+    ) == datetime.date(2025, 1, 30)
@@ -0,0 +1,138 @@
+"""
+Unit tests for OptionChainStore's contract catalogue and chain queries.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_toolkit.option_chain import OptionChainStore
+
+pytestmark = pytest.mark.unit
+
+
+def _chain(strike: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "strike": [strike, strike],
+            "option_type": ["CE", "PE"],
+            "datetime": pd.to_datetime(["2024-12-19 09:15", "2024-12-19 09:15"]),
+            "open": [100.0, 90.0],
+            "high": [110.0, 95.0],
+            "low": [95.0, 85.0],
+            "close": [105.0, 88.0],
+            "volume": [1_000, 800],
+        }
+    )
+
+
+def _parity_chain(forward: float, times: list) -> pd.DataFrame:
+    """CE/PE closes with CE - PE = forward - strike, 50-point strikes."""
+    rows = []
+    for bar, time in enumerate(times):
+        for strike in range(24_300, 24_750, 50):
+            for option_type, intrinsic in [
+                ("CE", max(forward - strike, 0.0)),
+                ("PE", max(strike - forward, 0.0)),
+            ]:
+                close = intrinsic + 20.0 + bar
+                rows.append(
+                    (strike, option_type, time, close, close + 1, close - 1, close)
+                )
+    df = pd.DataFrame(
+        rows,
+        columns=["strike", "option_type", "datetime", "open", "high", "low", "close"],
+    )
+    df["datetime"] = pd.to_datetime(df["datetime"])
+    df["volume"] = 100
+    return df
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = OptionChainStore(tmp_path / "options.db")
+    yield store
+    store.handler.pool.close_all()
+
+
+@pytest.mark.parametrize(
+    "expiry, expiry_type, ticker",
+    [
+        ("2024-12-26", "MONTHLY", "NSE:NIFTY24DEC24500CE"),
+        ("2024-12-19", "WEEKLY", "NSE:NIFTY24D1924500CE"),
+    ],
+)
+def test_expiry_type_is_inferred(store, expiry, expiry_type, ticker):
+    store.inject_chain("NIFTY", expiry, _chain(24500))
+    contracts = store.contracts("NIFTY").set_index("ticker")
+    assert contracts.loc[ticker, "expiry_type"] == expiry_type
+    assert store.parse_ticker(ticker).expiry_date.isoformat() == expiry
+
+
+@pytest.fixture
+def chain_store(store):
+    times = ["2024-12-19 09:15", "2024-12-19 09:16"]
+    store.inject_chain("NIFTY", "2024-12-26", _parity_chain(24_520.0, times))
+    return store
+
+
+def test_fractional_strike_is_rejected(store):
+    chain = _chain(412).astype({"strike": float})
+    chain.loc[0, "strike"] = 412.5
+    with pytest.raises(ValueError, match="whole numbers"):
+        store.inject_chain("ITC", "2024-12-26", chain)
+    assert store.contracts("ITC").empty
+
+
+def test_chain_snapshot_uses_last_bar_at_or_before(chain_store):
+    snapshot = chain_store.chain_snapshot("NIFTY", "2024-12-26", "2024-12-19 09:15:30")
+    assert len(snapshot) == 18
+    assert set(snapshot["datetime"]) == {pd.Timestamp("2024-12-19 09:15")}
+    assert snapshot["strike"].is_monotonic_increasing
+
+    later = chain_store.chain_snapshot("NIFTY", "2024-12-26", "2024-12-19 10:00")
+    assert set(later["datetime"]) == {pd.Timestamp("2024-12-19 09:16")}
+
+    bounded = chain_store.chain_snapshot(
+        "NIFTY", "2024-12-26", "2024-12-19 10:00", min_strike=24_400, max_strike=24_500
+    )
+    assert sorted(set(bounded["strike"])) == [24_400, 24_450, 24_500]
+
+
+def test_chain_snapshot_before_first_bar_is_empty(chain_store):
+    snapshot = chain_store.chain_snapshot("NIFTY", "2024-12-26", "2024-12-19 09:14")
+    assert snapshot.empty
+
+
+def test_atm_strike_from_put_call_parity(chain_store):
+    at = "2024-12-19 09:16"
+    assert chain_store.atm_strike("NIFTY", "2024-12-26", at) == 24_500
+    assert chain_store.atm_strike("NIFTY", "2024-12-26", at, spot=24_630) == 24_650
+    assert chain_store.atm_strike("NIFTY", "2024-12-26", "2024-12-19 09:14") is None
+
+
+def test_atm_strikes_range_bounds(chain_store):
+    near = chain_store.atm_strikes("NIFTY", "2024-12-26", "2024-12-19 09:16", n=2)
+    assert near.attrs["atm"] == 24_500
+    assert sorted(set(near["strike"])) == [24_400, 24_450, 24_500, 24_550, 24_600]
+    assert len(near) == 10
+
+    empty = chain_store.atm_strikes("NIFTY", "2024-12-26", "2024-12-19 09:14")
+    assert empty.empty
+
+
+def test_contract_history(chain_store):
+    history = chain_store.contract_history("NIFTY", "2024-12-26", 24_500, "ce")
+    assert history["datetime"].tolist() == list(
+        pd.to_datetime(["2024-12-19 09:15", "2024-12-19 09:16"])
+    )
+    np.testing.assert_allclose(history["close"], [40.0, 41.0])
+
+    tail = chain_store.contract_history(
+        "NIFTY", "2024-12-26", 24_500, "CE", start="2024-12-19 09:16"
+    )
+    assert len(tail) == 1
+    head = chain_store.contract_history(
+        "NIFTY", "2024-12-26", 24_500, "CE", end="2024-12-19 09:15"
+    )
+    assert len(head) == 1
@@ -0,0 +1,105 @@
+"""
+Unit tests for passing DataHandlers to worker processes: pickling as
+configuration and resetting pools inherited across fork().
+"""
+
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.sqlite_data_manager import DataHandler, ValidationRules
+
+pytestmark = pytest.mark.unit
+
+RULES = ValidationRules(check_volume=True, on_invalid="raise")
+
+# Handler the forked workers inherit instead of receiving it pickled
+_INHERITED: dict = {}
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = DataHandler(
+        tmp_path / "pickle.db",
+        profile=True,
+        slow_query_ms=5.0,
+        validation_rules=RULES,
+    )
+    handler.pool.idle_ttl = 60.0
+    handler.inject_data("A", generate_session_bars(["A"], years=1)["A"].head(500))
+    yield handler
+    handler.pool.close_all()
+
+
+def _row_count(handler: DataHandler) -> int:
+    return len(handler.get_security_data("A"))
+
+
+def _inherited_row_count(_) -> int:
+    return _row_count(_INHERITED["handler"])
+
+
+def test_handler_pickles_as_its_configuration(handler):
+    clone = pickle.loads(pickle.dumps(handler))
+    try:
+        assert clone.db_path == handler.db_path
+        assert clone.validation_rules == RULES
+        assert clone.profiler is not None
+        assert clone.profiler is not handler.profiler
+        assert clone.profiler.slow_query_ms == 5.0
+        assert clone.pool is not handler.pool
+        assert clone.pool.idle_ttl == 60.0
+        assert clone.pool.stats().open == 0
+        assert _row_count(clone) == 500
+    finally:
+        clone.pool.close_all()
+
+
+def test_in_memory_handler_refuses_to_pickle(handler):
+    memory = DataHandler.open_in_memory(handler.db_path)
+    try:
+        with pytest.raises(TypeError, match="In-memory"):
+            pickle.dumps(memory)
+    finally:
+        memory.pool.close_all()
+
+
+def test_pool_resets_after_pid_change(handler):
+    pool = handler.pool
+    conn = pool.get_connection()
+    pool.return_connection(conn)
+    assert pool.stats().open == 1
+
+    # As seen by a forked child: the PID no longer matches
+    pool._pid = -1
+    fresh = pool.get_connection()
+    try:
+        assert fresh is not conn
+        stats = pool.stats()
+        assert (stats.open, stats.in_use, stats.checkouts) == (1, 1, 1)
+        # The inherited connection was left open for its owner, not closed
+        assert conn.execute("SELECT 1").fetchone() == (1,)
+    finally:
+        pool.return_connection(fresh)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork()"
+)
+def test_forked_workers_read_through_handler(handler):
+    # The parent's pool holds a connection the children inherit
+    assert _row_count(handler) == 500
+    _INHERITED["handler"] = handler
+    context = multiprocessing.get_context("fork")
+    try:
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+            pickled = list(executor.map(_row_count, [handler] * 4))
+            inherited = list(executor.map(_inherited_row_count, range(4)))
+    finally:
+        _INHERITED.clear()
+    assert pickled == inherited == [500] * 4
+    # The parent's connections are unaffected
+    assert _row_count(handler) == 500
@@ -0,0 +1,44 @@
+"""
+Unit tests for QuantLogger's reraise option.
+"""
+
+import asyncio
+
+import pytest
+
+from quant_toolkit.quantlogger import QuantLogger
+
+pytestmark = pytest.mark.unit
+
+
+class Expected(Exception):
+    pass
+
+
+@QuantLogger(reraise=(Expected,), to_stdout=False)
+def fail(exc: Exception):
+    raise exc
+
+
+@QuantLogger(reraise=(Expected,), to_stdout=False)
+async def fail_async(exc: Exception):
+    raise exc
+
+
+def test_listed_exceptions_propagate():
+    with pytest.raises(Expected):
+        fail(Expected("boom"))
+
+
+def test_other_exceptions_are_swallowed():
+    assert fail(RuntimeError("boom")) is None
+
+
+def test_async_listed_exceptions_propagate():
+    async def main():
+        with pytest.raises(Expected):
+            await fail_async(Expected("boom"))
+        assert await fail_async(RuntimeError("boom")) is None
+        await QuantLogger.flush_logs()
+
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Unit tests for statement profiling and query-plan capture.
+"""
+
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def handler(tmp_path):
+    # Nothing is slow: plans must not depend on elapsed time
+    handler = DataHandler(tmp_path / "profiled.db", profile=True, slow_query_ms=1e9)
+    handler.inject_data("NIFTY", generate_session_bars(["NIFTY"])["NIFTY"].head(2_000))
+    handler.profiler.clear()
+    yield handler
+    handler.pool.close_all()
+
+
+def _records(handler, marker):
+    return [r for r in handler.profiler.records() if marker in r.sql]
+
+
+def test_fast_queries_get_plans_and_scans_are_flagged(handler):
+    with handler.read_connection() as conn:
+        conn.execute('SELECT SUM(volume) FROM "NIFTY" WHERE volume > 0').fetchall()
+        conn.execute(
+            'SELECT close FROM "NIFTY" WHERE datetime >= ?', ("2024-01-03 09:15:00",)
+        ).fetchall()
+
+    scan, seek = handler.profiler.records()
+    assert not scan.slow and scan.full_scan
+    assert any(step.startswith("SCAN") for step in scan.plan)
+    assert not seek.full_scan
+    assert any("USING INDEX" in step for step in seek.plan)
+
+
+def test_plans_are_explained_once_per_sql_text(handler, monkeypatch):
+    explained = []
+    plan = handler.profiler._plan
+
+    def counting_plan(record, conn):
+        if record.sql not in handler.profiler._plans:
+            explained.append(record.sql)
+        return plan(record, conn)
+
+    monkeypatch.setattr(handler.profiler, "_plan", counting_plan)
+    sql = 'SELECT close FROM "NIFTY" WHERE datetime >= ? /* once */'
+    with handler.read_connection() as conn:
+        for day in ("02", "03", "04"):
+            conn.execute(sql, (f"2024-01-{day} 09:15:00",)).fetchall()
+
+    records = _records(handler, "/* once */")
+    assert len(records) == 3 and explained == [sql]
+    assert records[0].plan is records[2].plan
+
+
+def test_dml_has_no_plan(handler):
+    with handler.transaction() as conn:
+        conn.execute('DELETE FROM "NIFTY" WHERE volume < 0')
+    (record,) = _records(handler, "DELETE")
+    assert record.plan is None and not record.full_scan
+    assert "full_scan" in handler.profiler.summary().columns
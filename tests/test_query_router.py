@@ -0,0 +1,72 @@
+"""
+Unit tests for QueryRouter's cross-database reads.
+"""
+
+import pandas as pd
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.query_router import QueryRouter
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture(scope="module")
+def router(tmp_path_factory):
+    bars = generate_session_bars(["NIFTY", "RELIANCE"], years=1)
+    paths = {}
+    for alias, symbol, table in (
+        ("index", "NIFTY", "NIFTY"),
+        ("stocks", "RELIANCE", "RELIANCE"),
+        ("futures", "RELIANCE", "NSE:RELIANCE24JANFUT"),
+    ):
+        paths[alias] = tmp_path_factory.mktemp(alias) / f"{alias}.db"
+        handler = DataHandler(paths[alias])
+        # RELIANCE misses the first session's bars
+        handler.inject_data(table, bars[symbol].slice(375 if alias == "stocks" else 0))
+        handler.pool.close_all()
+    with QueryRouter(databases=paths) as router:
+        yield router
+
+
+def test_aligned_joins_on_datetime(router):
+    inner = router.aligned(["index.NIFTY", "stocks.RELIANCE"], end="2024-01-03")
+    left = router.aligned(
+        {"n": "index.NIFTY", "r": "stocks.RELIANCE"}, end="2024-01-03", how="left"
+    )
+    assert list(inner.columns) == ["datetime", "NIFTY_close", "RELIANCE_close"]
+    assert len(inner) == 750 and len(left) == 1125
+    assert left["r_close"].iloc[:375].isna().all()
+    assert inner["datetime"].iloc[0] == pd.Timestamp("2024-01-02 09:15")
+
+
+@pytest.mark.parametrize(
+    "legs, match",
+    [
+        (["index.NIFTY", "stocks.Z"], "not found"),
+        (["NIFTY"], "database.symbol"),
+        # Rolling aliases are not tables, contracts are stored by ticker
+        (["futures.RELIANCE_FUT"], "not found"),
+        (["options.NIFTY"], "not attached"),
+        ([], "At least one leg"),
+    ],
+)
+def test_aligned_raises_on_bad_legs(router, legs, match):
+    with pytest.raises(ValueError, match=match):
+        router.aligned(legs)
+
+
+def test_aligned_reads_futures_contract_ticker(router):
+    df = router.aligned(
+        {"spot": "stocks.RELIANCE", "fut": "futures.NSE:RELIANCE24JANFUT"},
+        end="2024-01-03",
+    )
+    assert len(df) == 750
+    assert (df["spot_close"] == df["fut_close"]).all()
+
+
+def test_query_raises_on_bad_sql(router):
+    assert router.query('SELECT COUNT(*) AS n FROM "index"."NIFTY"')["n"][0] > 0
+    with pytest.raises(pd.errors.DatabaseError):
+        router.query('SELECT * FROM "index"."MISSING"')
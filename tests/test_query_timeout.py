@@ -0,0 +1,51 @@
+"""
+Unit tests for timeout= deadlines on DataHandler reads.
+"""
+
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.sqlite_data_manager import DataHandler, QueryTimeoutError
+
+pytestmark = pytest.mark.unit
+
+# Past after the first progress-handler check of any statement
+EXPIRED = 1e-9
+
+SMALL = [f"S{i:03d}" for i in range(100)]
+
+
+@pytest.fixture(scope="module")
+def handler(tmp_path_factory):
+    handler = DataHandler(tmp_path_factory.mktemp("timeout") / "timeout.db")
+    with handler.transaction() as conn:
+        for symbol, bars in generate_session_bars(["A", "B"], years=1).items():
+            handler.inject_data(symbol, bars, conn=conn)
+        # Enough seeks for latest_bars to reach the progress handler
+        for symbol, bars in generate_session_bars(SMALL, years=1).items():
+            handler.inject_data(symbol, bars.head(10), conn=conn)
+    yield handler
+    handler.pool.close_all()
+
+
+@pytest.mark.parametrize(
+    "read",
+    [
+        lambda h, t: h.get_security_data("A", timeout=t),
+        lambda h, t: h.tail("A", 50_000, timeout=t),
+        lambda h, t: h.page("A", limit=50_000, timeout=t),
+        lambda h, t: h.latest_bars(timeout=t),
+    ],
+    ids=["get_security_data", "tail", "page", "latest_bars"],
+)
+def test_timeout_propagates(handler, read):
+    with pytest.raises(QueryTimeoutError):
+        read(handler, EXPIRED)
+    # The connection went back to the pool usable, and a generous
+    # deadline lets the same read finish
+    assert len(read(handler, 60.0)) > 0
+
+
+def test_timeout_is_a_timeout_error(handler):
+    with pytest.raises(TimeoutError, match="timeout"):
+        handler.get_security_data("B", timeout=EXPIRED)
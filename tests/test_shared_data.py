@@ -0,0 +1,89 @@
+"""
+Unit tests for SharedDataset: publishing, attaching from worker processes,
+closing and detaching.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.shared_data import _ATTACHED, SharedDataset, attach, detach
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+SYMBOLS = ["A", "B"]
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = DataHandler(tmp_path / "shared.db")
+    for symbol, bars in generate_session_bars(SYMBOLS, years=1).items():
+        handler.inject_data(symbol, bars.head(500))
+    yield handler
+    handler.pool.close_all()
+
+
+@pytest.fixture(autouse=True)
+def no_attachments():
+    yield
+    detach()
+
+
+def _worker_frame(descriptor, symbol) -> pd.DataFrame:
+    return attach(descriptor).frame(symbol).copy()
+
+
+def test_workers_read_published_frames(handler):
+    with handler.share(SYMBOLS) as dataset:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            frames = list(
+                executor.map(_worker_frame, [dataset.descriptor] * 2, SYMBOLS)
+            )
+    for symbol, frame in zip(SYMBOLS, frames):
+        pd.testing.assert_frame_equal(frame, handler.get_security_data(symbol))
+
+
+def test_views_are_read_only(handler):
+    with handler.share(["A"], columns=["close"]) as dataset:
+        view = attach(dataset.descriptor)
+        close = view.arrays("A")["close"]
+        assert not close.flags.writeable
+        with pytest.raises(ValueError):
+            close[0] = 0.0
+        del close
+
+
+def test_close_unlinks_segment(handler):
+    dataset = handler.share(["A"])
+    descriptor = dataset.descriptor
+    dataset.close()
+    assert dataset.closed
+    with pytest.raises(FileNotFoundError):
+        attach(descriptor)
+    assert descriptor.shm_name not in _ATTACHED
+
+
+def test_detach_drops_cached_attachment(handler):
+    with handler.share(["A"]) as dataset, handler.share(["B"]) as other:
+        view = attach(dataset.descriptor)
+        assert attach(dataset.descriptor) is view
+
+        detach(dataset.descriptor)
+        assert dataset.descriptor.shm_name not in _ATTACHED
+        assert attach(dataset.descriptor) is not view
+
+        attach(other.descriptor)
+        detach()
+        assert not _ATTACHED
+        # The publisher still owns the segment
+        assert not dataset.closed
+        assert len(attach(dataset.descriptor).frame("A")) == 500
+
+
+def test_non_numeric_column_is_rejected():
+    frame = pd.DataFrame({"close": [1.0, 2.0], "note": ["x", "y"]})
+    with pytest.raises(ValueError, match="Column note of A"):
+        SharedDataset({"A": frame})
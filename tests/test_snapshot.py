@@ -0,0 +1,95 @@
+"""
+Unit tests for online snapshots: consistency under a concurrent writer,
+partial-file cleanup and read-only in-memory restores.
+"""
+
+import contextlib
+import sqlite3
+
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = DataHandler(tmp_path / "live.db")
+    handler.inject_data("A", generate_session_bars(["A"], years=1)["A"].head(20_000))
+    yield handler
+    handler.pool.close_all()
+
+
+def _rows(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COUNT(*) FROM A").fetchone()[0]
+
+
+def test_snapshot_under_concurrent_writer_is_consistent(handler, tmp_path):
+    writer = sqlite3.connect(handler.db_path)
+    before = _rows(writer)
+    steps = []
+
+    def write_between_steps(status, remaining, total):
+        # Another connection commits while the backup is in progress
+        steps.append(remaining)
+        writer.execute(
+            "INSERT INTO A (datetime, open, high, low, close, volume) "
+            "VALUES ('2030-01-01 09:15:00', 1, 1, 1, 1, 1)"
+        )
+        writer.commit()
+
+    try:
+        dest = handler.snapshot(
+            tmp_path / "backups" / "snap.db",
+            pages_per_step=4,
+            progress=write_between_steps,
+        )
+        after = _rows(writer)
+    finally:
+        writer.close()
+
+    assert len(steps) > 1 and after == before + len(steps)
+    with contextlib.closing(sqlite3.connect(dest)) as snap:
+        assert snap.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        # The copy is the database as of the start of the snapshot
+        assert _rows(snap) == before
+    assert not list(dest.parent.glob("*.partial"))
+
+
+def test_failed_snapshot_leaves_no_partial_file(handler, tmp_path):
+    dest = tmp_path / "snap.db"
+
+    def fail(status, remaining, total):
+        raise RuntimeError("disk full")
+
+    with contextlib.suppress(RuntimeError):
+        handler.snapshot(dest, pages_per_step=1, progress=fail)
+    assert not dest.exists()
+    assert not list(tmp_path.glob("*.partial"))
+
+    # A later snapshot to the same destination succeeds
+    handler.snapshot(dest)
+    assert dest.exists()
+    assert not list(tmp_path.glob("*.partial"))
+
+
+def test_snapshot_to_memory_is_query_only(handler):
+    mem = handler.snapshot_to_memory()
+    try:
+        assert _rows(mem) == 20_000
+        assert mem.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            mem.execute("DELETE FROM A")
+    finally:
+        mem.close()
+
+    writable = handler.snapshot_to_memory(read_only=False)
+    try:
+        writable.execute("DELETE FROM A")
+        assert _rows(writable) == 0
+    finally:
+        writable.close()
+    # The live database is untouched
+    assert len(handler.get_security_data("A", columns=["close"])) == 20_000
@@ -0,0 +1,191 @@
+"""
+Unit tests for TickAggregator: session-open alignment and OHLCV values.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from quant_toolkit.sqlite_data_manager import DataHandler
+from quant_toolkit.tick_aggregator import TickAggregator
+
+pytestmark = pytest.mark.unit
+
+DAY = np.datetime64("2024-06-03")
+
+
+def _at(*clock: str) -> np.ndarray:
+    return np.array([DAY + np.timedelta64(pd.Timedelta(c)) for c in clock]).astype(
+        "datetime64[ns]"
+    )
+
+
+def _bar_times(bars) -> list:
+    return [t.strftime("%H:%M") for t in bars["datetime"].to_list()]
+
+
+def test_bars_align_to_session_open():
+    aggregator = TickAggregator(bar_seconds=75 * 60)
+    times = _at(
+        "09:14:59",  # before the open
+        "09:15:00",
+        "10:29:59",
+        "10:30:00",
+        "15:29:59",
+        "15:30:00",  # at the close
+    )
+    aggregator.update("NIFTY", times, np.arange(1.0, 7.0), np.ones(6))
+    aggregator.flush()
+    bars = aggregator.pop_bars()
+
+    assert _bar_times(bars) == ["09:15", "10:30", "14:15"]
+    assert bars["volume"].to_list() == [2, 1, 1]
+    assert aggregator.out_of_session_ticks == 2
+    assert aggregator.ticks_processed == 4
+
+
+def test_last_bar_is_cut_at_session_close():
+    aggregator = TickAggregator(bar_seconds=3600, grace_seconds=2)
+    aggregator.update("NIFTY", _at("15:20:00"), [100.0], [5])
+    # The 15:15 bar ends at the 15:30 close, not at 16:15
+    assert aggregator.advance(DAY + np.timedelta64(pd.Timedelta("15:30:01"))) == 0
+    assert aggregator.advance(DAY + np.timedelta64(pd.Timedelta("15:30:02"))) == 1
+    assert _bar_times(aggregator.pop_bars()) == ["15:15"]
+
+
+def test_ohlcv_matches_reference_across_batches():
+    rng = np.random.default_rng(7)
+    n = 20_000
+    symbols = rng.choice(["A", "B", "C"], n)
+    # Unique, roughly ordered times with jitter under the grace window
+    base = np.sort(rng.choice(6 * 3600 * 1000, n, replace=False)).astype(np.int64)
+    jitter = rng.integers(-500, 500, n)
+    offset_ms = np.clip(base + jitter, 0, None)
+    _, first = np.unique(offset_ms, return_index=True)
+    keep = np.sort(first)
+    symbols, offset_ms = symbols[keep], offset_ms[keep]
+    times = (
+        DAY
+        + np.timedelta64(9 * 3600 + 15 * 60, "s")
+        + offset_ms.astype("timedelta64[ms]")
+    ).astype("datetime64[ns]")
+    prices = rng.normal(100, 5, len(times)).round(2)
+    volumes = rng.integers(1, 100, len(times))
+    oi = rng.integers(1_000, 2_000, len(times))
+
+    aggregator = TickAggregator(bar_seconds=60, grace_seconds=2)
+    for chunk in np.array_split(np.arange(len(times)), 13):
+        aggregator.update(
+            symbols[chunk], times[chunk], prices[chunk], volumes[chunk], oi[chunk]
+        )
+    aggregator.flush()
+    bars = aggregator.pop_bars().to_pandas().sort_values(["symbol", "datetime"])
+
+    ticks = pd.DataFrame(
+        {"symbol": symbols, "time": times, "price": prices, "volume": volumes, "oi": oi}
+    )
+    ticks["datetime"] = ticks["time"].dt.floor("1min")
+    ordered = ticks.sort_values("time").groupby(["symbol", "datetime"])
+    expected = pd.DataFrame(
+        {
+            "open": ordered["price"].first(),
+            "high": ordered["price"].max(),
+            "low": ordered["price"].min(),
+            "close": ordered["price"].last(),
+            "volume": ordered["volume"].sum(),
+            "oi": ordered["oi"].last(),
+        }
+    ).reset_index()
+
+    assert aggregator.late_ticks == 0
+    assert aggregator.ticks_processed == len(times)
+    assert len(bars) == len(expected)
+    for column in ["symbol", "open", "high", "low", "close", "volume", "oi"]:
+        np.testing.assert_array_equal(
+            bars[column].to_numpy(), expected[column].to_numpy(), err_msg=column
+        )
+    np.testing.assert_array_equal(
+        bars["datetime"].to_numpy().astype("datetime64[ns]"),
+        expected["datetime"].to_numpy().astype("datetime64[ns]"),
+    )
+
+
+def test_ticks_after_grace_are_late():
+    aggregator = TickAggregator(bar_seconds=60, grace_seconds=2)
+    aggregator.update("NIFTY", _at("09:15:10"), [100.0], [1])
+    # 09:16:03 is past the 09:16 end plus 2s of grace: the 09:15 bar closes
+    assert aggregator.update("NIFTY", _at("09:16:03"), [101.0], [1]) == 1
+    aggregator.update("NIFTY", _at("09:15:50"), [99.0], [1])
+    aggregator.flush()
+    bars = aggregator.pop_bars()
+
+    assert aggregator.late_ticks == 1
+    assert _bar_times(bars) == ["09:15", "09:16"]
+    assert bars["low"].to_list() == [100.0, 101.0]
+    assert "oi" not in bars.columns
+
+
+def test_failed_sink_write_keeps_bars(tmp_path, monkeypatch):
+    handler = DataHandler(tmp_path / "ticks.db")
+
+    def fail(*args, **kwargs):
+        raise OSError("disk I/O error")
+
+    monkeypatch.setattr(handler, "_insert_rows", fail)
+    aggregator = TickAggregator(sink=handler, bar_seconds=60)
+    aggregator.update(["A", "B"], _at("09:15:01", "09:15:02"), [100.0, 50.0], [1, 2])
+    with pytest.raises(OSError):
+        aggregator.flush()
+    assert handler.get_available_securities() == []
+
+    monkeypatch.undo()
+    aggregator.flush()
+    try:
+        assert handler.get_security_data("A")["close"].tolist() == [100.0]
+        assert handler.get_security_data("B")["volume"].tolist() == [2]
+    finally:
+        handler.pool.close_all()
+
+
+def test_failed_callable_sink_is_retried():
+    received = []
+
+    def sink(bars):
+        if not received:
+            received.append(None)
+            raise ConnectionError("feed down")
+        received.append(bars)
+
+    aggregator = TickAggregator(sink=sink, bar_seconds=60)
+    # 09:16:05 closes the 09:15 bar, whose emission fails
+    with pytest.raises(ConnectionError):
+        aggregator.update("A", _at("09:15:01", "09:16:05"), [100.0, 101.0], [1, 1])
+    aggregator.flush()
+    assert _bar_times(received[1]) == ["09:15", "09:16"]
+
+
+def test_missing_open_interest_is_null(tmp_path):
+    handler = DataHandler(tmp_path / "ticks.db")
+    aggregator = TickAggregator(sink=handler, bar_seconds=60)
+    for clock, oi in [("09:15:01", 500), ("09:15:30", None), ("09:16:10", 600)]:
+        aggregator.add_tick("A", _at(clock)[0], 100.0, 1, oi)
+    aggregator.flush()
+    try:
+        stored = handler.get_security_data("A")
+        assert stored["oi"].isna().tolist() == [True, False]
+        assert stored["oi"].iloc[1] == 600
+    finally:
+        handler.pool.close_all()
+
+
+def test_batch_without_open_interest_is_null(tmp_path):
+    handler = DataHandler(tmp_path / "ticks.db")
+    aggregator = TickAggregator(sink=handler, bar_seconds=60)
+    aggregator.update("A", _at("09:15:01"), [100.0], [1], oi=[100])
+    aggregator.update("B", _at("09:15:02"), [50.0], [1])
+    aggregator.flush()
+    try:
+        assert handler.get_security_data("A")["oi"].tolist() == [100]
+        assert handler.get_security_data("B")["oi"].isna().tolist() == [True]
+    finally:
+        handler.pool.close_all()
@@ -0,0 +1,109 @@
+"""
+Unit tests for ingest validation (ValidationRules) in DataHandler.
+"""
+
+import polars as pl
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.sqlite_data_manager import (
+    DataHandler,
+    InvalidDataError,
+    ValidationRules,
+)
+
+pytestmark = pytest.mark.unit
+
+STRICT = ValidationRules(on_invalid="raise")
+
+
+@pytest.fixture
+def handler(tmp_path):
+    handler = DataHandler(tmp_path / "validation.db")
+    yield handler
+    handler.pool.close_all()
+
+
+@pytest.fixture(scope="module")
+def bars():
+    bars = generate_session_bars(["GOOD"], years=1)["GOOD"].head(1_000)
+    # One bar with its high under its low
+    broken = bars.with_columns(
+        pl.when(pl.int_range(pl.len()) == 10)
+        .then(pl.col("low") - 1)
+        .otherwise(pl.col("high"))
+        .alias("high")
+    )
+    return bars, broken
+
+
+def _count(handler, symbol):
+    return len(handler.get_security_data(symbol, columns=["close"]))
+
+
+@pytest.mark.parametrize("kind", ["polars", "pandas", "arrow"])
+def test_raise_reaches_caller(handler, bars, kind):
+    _, broken = bars
+    if kind == "pandas":
+        broken = broken.to_pandas()
+    inject = handler.inject_arrow if kind == "arrow" else handler.inject_data
+    if kind == "arrow":
+        broken = broken.to_arrow()
+
+    with pytest.raises(InvalidDataError, match="1 rows"):
+        inject("BROKEN", broken, rules=STRICT)
+    assert "BROKEN" not in handler.get_available_securities()
+
+
+@pytest.mark.parametrize("kind", ["polars", "pandas"])
+def test_raise_rolls_back_enclosing_transaction(handler, bars, kind):
+    good, broken = bars
+    if kind == "pandas":
+        good, broken = good.to_pandas(), broken.to_pandas()
+    with pytest.raises(InvalidDataError):
+        with handler.transaction() as conn:
+            handler.inject_data("GOOD", good, conn=conn)
+            handler.inject_data("BROKEN", broken, conn=conn, rules=STRICT)
+    # Nothing committed, not even the table created for GOOD
+    assert handler.get_available_securities() == []
+
+
+def test_pandas_and_polars_store_the_same_rows(handler, bars):
+    good, _ = bars
+    frame = good.to_pandas()
+    frame.loc[3, "close"] = None  # NaN is stored as NULL
+    handler.inject_data("PANDAS", frame)
+    handler.inject_data("POLARS", pl.from_pandas(frame))
+
+    with handler.read_connection() as conn:
+        schemas = [
+            conn.execute(f"PRAGMA table_info('{symbol}')").fetchall()
+            for symbol in ("PANDAS", "POLARS")
+        ]
+        rows = [
+            conn.execute(f"SELECT * FROM '{symbol}' ORDER BY datetime").fetchall()
+            for symbol in ("PANDAS", "POLARS")
+        ]
+    assert schemas[0] == schemas[1]
+    assert rows[0] == rows[1]
+    assert rows[0][3][4] is None
+
+
+def test_drop_removes_invalid_rows(handler, bars):
+    _, broken = bars
+    handler.inject_data("BROKEN", broken)
+    assert _count(handler, "BROKEN") == broken.height - 1
+
+
+@pytest.mark.parametrize("kind", ["polars", "pandas"])
+def test_duplicates_keep_last_and_sort(handler, bars, kind):
+    good, _ = bars
+    late = good.head(5).with_columns(pl.col("volume") + 1)
+    data = pl.concat([late.tail(2), good, late])
+    handler.inject_data("GOOD", data.to_pandas() if kind == "pandas" else data)
+
+    stored = handler.get_security_data("GOOD")
+    assert len(stored) == good.height
+    assert stored["datetime"].is_monotonic_increasing
+    assert stored["datetime"].is_unique
+    assert stored["volume"].iloc[:5].tolist() == late["volume"].to_list()
@@ -0,0 +1,79 @@
+"""
+Unit tests for the cross-process writer lease in DataHandler.
+"""
+
+import threading
+import time
+
+import pytest
+
+from market_data import generate_session_bars
+from quant_toolkit.sqlite_data_manager import DataHandler
+
+pytestmark = pytest.mark.unit
+
+HOLD_SECONDS = 0.3
+
+
+@pytest.fixture
+def handlers(tmp_path):
+    # Two handlers on one database stand in for two ingest processes: each
+    # has a lock file descriptor of its own
+    path = tmp_path / "lease.db"
+    first = DataHandler(path, writer_lease=True)
+    first.inject_data("A", generate_session_bars(["A"], years=1)["A"].head(100))
+    # Pay the one-off import cost of the read path up front
+    first.get_security_data("A")
+    second = DataHandler(path, writer_lease=True)
+    yield first, second
+    first.pool.close_all()
+    second.pool.close_all()
+
+
+@pytest.fixture
+def held_lease(handlers):
+    """Hold the first handler's lease in a thread for HOLD_SECONDS."""
+    first, _ = handlers
+    granted = threading.Event()
+
+    def hold():
+        with first.transaction():
+            granted.set()
+            time.sleep(HOLD_SECONDS)
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    assert granted.wait(5)
+    yield
+    holder.join()
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda h: h.inject_data(
+            "B", generate_session_bars(["B"], years=1)["B"].head(10)
+        ),
+        lambda h: h.checkpoint(),
+        lambda h: h.incremental_vacuum(),
+        lambda h: h.run_maintenance(),
+    ],
+    ids=["inject_data", "checkpoint", "incremental_vacuum", "run_maintenance"],
+)
+def test_writes_and_maintenance_wait_for_lease(handlers, held_lease, write):
+    _, second = handlers
+    write(second)
+    stats = second.lease_stats()
+    assert stats.contended >= 1
+    assert stats.max_wait_ms >= HOLD_SECONDS * 1000 / 2
+
+
+def test_reads_do_not_wait_for_lease(handlers, held_lease):
+    _, second = handlers
+    # second opens its first connection while the writer holds the lock
+    started = time.perf_counter()
+    with second.read_connection() as conn:
+        rows = conn.execute("SELECT COUNT(*) FROM 'A'").fetchone()[0]
+    assert len(second.get_security_data("A")) == rows == 100
+    assert time.perf_counter() - started < HOLD_SECONDS / 2
+    assert second.lease_stats().acquisitions == 0